@@ -0,0 +1,2 @@
+# Benchmark scripts — run each one as a module from the project root,
+# e.g. `python -m benchmarks.bench_llm_registry`.
@@ -0,0 +1,127 @@
+"""
+Per-turn chain overhead: fresh LLMChainFactory per node vs the shared ChainRegistry.
+
+A typical tool-free turn touches the router, a workflow node and the two memory
+classifiers.  Before the registry every one of those built a new chat model,
+a Together client, a PromptTemplate and re-ran bind_tools / with_structured_output.
+This script times that construction work against a registry lookup.  No network
+calls are made — TLS handshakes saved by connection reuse come on top of these
+numbers.
+
+    python -m benchmarks.bench_llm_registry --turns 200
+"""
+
+import os
+import time
+import argparse
+import asyncio
+import statistics
+
+# The LLM module exports these into os.environ on import; dummy values are
+# enough because nothing here talks to a provider.
+for _var in ("LANGSMITH_API_KEY", "LANGSMITH_TRACING", "LANGSMITH_PROJECT",
+             "TOGETHER_API_KEY", "GROQ_API_KEY", "GOOGLE_API_KEY",
+             "TAVILY_API_KEY", "QDRANT_URL", "QDRANT_API", "NEON_API"):
+    os.environ.setdefault(_var, "benchmark")
+os.environ["LANGSMITH_TRACING"] = "false"
+
+from langchain.prompts import PromptTemplate
+from together import Together
+
+import src.ai_component.llm  # noqa: F401  (exports the provider keys above)
+from src.ai_component.config import (
+    default_model, gemini_model_name, gemini_model_kwargs, groq_model_name, groq_model_kwargs,
+)
+from src.ai_component.tools.all_tools import Tools
+from src.ai_component.graph.utils.chains import (
+    chain_registry, Router, MemoryAnalysis1, MemoryAnalysis2,
+)
+
+# (registry name, how the legacy node bound the model)
+TURN_CHAINS = [
+    ("router", ("structured", Router)),
+    ("general.tools", ("tools", [Tools.rag_tool, Tools.call_tool])),
+    ("general.answer", ("plain", None)),
+    ("memory.importance", ("structured", MemoryAnalysis1)),
+    ("memory.summary", ("structured", MemoryAnalysis2)),
+]
+
+
+def legacy_llm():
+    """A new chat model, as the old `LLMChainFactory._get_llm` built on every call."""
+    if default_model == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=gemini_model_name, google_api_key=os.getenv("GOOGLE_API_KEY"),
+            streaming=True, **gemini_model_kwargs,
+        )
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model=groq_model_name, api_key=os.getenv("GROQ_API_KEY"),
+        streaming=True, **groq_model_kwargs,
+    )
+
+
+def legacy_turn() -> None:
+    """
+    Rebuild every chain of one turn the way nodes did before the registry.
+
+    The clients are constructed here rather than through today's
+    `LLMChainFactory`, which now shares them per process.
+    """
+    for name, (kind, extra) in TURN_CHAINS:
+        template = chain_registry._chains[name].first
+        Together()  # the old factory constructor built a Together client eagerly
+        prompt = PromptTemplate(
+            input_variables=list(template.input_variables),
+            template=template.template,
+        )
+        llm = legacy_llm()
+        if kind == "structured":
+            llm = llm.with_structured_output(extra)
+        elif kind == "tools":
+            llm = llm.bind_tools(extra)
+        _ = prompt | llm
+
+
+async def registry_turn() -> None:
+    """Fetch every chain of one turn from the prebuilt registry."""
+    for name, _ in TURN_CHAINS:
+        await chain_registry.get(name)
+
+
+def _report(label: str, samples: list) -> None:
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<10} mean {statistics.mean(ms):8.3f} ms   "
+        f"p50 {statistics.median(ms):8.3f} ms   "
+        f"p95 {sorted(ms)[int(len(ms) * 0.95) - 1]:8.3f} ms"
+    )
+
+
+async def main(turns: int) -> None:
+    build_start = time.perf_counter()
+    await chain_registry.build()
+    print(f"Registry build (once per process): {(time.perf_counter() - build_start) * 1000:.1f} ms")
+
+    before, after = [], []
+    for _ in range(turns):
+        start = time.perf_counter()
+        legacy_turn()
+        before.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await registry_turn()
+        after.append(time.perf_counter() - start)
+
+    print(f"Per-turn chain overhead over {turns} turns ({len(TURN_CHAINS)} chains/turn):")
+    _report("before", before)
+    _report("after", after)
+    print(f"speed-up   {statistics.mean(before) / max(statistics.mean(after), 1e-9):8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns))
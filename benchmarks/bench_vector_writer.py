@@ -0,0 +1,116 @@
+"""
+Memory point ingestion: one embed + upsert per request vs the buffered VectorWriter.
+
+Each simulated request writes a few conversation summaries.  Written directly
+(`LongTermMemory.aadd_memories`) every request pays one embedding call and one
+upsert; through `VectorWriter` requests share batched calls.  The embedding
+model and Qdrant Cloud are replaced by an in-memory Qdrant plus fixed
+per-call / per-point delays, so throughput depends on round trips only.
+
+    python -m benchmarks.bench_vector_writer --requests 200 --batch-size 64
+"""
+
+import os
+import time
+import asyncio
+import argparse
+
+for _var in ("QDRANT_URL", "QDRANT_API", "GOOGLE_API_KEY"):
+    os.environ.setdefault(_var, "benchmark")
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.vector_writer import VectorWriter
+
+SUMMARIES_PER_REQUEST = 3
+
+
+class SlowEmbeddings(Embeddings):
+    """Fixed round trip per call plus a small per-text cost, like a hosted embedding API."""
+
+    def __init__(self, call_latency: float, text_latency: float):
+        self.call_latency = call_latency
+        self.text_latency = text_latency
+
+    def embed_documents(self, texts):
+        return [[float(len(t)), 1.0] + [0.0] * 766 for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(self.call_latency + self.text_latency * len(texts))
+        return self.embed_documents(texts)
+
+
+def _memory(args) -> LongTermMemory:
+    memory = LongTermMemory(google_api_key="benchmark")
+    memory._async_client = AsyncQdrantClient(location=":memory:")
+    memory._embeddings = SlowEmbeddings(args.embed_latency, args.embed_text_latency)
+    upsert = memory._async_client.upsert
+
+    async def slow_upsert(**kwargs):
+        await asyncio.sleep(args.upsert_latency)
+        return await upsert(**kwargs)
+
+    memory._async_client.upsert = slow_upsert
+    return memory
+
+
+def _summaries(i: int):
+    return [f"request {i} summary {j}" for j in range(SUMMARIES_PER_REQUEST)]
+
+
+async def run_direct(args) -> float:
+    memory = _memory(args)
+    await memory.aensure_memory_collection()
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with limit:
+            await memory.aadd_memories(f"farmer{i % 50}", _summaries(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    return time.perf_counter() - start
+
+
+async def run_buffered(args) -> float:
+    memory = _memory(args)
+    writer = VectorWriter(memory, batch_size=args.batch_size, flush_interval=args.flush_interval,
+                          max_pending=args.batch_size * 16)
+    await memory.aensure_memory_collection()
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with limit:
+            await writer.add_memories(f"farmer{i % 50}", _summaries(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    await writer.aclose()       # time until every point is written
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    points = args.requests * SUMMARIES_PER_REQUEST
+    direct = await run_direct(args)
+    buffered = await run_buffered(args)
+    print(f"{args.requests} requests, {points} points, concurrency {args.concurrency}, batch size {args.batch_size}")
+    print(f"direct     {direct:7.2f} s   {points / direct:8.1f} points/s")
+    print(f"buffered   {buffered:7.2f} s   {points / buffered:8.1f} points/s")
+    print(f"speed-up   {direct / max(buffered, 1e-9):7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--flush-interval", type=float, default=0.2)
+    parser.add_argument("--embed-latency", type=float, default=0.08, help="seconds per embedding call")
+    parser.add_argument("--embed-text-latency", type=float, default=0.001, help="seconds per embedded text")
+    parser.add_argument("--upsert-latency", type=float, default=0.04, help="seconds per upsert")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1 @@
+# Offline end-to-end load test — run `python -m benchmarks.loadtest --help`.
@@ -0,0 +1,220 @@
+"""
+Virtual users and latency reporting for the load test.
+
+Each virtual user registers through `/api/v1/auth/register`, opens a thread
+and then sends questions back to back (plus optional think time) to
+`/message/stream` or `/message` over real HTTP.  Every response becomes a
+`Sample`; `report` groups them per workflow.
+"""
+
+import json
+import math
+import time
+import random
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import httpx
+
+# Questions per intended workflow; the router decides where they really go
+SCENARIOS: Dict[str, List[str]] = {
+    "WeatherNode": [
+        "What is the weather forecast for {place} for the next three days?",
+        "Will it rain in {place} this week?",
+    ],
+    "MandiNode": [
+        "What is the mandi price of {crop} in {place} today?",
+        "Should I sell my {crop} at the market now or wait?",
+    ],
+    "GovSchemeNode": [
+        "Which government scheme gives a subsidy for drip irrigation?",
+        "How do I apply for crop insurance under the PM Fasal Bima Yojana?",
+    ],
+    "DiseaseNode": [
+        "My {crop} leaves have brown spots, which disease is this?",
+        "How do I control leaf blight disease in {crop}?",
+    ],
+    "GeneralNode": [
+        "When should I sow {crop} in {place}?",
+        "How much urea should I apply per acre of {crop}?",
+    ],
+}
+PLACES = ["Patna", "Varanasi", "Nashik", "Ludhiana", "Guntur"]
+CROPS = ["onion", "wheat", "rice", "cotton", "tomato"]
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    intended: str
+    workflow: str
+    ok: bool
+    status: int
+    latency_ms: float
+    ttft_ms: Optional[float] = None
+    tokens: int = 0
+    error: Optional[str] = None
+
+
+def make_query(rng: random.Random, workflow: str) -> str:
+    return rng.choice(SCENARIOS[workflow]).format(place=rng.choice(PLACES), crop=rng.choice(CROPS))
+
+
+class VirtualUser:
+    """One farmer: registers, opens a thread, then asks `requests` questions."""
+
+    def __init__(self, client: httpx.AsyncClient, index: int, run_id: str, endpoint: str,
+                 mix: Dict[str, float], think_time: float, seed: int):
+        self.client = client
+        self.index = index
+        self.run_id = run_id
+        self.endpoint = endpoint
+        self.mix = mix
+        self.think_time = think_time
+        self.rng = random.Random(seed + index)
+        self.headers: Dict[str, str] = {}
+        self.thread_id: Optional[str] = None
+
+    async def setup(self) -> None:
+        response = await self.client.post("/api/v1/auth/register", json={
+            "unique_name": f"lt_{self.run_id}_{self.index}",
+            "phone_number": f"+9199{self.run_id}{self.index:05d}",
+            "password": "loadtest-password",
+            "name": f"Load Test Farmer {self.index}",
+            "district": self.rng.choice(PLACES),
+            "state": "Bihar",
+            "country": "India",
+        })
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await self.client.post("/api/v1/chat/thread/create", json={}, headers=self.headers)
+        response.raise_for_status()
+        self.thread_id = response.json()["thread_id"]
+
+    def _pick_workflow(self) -> str:
+        workflows = list(self.mix)
+        return self.rng.choices(workflows, weights=[self.mix[w] for w in workflows])[0]
+
+    async def run(self, requests: int, deadline: Optional[float], samples: List[Sample]) -> None:
+        for _ in range(requests):
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            intended = self._pick_workflow()
+            query = make_query(self.rng, intended)
+            endpoint = self.endpoint if self.endpoint != "mixed" else self.rng.choice(["stream", "message"])
+            if endpoint == "stream":
+                samples.append(await self.ask_stream(intended, query))
+            else:
+                samples.append(await self.ask(intended, query))
+            if self.think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+    async def ask_stream(self, intended: str, query: str) -> Sample:
+        body = {"query": query, "thread_id": self.thread_id}
+        start = time.perf_counter()
+        ttft = None
+        tokens = 0
+        workflow = intended
+        event = "message"
+        try:
+            async with self.client.stream("POST", "/api/v1/chat/message/stream", json=body, headers=self.headers) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    return Sample("stream", intended, intended, False, response.status_code,
+                                  (time.perf_counter() - start) * 1000, error=response.text[:200])
+                async for line in response.aiter_lines():
+                    line = line.strip()
+                    if line.startswith("event:"):
+                        event = line.split(":", 1)[1].strip()
+                    elif line.startswith("data:"):
+                        data = json.loads(line.split(":", 1)[1].strip())
+                        if event == "error":
+                            return Sample("stream", intended, intended, False, 200,
+                                          (time.perf_counter() - start) * 1000, ttft, tokens, str(data.get("detail")))
+                        if event == "done":
+                            workflow = data.get("workflow") or intended
+                        elif data.get("type") == "token":
+                            if ttft is None:
+                                ttft = (time.perf_counter() - start) * 1000
+                            tokens += 1
+                    elif not line:
+                        event = "message"
+        except httpx.HTTPError as e:
+            return Sample("stream", intended, intended, False, 0, (time.perf_counter() - start) * 1000, error=str(e))
+        return Sample("stream", intended, workflow, tokens > 0, 200, (time.perf_counter() - start) * 1000, ttft, tokens)
+
+    async def ask(self, intended: str, query: str) -> Sample:
+        body = {"query": query, "thread_id": self.thread_id, "stream": False}
+        start = time.perf_counter()
+        try:
+            response = await self.client.post("/api/v1/chat/message", json=body, headers=self.headers)
+        except httpx.HTTPError as e:
+            return Sample("message", intended, intended, False, 0, (time.perf_counter() - start) * 1000, error=str(e))
+        latency = (time.perf_counter() - start) * 1000
+        ok = response.status_code == 200
+        return Sample("message", intended, intended, ok, response.status_code, latency,
+                      error=None if ok else response.text[:200])
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Dict]:
+    groups: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        groups.setdefault(f"{sample.endpoint}/{sample.workflow}", []).append(sample)
+        groups.setdefault(f"{sample.endpoint}/ALL", []).append(sample)
+
+    summary = {}
+    for key, group in sorted(groups.items()):
+        latencies = [s.latency_ms for s in group if s.ok]
+        ttfts = [s.ttft_ms for s in group if s.ok and s.ttft_ms is not None]
+        summary[key] = {
+            "requests": len(group),
+            "errors": sum(1 for s in group if not s.ok),
+            "throughput_rps": round(len(group) / elapsed, 2) if elapsed else None,
+            **{f"p{p}_ms": _round(percentile(latencies, p)) for p in (50, 95, 99)},
+            **{f"ttft_p{p}_ms": _round(percentile(ttfts, p)) for p in (50, 95, 99)},
+        }
+    return summary
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def format_report(summary: Dict[str, Dict]) -> str:
+    header = (f"{'endpoint/workflow':<28}{'reqs':>6}{'err':>5}{'rps':>8}"
+              f"{'p50':>9}{'p95':>9}{'p99':>9}{'ttft50':>9}{'ttft95':>9}{'ttft99':>9}")
+    lines = [header, "-" * len(header)]
+    cell = lambda v: f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+    for key, row in summary.items():
+        lines.append(
+            f"{key:<28}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps'] or 0:>8.2f}"
+            + "".join(cell(row[k]) for k in ("p50_ms", "p95_ms", "p99_ms", "ttft_p50_ms", "ttft_p95_ms", "ttft_p99_ms"))
+        )
+    return "\n".join(lines)
+
+
+def error_breakdown(samples: List[Sample], limit: int = 5) -> List[str]:
+    counts: Dict[str, int] = {}
+    for sample in samples:
+        if not sample.ok:
+            key = f"{sample.endpoint} {sample.status}: {sample.error}"
+            counts[key] = counts.get(key, 0) + 1
+    return [f"{n:>5} x {key}" for key, n in sorted(counts.items(), key=lambda item: -item[1])[:limit]]
+
+
+def samples_as_dicts(samples: List[Sample]) -> List[Dict]:
+    return [asdict(sample) for sample in samples]
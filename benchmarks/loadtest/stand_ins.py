@@ -0,0 +1,285 @@
+"""
+Local stand-ins for the external services on the chat path.
+
+  * `FakeStreamingChatModel` replaces Groq / Gemini: configurable time to first
+    token and token rate, real tool calls for the workflow tools and canned
+    structured output for the router and memory chains.
+  * `CannedAPIServer` is an aiohttp app that answers the OpenWeather,
+    Weatherstack, data.gov.in and Tavily endpoints with fixed payloads after a
+    configurable delay.
+  * `install_vector_store` points `LongTermMemory` at an in-memory Qdrant and
+    deterministic fake embeddings behind the embedding cache.
+
+Postgres is not replaced — the harness runs against a local instance.
+"""
+
+import re
+import json
+import uuid
+import socket
+import random
+import asyncio
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from aiohttp import web
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel, agenerate_from_stream, generate_from_stream
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.outputs import ChatGenerationChunk, ChatResult, ChatGeneration
+from langchain_core.runnables import RunnableLambda
+
+
+# ---------------------------------------------------------------------------
+# Chat model
+# ---------------------------------------------------------------------------
+
+# Keyword routing for the fake LLM router (first match wins)
+ROUTE_KEYWORDS = [
+    ("WeatherNode",   ("weather", "rain", "forecast", "temperature")),
+    ("MandiNode",     ("price", "mandi", "market", "sell")),
+    ("GovSchemeNode", ("scheme", "subsidy", "yojana", "insurance")),
+    ("DiseaseNode",   ("disease", "blight", "pest", "spots", "wilt")),
+]
+
+# Arguments the fake model passes to each workflow tool; tools not listed
+# (rag_tool, call_tool) are never called, so GeneralNode answers directly.
+TOOL_ARGS = {
+    "weather_forecast_tool":     lambda query: {"place": "Patna", "days": 3},
+    "mandi_price_forecast_tool": lambda query: {"commodity": "Onion", "state": "Bihar"},
+    "gov_scheme_tool":           lambda query: {"query": query},
+    "tavily_search":             lambda query: {"query": query},
+}
+
+ANSWER_WORDS = (
+    "Based on the latest information for your area the recommended step is to monitor "
+    "the field closely apply the advised dose in the evening and check again after three days"
+).split()
+
+
+def _query_of(prompt: str) -> str:
+    """The user's question inside a rendered prompt (last 'query' field)."""
+    match = re.search(r'Given the query: "(.*?)", determine', prompt, re.DOTALL)
+    if match:
+        return match.group(1)
+    matches = re.findall(r"(?:Query|query)[^:\n]*:\s*\**\s*(.+)", prompt)
+    return matches[-1].strip() if matches else prompt[-200:]
+
+
+def route_for(query: str) -> str:
+    lowered = query.lower()
+    for workflow, keywords in ROUTE_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return workflow
+    return "GeneralNode"
+
+
+def structured_reply(schema, prompt: str):
+    """Canned structured output for the router and memory chains."""
+    name = schema.__name__
+    if name == "Router":
+        return schema(route_node=route_for(_query_of(prompt)), output="TextNode")
+    if name == "MemoryAnalysis1":
+        return schema(is_important="Yes")
+    if name == "MemoryAnalysis2":
+        return schema(summary=f"Farmer asked: {_query_of(prompt)[:120]}")
+    if name == "MemoryBatchAnalysis":
+        turns = sorted({int(n) for n in re.findall(r"Turn (\d+):", prompt)})
+        return schema(turns=[
+            {"turn": n, "is_important": "Yes" if n % 2 else "No", "summary": f"Turn {n} summary" if n % 2 else ""}
+            for n in turns
+        ])
+    raise ValueError(f"No canned structured output for {name}")
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """Streams a fixed answer with realistic pacing; emits tool calls when tools are bound."""
+
+    ttft: float = 0.35              # seconds before the first token / tool call
+    tokens_per_sec: float = 60.0
+    answer_words: int = 80
+
+    @property
+    def _llm_type(self) -> str:
+        return "loadtest-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tool_names=[getattr(tool, "name", None) for tool in tools])
+
+    def with_structured_output(self, schema, **kwargs):
+        async def respond(prompt_value):
+            await asyncio.sleep(self.ttft)
+            return structured_reply(schema, prompt_value.to_string())
+
+        def respond_sync(prompt_value):
+            return structured_reply(schema, prompt_value.to_string())
+
+        return RunnableLambda(respond_sync, afunc=respond)
+
+    def _tool_call(self, messages: List[BaseMessage], tool_names: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        for name in tool_names or []:
+            if name in TOOL_ARGS:
+                query = _query_of(messages[-1].content if isinstance(messages[-1].content, str) else "")
+                return {"name": name, "args": TOOL_ARGS[name](query), "id": f"call_{uuid.uuid4().hex[:12]}"}
+        return None
+
+    def _answer(self) -> List[str]:
+        words = [ANSWER_WORDS[i % len(ANSWER_WORDS)] for i in range(self.answer_words)]
+        return [word + " " for word in words]
+
+    async def _astream(self, messages, stop=None, run_manager=None, tool_names=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.ttft)
+        call = self._tool_call(messages, tool_names)
+        if call is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                tool_call_chunk(name=call["name"], args=json.dumps(call["args"]), id=call["id"], index=0)
+            ]))
+            return
+        delay = 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+        for i, token in enumerate(self._answer()):
+            if i:
+                await asyncio.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return await agenerate_from_stream(self._astream(messages, stop=stop, **kwargs))
+
+    def _generate(self, messages, stop=None, run_manager=None, tool_names=None, **kwargs) -> ChatResult:
+        call = self._tool_call(messages, tool_names)
+        if call is not None:
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=[call]))])
+        return generate_from_stream(iter(ChatGenerationChunk(message=AIMessageChunk(content=t)) for t in self._answer()))
+
+
+# ---------------------------------------------------------------------------
+# Canned HTTP APIs
+# ---------------------------------------------------------------------------
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class CannedAPIServer:
+    """OpenWeather, Weatherstack, data.gov.in and Tavily answered from fixed payloads."""
+
+    def __init__(self, latency: float = 0.15, host: str = "127.0.0.1", port: Optional[int] = None):
+        self.latency = latency
+        self.host = host
+        self.port = port or free_port(host)
+        self.calls: Dict[str, int] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _respond(self, name: str, payload: Any) -> web.Response:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        # +/-30% jitter so concurrent calls do not finish in lock-step
+        await asyncio.sleep(self.latency * random.uniform(0.7, 1.3))
+        return web.json_response(payload)
+
+    async def openweather_forecast(self, request: web.Request) -> web.Response:
+        count = int(request.query.get("cnt", 40))
+        start = date.today()
+        forecasts = [
+            {
+                "dt_txt": f"{start + timedelta(hours=3 * i // 24)} {(3 * i) % 24:02d}:00:00",
+                "main": {"temp": 27 + i % 5, "feels_like": 29 + i % 5, "humidity": 60 + i % 20},
+                "weather": [{"description": "scattered clouds" if i % 3 else "light rain"}],
+            }
+            for i in range(count)
+        ]
+        city = request.query.get("q", "Patna")
+        return await self._respond("openweather", {"city": {"name": city, "country": "IN"}, "list": forecasts})
+
+    async def weatherstack_current(self, request: web.Request) -> web.Response:
+        place = request.query.get("query", "Patna")
+        return await self._respond("weatherstack", {
+            "location": {"name": place, "country": "India"},
+            "current": {"temperature": 29, "weather_descriptions": ["Partly cloudy"], "humidity": 64, "precip": 0.2},
+        })
+
+    async def data_gov_resource(self, request: web.Request) -> web.Response:
+        commodity = request.query.get("filters[commodity]", "Onion")
+        start = date.today() - timedelta(days=30)
+        records = [
+            {
+                "state": "Bihar", "district": "Patna", "market": "Patna Mandi", "commodity": commodity,
+                "arrival_date": str(start + timedelta(days=i)),
+                "min_price": 2000 + 10 * i, "max_price": 2600 + 10 * i, "modal_price": 2300 + 10 * i + (i % 4) * 15,
+            }
+            for i in range(30)
+        ]
+        return await self._respond("data_gov", {"records": records, "total": len(records)})
+
+    async def tavily_search(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        query = body.get("query", "")
+        results = [
+            {
+                "title": f"Extension advisory {i + 1}",
+                "url": f"https://example.org/advisory/{i + 1}",
+                "content": f"Guidance related to '{query}': inspect leaves, remove infected plants, "
+                           f"spray the recommended fungicide at 2 g/litre.",
+                "score": 0.9 - i * 0.1,
+            }
+            for i in range(body.get("max_results", 2))
+        ]
+        return await self._respond("tavily", {"query": query, "results": results, "response_time": self.latency})
+
+    async def start(self) -> "CannedAPIServer":
+        app = web.Application()
+        app.router.add_get("/data/2.5/forecast", self.openweather_forecast)
+        app.router.add_get("/current", self.weatherstack_current)
+        app.router.add_get("/resource/{resource_id}", self.data_gov_resource)
+        app.router.add_post("/search", self.tavily_search)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def point_tavily_at(base_url: str) -> None:
+    """langchain_tavily reads its endpoint from a module constant at call time."""
+    import langchain_tavily._utilities as tavily_utilities
+    tavily_utilities.TAVILY_API_URL = base_url
+
+
+# ---------------------------------------------------------------------------
+# Vector store
+# ---------------------------------------------------------------------------
+
+GOV_SCHEME_DOCS = [
+    "PM-KISAN provides income support of Rs 6000 per year to landholding farmer families in three instalments.",
+    "Pradhan Mantri Fasal Bima Yojana offers crop insurance against natural calamities at a 2% premium for kharif crops.",
+    "The Soil Health Card scheme gives farmers crop-wise nutrient recommendations every two years.",
+    "PM Krishi Sinchayee Yojana subsidises drip and sprinkler irrigation under 'Per Drop More Crop'.",
+    "Kisan Credit Card holders can borrow up to Rs 3 lakh at 4% interest with prompt repayment.",
+]
+
+
+async def install_vector_store(memory) -> None:
+    """
+    Point LongTermMemory at in-memory Qdrant with deterministic embeddings and
+    seed scheme docs.  The sync and async in-memory clients do not share
+    points, so both are seeded.
+    """
+    from qdrant_client import AsyncQdrantClient, QdrantClient
+    from src.ai_component.modules.cache.embedding_cache import CachedEmbeddings
+
+    memory._client = QdrantClient(location=":memory:")
+    memory._async_client = AsyncQdrantClient(location=":memory:")
+    memory._embeddings = CachedEmbeddings(DeterministicFakeEmbedding(size=768), model="fake-768", path=None)
+    seed = dict(collection_name="Government_scheme", data=GOV_SCHEME_DOCS,
+                additional_metadata={"type": "government_scheme"})
+    memory.ingest_data(**seed)
+    memory._collections = None      # the async client starts empty
+    await memory.aingest_data(**seed)
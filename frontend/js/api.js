@@ -255,9 +255,14 @@ export async function getThreads({ limit = 50, offset = 0 } = {}) {
   return apiFetch(`/chat/threads?limit=${limit}&offset=${offset}`);
 }
 
-/** GET /chat/thread/{threadId}/messages → { messages: [...] } */
-export async function getMessages(threadId) {
-  return apiFetch(`/chat/thread/${encodeURIComponent(threadId)}/messages`);
+/**
+ * GET /chat/thread/{threadId}/messages → { messages: [...], has_more, next_cursor }
+ * Newest page first; pass the previous page's next_cursor as `before` for older messages.
+ */
+export async function getMessages(threadId, { limit = 50, before = null } = {}) {
+  const params = new URLSearchParams({ limit });
+  if (before !== null && before !== undefined) params.set('before', before);
+  return apiFetch(`/chat/thread/${encodeURIComponent(threadId)}/messages?${params}`);
 }
 
 /** DELETE /chat/thread/{threadId} → { message: "..." } */
@@ -279,7 +284,7 @@ export async function deleteThread(threadId) {
  *
  * SSE protocol used by the backend:
  *   data: {"content": "token", "type": "token"}   ← normal token chunk
- *   event: done\ndata: {}                          ← stream complete
+ *   event: done\ndata: {"ttft_ms": …}            ← stream complete (+ timing stats)
  *   event: error\ndata: {"detail": "..."}          ← explicit backend error
  *
  * Requirements:
@@ -307,8 +312,7 @@ export function streamMessage(query, threadId, onToken, onDone, onError) {
     const token = getAccessToken();
     const url = `${API_BASE}/chat/message/stream?` +
       `query=${encodeURIComponent(query)}` +
-      `&thread_id=${encodeURIComponent(threadId)}` +
-      `&workflow=GeneralNode`;
+      `&thread_id=${encodeURIComponent(threadId)}`;
 
     let res;
     try {
@@ -38,6 +38,10 @@ let totalThreads = 0;
 let hasMore = false;
 let isLoadingMore = false;
 
+// Message history pagination (cursor of the oldest loaded page)
+let historyCursor = null;
+let isLoadingOlder = false;
+
 // ---------------------------------------------------------------------------
 // DOM refs (populated after DOMContentLoaded)
 // ---------------------------------------------------------------------------
@@ -292,9 +296,10 @@ async function selectThread(threadId) {
   showLoadingDots(); // temporary indicator
 
   try {
-    const data = await getMessages(threadId);
+    const data = await getMessages(threadId, { limit: PAGE_SIZE });
+    if (threadId !== activeThreadId) return; // switched threads while loading
     hideLoadingDots();
-    renderHistory(data.messages || []);
+    renderHistory(data);
   } catch (err) {
     // Req 8.11 — keep current chat displayed, show error
     hideLoadingDots();
@@ -304,14 +309,62 @@ async function selectThread(threadId) {
   setInputEnabled(true);
 }
 
-function renderHistory(messages) {
+function renderHistory(data) {
   clearMessages();
-  for (const msg of messages) {
+  for (const msg of data.messages || []) {
     appendMessage(msg.role === 'user' ? 'user' : 'assistant', msg.content);
   }
+  setHistoryCursor(data);
   scrollToBottom();
 }
 
+/** Remember where the next older page starts and show / hide the "load older" control. */
+function setHistoryCursor(data) {
+  historyCursor = data.has_more ? data.next_cursor : null;
+  let btn = document.getElementById('load-older-btn');
+  if (historyCursor === null) {
+    btn?.remove();
+    return;
+  }
+  if (!btn) {
+    btn = document.createElement('button');
+    btn.id = 'load-older-btn';
+    btn.className = 'btn-load-more btn-load-older';
+    btn.textContent = 'Load older messages';
+    btn.addEventListener('click', loadOlderMessages);
+    messagesAreaEl.prepend(btn);
+  }
+}
+
+/** Prepend the previous page of the active thread, keeping the scroll position. */
+async function loadOlderMessages() {
+  if (isLoadingOlder || historyCursor === null) return;
+  const threadId = activeThreadId;
+  const btn = document.getElementById('load-older-btn');
+  isLoadingOlder = true;
+  btn.disabled = true;
+  btn.textContent = 'Loading…';
+
+  try {
+    const data = await getMessages(threadId, { limit: PAGE_SIZE, before: historyCursor });
+    if (threadId !== activeThreadId) return; // switched threads while loading
+    const previousHeight = messagesAreaEl.scrollHeight;
+    const anchor = btn.nextSibling;
+    for (const msg of data.messages || []) {
+      const el = appendMessage(msg.role === 'user' ? 'user' : 'assistant', msg.content);
+      messagesAreaEl.insertBefore(el, anchor);
+    }
+    setHistoryCursor(data);
+    messagesAreaEl.scrollTop += messagesAreaEl.scrollHeight - previousHeight;
+  } catch (err) {
+    showHistoryError('Could not load older messages. ' + (err.message || ''));
+  } finally {
+    isLoadingOlder = false;
+    btn.disabled = false;
+    btn.textContent = 'Load older messages';
+  }
+}
+
 // ---------------------------------------------------------------------------
 // New Chat
 // ---------------------------------------------------------------------------
@@ -461,6 +514,7 @@ async function handleSend() {
 
 function clearMessages() {
   messagesAreaEl.innerHTML = '';
+  historyCursor = null;
 }
 
 function appendMessage(role, content) {
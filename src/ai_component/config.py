@@ -1,3 +1,5 @@
+import os
+
 # =============================================================================
 # Model selection
 # =============================================================================
@@ -36,6 +38,13 @@ max_result = 2
 DEFAULT_FORECAST_COUNT = 40
 DEFAULT_DAYS = 5
 
+# =============================================================================
+# External tool APIs (overridable so load tests can use local stand-ins)
+# =============================================================================
+openweather_base_url = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org")
+weatherstack_base_url = os.getenv("WEATHERSTACK_BASE_URL", "https://api.weatherstack.com")
+data_gov_base_url    = os.getenv("DATA_GOV_BASE_URL", "https://api.data.gov.in")
+
 # =============================================================================
 # Image generation (Together API)
 # =============================================================================
@@ -54,3 +63,159 @@ image_url    = (
 # =============================================================================
 top_collection_search = 3
 top_database_search   = 10
+# Every user's profile and conversation summaries share one collection; points
+# carry the user's unique_name in `metadata.tenant` (keyword payload index).
+# Move the old one-collection-per-user layout with
+# `python -m src.ai_component.modules.memory.migrate_tenants`.
+memory_collection     = os.getenv("QDRANT_MEMORY_COLLECTION", "kisan_memory")
+# Collections that hold shared documents, never user memory
+shared_collections    = ("Government_scheme", "Government_scheme_metadata")
+# Known-collections cache: positives are trusted for this long, a miss is always
+# confirmed with Qdrant (other workers and the CLIs create / drop collections)
+collections_cache_ttl = 300.0   # seconds
+
+# =============================================================================
+# Government scheme corpus (PDFs indexed by `python -m src.ai_component.modules.memory.ingest_schemes`)
+# =============================================================================
+# Every point records its PDF's content hash and chunk position, so re-runs read
+# what is indexed back from the collection and only index the delta.
+scheme_collection       = "Government_scheme"
+scheme_data_path        = os.getenv("SCHEME_DATA_PATH", "data")
+scheme_chunk_size       = 500
+scheme_chunk_overlap    = 20
+scheme_embed_batch_size = 64      # chunks per embed_documents call and upsert (the resume granularity)
+scheme_parse_workers    = min(4, os.cpu_count() or 1)   # PDF parsing processes
+
+# gov_scheme_tool: BM25 + vector search fused by reciprocal rank fusion
+scheme_search_k          = 4        # chunks returned per query
+scheme_search_candidates = 20       # candidates taken from each ranking before fusion
+scheme_rrf_k             = 60       # RRF damping constant
+scheme_index_refresh     = 60 * 60  # seconds before the in-process BM25 index is reloaded
+scheme_not_ready_recheck = 60.0     # seconds before an empty collection is checked again
+
+# =============================================================================
+# Intent classifier (local routing fast path in front of the LLM router)
+# =============================================================================
+intent_classifier_enabled   = True
+intent_confidence_threshold = 0.75   # below this the LLM router decides
+
+# =============================================================================
+# Conversation window (prompt history kept verbatim; older turns are summarised)
+# =============================================================================
+history_max_turns    = 6      # most recent user turns kept verbatim
+history_token_budget = 1500   # approx. tokens of verbatim history per prompt
+
+# =============================================================================
+# Memory ingestion queue (long-term memory writes run off the response path)
+# =============================================================================
+ingestion_queue_size        = 256
+ingestion_workers           = 2
+ingestion_max_retries       = 3
+ingestion_retry_backoff     = 1.0            # seconds, doubled per attempt
+ingestion_overflow_policy   = "drop_oldest"  # "drop_oldest" | "drop_new" | "block"
+ingestion_enqueue_timeout   = 0.05           # seconds a producer waits for space under "block"
+ingestion_degrade_watermark = 0.8            # fill ratio above which summaries are stored without embeddings
+ingestion_drain_timeout     = 10.0           # seconds allowed to flush the queue on shutdown
+memory_batch_size           = 5              # turns per thread summarised in one LLM call (1 = per turn)
+memory_batch_max_wait       = 120.0          # seconds a partial batch waits before it is flushed
+
+# =============================================================================
+# Long-term memory store (conversation summaries injected into every turn)
+# =============================================================================
+#   "postgres" — AsyncPostgresStore with a pgvector index (Neon needs the `vector` extension)
+#   "qdrant"   — the user's tenant of the shared Qdrant memory collection
+# Move existing summaries with `python -m src.ai_component.modules.memory.migrate_memory`;
+# after upgrading, run it once `--to postgres` so older summaries get embeddings
+# (README "Long-term memory backend").
+long_term_memory_backend = os.getenv("LONG_TERM_MEMORY_BACKEND", "postgres")
+long_term_memory_dims    = 768    # text-embedding-004
+long_term_memory_limit   = 10     # summaries injected per turn
+
+# =============================================================================
+# Vector write buffer (batched embedding + bulk upsert of Qdrant memory points)
+# =============================================================================
+# A buffered point becomes searchable after at most `vector_write_flush_interval`.
+vector_write_batch_size     = 64      # points per embed_documents call and upsert
+vector_write_flush_interval = 2.0     # seconds a point may wait in the buffer
+vector_write_max_pending    = 1024    # buffered points before a producer flushes inline
+vector_write_concurrency    = 4       # batches written at once by one flush
+vector_write_max_attempts   = 5       # failed flushes before a point is dropped
+
+# =============================================================================
+# Semantic answer cache (near-duplicate questions skip tools and answer LLM)
+# =============================================================================
+semantic_cache_enabled     = True
+semantic_cache_threshold   = 0.92    # cosine similarity needed to reuse an answer
+semantic_cache_max_entries = 2000    # LRU capacity across all workflows
+semantic_cache_min_words   = 4       # shorter queries are treated as follow-ups
+semantic_cache_ttls = {              # seconds; workflows not listed are never cached
+    # (GeneralNode and DiseaseNode answer from the conversation history)
+    "WeatherNode":         30 * 60,
+    "MandiNode":           60 * 60,
+    "GovSchemeNode":       7 * 24 * 60 * 60,
+    "CarbonFootprintNode": 7 * 24 * 60 * 60,
+}
+
+# =============================================================================
+# Embedding cache (every query / document embedding, keyed by model + text hash)
+# =============================================================================
+embedding_cache_max_entries = 20_000   # in-memory LRU; ~3 KB per 768-dim vector
+embedding_cache_path        = os.getenv("EMBEDDING_CACHE_PATH")   # SQLite file; unset = memory only
+
+# =============================================================================
+# Tool cache (TTL + stale-while-revalidate + single-flight, keyed by tool name)
+# =============================================================================
+# rag_tool and call_tool are per-user / side-effecting and are never cached.
+tool_cache_settings = {
+    "weather_report_tool":       {"ttl": 10 * 60,      "stale_ttl": 10 * 60, "max_entries": 512},
+    "weather_forecast_tool":     {"ttl": 30 * 60,      "stale_ttl": 30 * 60, "max_entries": 512},
+    "mandi_price_forecast_tool": {"ttl": 60 * 60,      "stale_ttl": 60 * 60, "max_entries": 512},
+    "gov_scheme_tool":           {"ttl": 24 * 60 * 60, "stale_ttl": 0,       "max_entries": 256},
+    "tavily_search":             {"ttl": 30 * 60,      "stale_ttl": 30 * 60, "max_entries": 512},
+}
+
+# =============================================================================
+# Speculative answering (start the likely workflow while the LLM router runs)
+# =============================================================================
+speculation_enabled = False   # trades extra tokens on misses for one less round trip
+speculation_ttl     = 120.0   # seconds before an unclaimed speculation is cancelled
+
+# =============================================================================
+# Prometheus metrics (served on /metrics)
+# =============================================================================
+metrics_latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)   # seconds
+metrics_query_buckets   = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)  # seconds, SQL
+
+# =============================================================================
+# Media store (generated images / voice kept out of checkpointed state)
+# =============================================================================
+# "file://<dir>" (local disk, default) or "s3://<bucket>/<prefix>" (any S3-compatible
+# object store; needs boto3 and MEDIA_S3_ENDPOINT_URL for R2 / MinIO)
+media_store_url        = os.getenv("MEDIA_STORE_URL", "file://data/media")
+media_s3_endpoint_url  = os.getenv("MEDIA_S3_ENDPOINT_URL") or None
+# Public base URL the blobs are served from (e.g. a CDN in front of the bucket);
+# empty means they are served by the backend at /api/v1/media/<ref>
+media_public_base_url  = os.getenv("MEDIA_PUBLIC_BASE_URL", "").rstrip("/")
+
+# =============================================================================
+# Checkpoint durability (how often graph state is written to Postgres)
+# =============================================================================
+#   "step"         — after every superstep (default; ~10 writes per tool turn)
+#   "exit"         — once when the turn finishes; a crash mid-turn loses that turn
+#   "write_behind" — once per turn, flushed in the background; a crash loses at
+#                    most `checkpoint_flush_interval` seconds of finished turns
+# "exit" / "write_behind" are opt-in (CHECKPOINT_DURABILITY, see .env_example).
+checkpoint_durability      = os.getenv("CHECKPOINT_DURABILITY", "step")
+checkpoint_flush_interval  = 1.0    # seconds between write-behind flushes (the loss window)
+checkpoint_max_pending     = 256    # buffered writes before a producer flushes inline
+
+# =============================================================================
+# Postgres connection pools (SQLAlchemy engine + LangGraph saver/store)
+# =============================================================================
+# Each of the two pools holds up to `db_pool_max_size` connections to Neon;
+# size them together against the compute's connection limit.
+db_pool_min_size   = int(os.getenv("DB_POOL_MIN_SIZE", "2"))    # kept open (LangGraph pool)
+db_pool_max_size   = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+db_pool_timeout    = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+db_pool_max_idle   = 240.0    # seconds; retire idle connections before Neon's 5-minute idle cut-off
+db_pool_recycle    = 1800.0   # seconds; replace connections older than this
@@ -158,7 +158,7 @@ class Template:
     User query: {query}
 
     You have access to two tools:
-    1. gov_scheme_tool: A vector search tool that searches for government schemes from a comprehensive database
+    1. gov_scheme_tool: A keyword + vector search tool that searches for government schemes from a comprehensive database
     2. tavily_search: A web search tool for finding the most current government schemes and programs
 
     Instructions:
@@ -234,4 +234,38 @@ class Template:
     - summary should be short and store all important thing
 
     Conversation : {conversation}
+    """
+
+
+    memory_batch_template = """
+    You are an helpful AI Assistant that decides which turns of a conversation between the user and LLM
+    should be stored in Long Term Memory, and summarizes the ones that should.
+
+    For every numbered turn below decide "Yes" or "No" and, for "Yes", write a short summary
+    - Always choose turns which may be used in future
+    - User query about weather condition are not that much important, so need not to store
+    - query like disease in plants spreading, mandi prices of commodity, should be store
+    - normal conversation need not to store
+    - if a turn has any numerical data, then it should be in summary
+    - return one entry per turn, using the turn number given below
+
+    Conversation turns :
+    {conversations}
+    """
+
+
+    history_summary_template = """
+    You maintain a running summary of an ongoing conversation between a farmer and an AI assistant.
+    Fold the new messages into the existing summary.
+
+    Some important things you have to remember
+    - keep crops, locations, numbers, dates, prices and any decisions or open questions
+    - drop greetings and small talk
+    - keep the summary under 150 words
+    - return only the updated summary
+
+    Existing summary : {summary}
+
+    New messages :
+    {conversation}
     """
\ No newline at end of file
@@ -31,6 +31,15 @@ def select_workflow(state: AICompanionState) -> str:
         raise CustomException(e, sys) from e
     
 
+def select_cached_or_workflow(state: AICompanionState) -> str:
+    """
+    Skip the workflow entirely when the semantic cache already answered the turn.
+    """
+    if state.get("cache_hit"):
+        return "CachedAnswer"
+    return select_workflow(state)
+
+
 def select_output_workflow(state: AICompanionState) -> str:
     """
     these will return the format of output in whcih user want
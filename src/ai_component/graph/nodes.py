@@ -2,24 +2,24 @@ import os
 import sys
 import io
 import wave
-import base64
 import asyncio
-from cartesia import Cartesia
 from datetime import datetime
-from src.ai_component.graph.utils.chains import async_router_chain
-from src.ai_component.llm import LLMChainFactory
+from src.ai_component.graph.utils.chains import chain_registry
+from src.ai_component.graph.utils.speculation import speculator, first_pass_inputs
 from src.ai_component.modules.schedule.context_generation import ScheduleContextGenerator
+from src.ai_component.modules.intent.intent_classifier import intent_classifier
 from src.ai_component.graph.state import AICompanionState
-from src.ai_component.core.prompts import Template
-from src.ai_component.tools.all_tools import Tools
-from src.ai_component.modules.memory.memory_manager import memory_manager
-from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.modules.memory.ingestion_queue import memory_ingestion_queue
+from src.ai_component.modules.cache.semantic_cache import semantic_cache
+from src.ai_component.modules.memory.profile_seeder import profile_seeder
+from src.ai_component.modules.media.media_store import media_store
+from src.ai_component.modules.memory.conversation_window import prompt_history
+from src.ai_component.modules.memory.conversation_summary import conversation_summaries
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
-from src.ai_component.config import default_model
-from src.database.database import user_db
+from src.ai_component.config import intent_classifier_enabled
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,47 +30,72 @@ load_dotenv()
 # Node                 | Status          | Notes
 # ---------------------|-----------------|------------------------------------
 # RouteNode            | Implemented     | Routes to workflow nodes
-# UserNode             | Implemented     | Loads user profile into Qdrant
+# UserNode             | Implemented     | Seeds user profile once per version
 # ContextIngestionNode | Implemented     | Injects schedule context
+# HistoryNode          | Implemented     | Token-budgeted window + rolling summary
+# ContextJoinNode      | Implemented     | Joins the four parallel branches above
+# SemanticCacheNode    | Implemented     | Serves near-duplicate questions from cache
 # GeneralNode          | Implemented     | General farming assistant
 # DiseaseNode          | Implemented     | Crop disease diagnosis
 # WeatherNode          | Implemented     | Weather forecast/report
 # MandiNode            | Implemented     | Market price data
 # GovSchemeNode        | Implemented     | Government scheme lookup
 # CarbonFootprintNode  | Coming soon     | Requires new carbon data API key
-# MemoryIngestionNode  | Implemented     | Stores conversation summaries
+# MemoryIngestionNode  | Implemented     | Queues conversation storage + summary update
 # ImageNode            | Implemented*    | Requires TOGETHER_API_KEY
 # VoiceNode            | Implemented*    | Requires CARTESIA_API_KEY
 # TextNode             | Implemented     | Passes through final AI message
 # =============================================================================
 
-cartesia_client = None
-try:
-    cartesia_api_key = os.getenv('CARTESIA_API_KEY')
-    if cartesia_api_key:
-        cartesia_client = Cartesia(api_key=cartesia_api_key)
-except Exception as e:
-    logging.error(f"Failed to initialize Cartesia client: {str(e)}")
+_cartesia_client = None
+
+
+def get_cartesia_client():
+    """Cartesia client for VoiceNode, created (and the SDK imported) on first use."""
+    global _cartesia_client
+    if _cartesia_client is None:
+        try:
+            cartesia_api_key = os.getenv('CARTESIA_API_KEY')
+            if cartesia_api_key:
+                from cartesia import Cartesia
+                _cartesia_client = Cartesia(api_key=cartesia_api_key)
+        except Exception as e:
+            logging.error(f"Failed to initialize Cartesia client: {str(e)}")
+    return _cartesia_client
 
 
 class Nodes:
     @staticmethod
-    async def route_node(state: AICompanionState) -> dict:
+    async def route_node(state: AICompanionState, config: RunnableConfig) -> dict:
         try:
             logging.info("Calling Route Node")
             query = state["messages"][-1].content if state["messages"] else ""
             workflow = "GeneralNode"
             output = None
             if query:
-                chain = await async_router_chain()
-                response = await chain.ainvoke({"query": query})
-                workflow = response.route_node
-                output = response.output
+                # Local fast path first: honours the client's workflow hint and
+                # skips the LLM router whenever the classifier is confident.
+                prediction = None
+                if intent_classifier_enabled or state.get("workflow_hint"):
+                    prediction = intent_classifier.classify(query, hint=state.get("workflow_hint"))
+                if prediction is not None:
+                    workflow = prediction.route_node
+                    output = prediction.output
+                else:
+                    # Optionally start the likely workflow while the router LLM decides
+                    turn_id = state["messages"][-1].id
+                    thread_id = config.get("configurable", {}).get("thread_id")
+                    speculator.start(turn_id, state, conversation_summaries.cached(thread_id))
+                    chain = await chain_registry.get("router")
+                    response = await chain.ainvoke({"query": query})
+                    workflow = response.route_node
+                    output = response.output
+                    speculator.resolve(turn_id, workflow)
+                    intent_classifier.record_fallback(workflow)
                 logging.info(f"Route Node selected: {workflow}")
             return {
                 "workflow": workflow,
                 "output": output,
-                "messages": state["messages"]
             }
         except CustomException as e:
             logging.error(f"Error in route_node: {e}")
@@ -82,40 +107,17 @@ class Nodes:
             logging.info("Calling Simple User Node")
             user_unique_name = state['collection_name']
             if not user_unique_name:
-                return {"messages": state["messages"], "error": "No user provided"}
-            if not await user_db.user_exists(user_unique_name):
-                return {"messages": state["messages"], "error": "User not found"}
-            user_data = await user_db.get_user_by_unique_name(user_unique_name)
-            if not user_data:
-                return {"messages": state["messages"], "error": "Could not retrieve user data"}
-            memory.create_collection(collection_name=user_unique_name)
-            existing_profile = memory.search_in_collection(
-                query="user profile information name age location",
-                collection_name=user_unique_name,
-                k=1
-            )
-            if not existing_profile or len(existing_profile) == 0:
-                user_info = f"""
-                User: {user_data.get("full_name") or user_unique_name} ({user_unique_name})
-                Age: {user_data.get("age")}
-                Location: {user_data.get("city") or ''}, {user_data.get("district") or ''}, {user_data.get("state") or ''}, {user_data.get("country") or ''}
-                Address: {user_data.get("resident") or 'Not provided'}
-                """.strip()
-                memory.ingest_data(
-                    collection_name=user_unique_name,
-                    data=user_info,
-                    additional_metadata={"type": "user_profile"}
-                )
-                logging.info(f"User data stored for {user_unique_name}")
-            else:
-                logging.info(f"User profile already exists for {user_unique_name}, skipping storage")
-            return {"messages": state["messages"]}
+                return {"errors": ["No user provided"]}
+            # Warm path: no Postgres or Qdrant work once this profile version is seeded
+            if not await profile_seeder.ensure_seeded(user_unique_name):
+                return {"errors": ["User not found"]}
+            return {"location": profile_seeder.location(user_unique_name)}
         except CustomException as e:
             logging.error(f"Error in user node : {str(e)}")
             raise CustomException(e, sys) from e
         except Exception as e:
             logging.error(f"Error in SimpleUserNode: {str(e)}")
-            return {"messages": state["messages"], "error": str(e)}
+            return {"errors": [str(e)]}
 
     @staticmethod
     async def context_injestion_node(state: AICompanionState) -> dict:
@@ -124,23 +126,19 @@ class Nodes:
             activity = ScheduleContextGenerator.get_current_activity() or "No scheduled activity."
             logging.info(f"Current activity: {activity}")
 
-            # Inject per-user long-term memories from AsyncPostgresStore
+            # Inject the user's long-term memories most relevant to this message
             long_term_context = ""
             try:
-                from src.ai_component.graph.graph import get_store
-                store = await get_store()
-                if store is not None:
-                    collection_name = state.get("collection_name", "")
-                    query = state["messages"][-1].content if state["messages"] else ""
-                    if collection_name and query:
-                        namespace = ("long_term", collection_name)
-                        results = await store.asearch(namespace, query=query, limit=10)
-                        summaries = [r.value.get("summary", "") for r in results if r.value.get("summary")]
-                        if summaries:
-                            long_term_context = "\n".join(summaries)
-                            logging.info(f"Injected {len(summaries)} long-term memories for {collection_name}")
-                        else:
-                            logging.info(f"No long-term memories found for {collection_name}")
+                from src.ai_component.modules.memory.long_term_store import long_term_store
+                collection_name = state.get("collection_name", "")
+                query = state["messages"][-1].content if state["messages"] else ""
+                if collection_name and query:
+                    summaries = await long_term_store.search(collection_name, query)
+                    if summaries:
+                        long_term_context = "\n".join(summaries)
+                        logging.info(f"Injected {len(summaries)} long-term memories for {collection_name}")
+                    else:
+                        logging.info(f"No long-term memories found for {collection_name}")
             except Exception as e:
                 # Long-term memory injection is best-effort; never block the main flow
                 logging.warning(f"Long-term memory injection skipped: {str(e)}")
@@ -148,12 +146,53 @@ class Nodes:
             return {
                 "current_activity": activity,
                 "long_term_context": long_term_context,
-                "messages": state["messages"]
             }
         except CustomException as e:
             logging.error(f"Error in context_ingestion_node: {e}")
             raise CustomException(e, sys) from e
 
+    @staticmethod
+    async def history_node(state: AICompanionState, config: RunnableConfig) -> dict:
+        """Build the prompt history from the rolling summary and the recent turns; no LLM call."""
+        try:
+            logging.info("Calling History Node")
+            thread_id = config.get("configurable", {}).get("thread_id")
+            try:
+                summary, cursor = await conversation_summaries.get(thread_id)
+            except Exception as e:
+                # Without the summary the window alone still answers the turn
+                logging.warning(f"Conversation summary unavailable: {str(e)}")
+                summary, cursor = conversation_summaries.cached(thread_id)
+            return {"history": prompt_history(state["messages"], summary, cursor)}
+        except CustomException as e:
+            logging.error(f"Error in history_node: {e}")
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    async def context_join_node(state: AICompanionState) -> dict:
+        """Barrier for the parallel route / user / context / history branches."""
+        if state.get("errors"):
+            logging.warning(f"Pre-answer branches reported errors: {state['errors']}")
+        return {}
+
+    @staticmethod
+    async def semantic_cache_node(state: AICompanionState, config: RunnableConfig) -> dict:
+        """Answer from the semantic cache when a near-identical question was answered recently."""
+        try:
+            query = state["messages"][-1].content if state["messages"] else ""
+            thread_id = config.get("configurable", {}).get("thread_id", "")
+            answer = await semantic_cache.lookup(
+                query, state.get("workflow", ""), state.get("location", ""), thread_id
+            )
+            if answer is None:
+                return {"cache_hit": False}
+            speculator.discard(state["messages"][-1].id)
+            return {"cache_hit": True, "messages": [AIMessage(content=answer)]}
+        except Exception as e:
+            # The cache is an optimisation; a failed lookup just runs the workflow
+            logging.warning(f"Semantic cache lookup skipped: {str(e)}")
+            return {"cache_hit": False}
+
     @staticmethod
     async def GeneralNode(state: AICompanionState) -> dict:
         try:
@@ -166,25 +205,9 @@ class Nodes:
                     f"Tool: {m.name}\nResult: {m.content}" 
                     for m in messages if isinstance(m, ToolMessage)
                 )
-                enhanced_template = f"""{Template.general_template}
-
-    Original Query: {{query}}
-
-    Tool Results:
-    {{tool_results}}
-
-    Based on the tool results above, provide a comprehensive and helpful response to the user's query.
-    Do NOT make any more tool calls. Use only the information from the tool results."""
-                
-                prompt = PromptTemplate(
-                    input_variables=["history", "current_activity", "query", "tool_results"],
-                    template=enhanced_template
-                )
-                
-                factory = LLMChainFactory(model_type=default_model)
-                chain = await factory.get_llm_chain_async(prompt)
+                chain = await chain_registry.get("general.answer")
                 
-                history_text = "\n".join(m.content for m in messages[:-len([m for m in messages if isinstance(m, ToolMessage)])])
+                history_text = state.get("history", "")
                 
                 response = await chain.ainvoke({
                     "history": history_text,
@@ -194,22 +217,13 @@ class Nodes:
                 })
                 
                 return {"messages": [AIMessage(content=response.content)]}
-            query = last_message.content
-            history_text = "\n".join(m.content for m in messages)
-            
-            prompt = PromptTemplate(
-                input_variables=["history", "current_activity", "query"],
-                template=Template.general_template
+            inputs = first_pass_inputs(
+                "GeneralNode", last_message.content, state.get("history", ""), state.get("current_activity", "")
             )
-            
-            factory = LLMChainFactory(model_type=default_model)
-            chain = await factory.get_llm_tool_chain(prompt, [Tools.rag_tool, Tools.call_tool])
-            
-            response = await chain.ainvoke({
-                "history": history_text,
-                "current_activity": state.get("current_activity", ""),
-                "query": query
-            })
+            response = await speculator.claim(last_message.id, "GeneralNode", inputs)
+            if response is None:
+                chain = await chain_registry.get("general.tools")
+                response = await chain.ainvoke(inputs)
             
             # Return the response (either with tool_calls or final answer)
             if hasattr(response, 'tool_calls') and response.tool_calls:
@@ -227,21 +241,18 @@ class Nodes:
             logging.info("Calling Disease Node")
             messages = state["messages"]
             last = messages[-1]
-            history_text = "\n".join(m.content for m in messages)
+            history_text = state.get("history", "")
             if isinstance(last, ToolMessage):
                 query = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
                 tool_results = "\n".join(f"Tool: {m.name}\nResult: {m.content}" for m in messages if isinstance(m, ToolMessage))
-                enhanced = f"{Template.disease_template}\nOriginal Query: {{query}}\nTool Results:\n{{tool_results}}"
-                prompt = PromptTemplate(input_variables=["query", "tool_results"], template=enhanced)
-                factory = LLMChainFactory(model_type=default_model)
-                chain = await factory.get_llm_chain_async(prompt)
+                chain = await chain_registry.get("disease.answer")
                 resp = await chain.ainvoke({"query": query, "tool_results": tool_results})
                 return {"messages": [AIMessage(content=resp.content)]}
-            query = last.content
-            prompt = PromptTemplate(input_variables=["history", "query"], template=Template.disease_template)
-            factory = LLMChainFactory(model_type=default_model)
-            chain = await factory.get_llm_tool_chain(prompt, [Tools.web_tool])
-            resp = await chain.ainvoke({"history": history_text, "query": query})
+            inputs = first_pass_inputs("DiseaseNode", last.content, history_text)
+            resp = await speculator.claim(last.id, "DiseaseNode", inputs)
+            if resp is None:
+                chain = await chain_registry.get("disease.tools")
+                resp = await chain.ainvoke(inputs)
             if hasattr(resp, 'tool_calls') and resp.tool_calls:
                 return {"messages": [resp]}
             return {"messages": [AIMessage(content=resp.content)]}
@@ -258,31 +269,18 @@ class Nodes:
             if isinstance(last, ToolMessage):
                 query = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
                 tool_results = "\n".join(m.content for m in messages if isinstance(m, ToolMessage))
-                enhanced_template = f"""{Template.weather_template}
-Original Query: {{query}}
-Weather Tool Results:
-{{tool_results}}
-Based on the weather data above, provide a comprehensive weather report."""
-                prompt = PromptTemplate(
-                    input_variables=["date", "query", "tool_results"], 
-                    template=enhanced_template
-                )
-                chain = await LLMChainFactory(model_type=default_model).get_llm_chain_async(prompt)
+                chain = await chain_registry.get("weather.answer")
                 resp = await chain.ainvoke({
                     "date": datetime.now().strftime("%Y-%m-%d"),
                     "query": query,
                     "tool_results": tool_results
                 })
                 return {"messages": [AIMessage(content=resp.content)]}
-            query = last.content
-            prompt = PromptTemplate(input_variables=["date", "query"], template=Template.weather_template)
-            chain = await LLMChainFactory(model_type=default_model).get_llm_tool_chain(
-                prompt, [Tools.weather_forecast_tool, Tools.weather_report_tool]
-            )
-            resp = await chain.ainvoke({
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "query": query
-            })
+            inputs = first_pass_inputs("WeatherNode", last.content)
+            resp = await speculator.claim(last.id, "WeatherNode", inputs)
+            if resp is None:
+                chain = await chain_registry.get("weather.tools")
+                resp = await chain.ainvoke(inputs)
             if hasattr(resp, 'tool_calls') and resp.tool_calls:
                 return {"messages": [resp]}
             return {"messages": [AIMessage(content=resp.content)]}
@@ -299,31 +297,18 @@ Based on the weather data above, provide a comprehensive weather report."""
             if isinstance(last, ToolMessage):
                 query = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
                 tool_results = "\n".join(m.content for m in messages if isinstance(m, ToolMessage))
-                enhanced_template = f"""{Template.mandi_template}
-Original Query: {{query}}
-Tool Results:
-{{tool_results}}
-Based on the mandi data above, provide a comprehensive market analysis."""
-                prompt = PromptTemplate(
-                    input_variables=["date", "query", "tool_results"], 
-                    template=enhanced_template
-                )
-                chain = await LLMChainFactory(model_type=default_model).get_llm_chain_async(prompt)
+                chain = await chain_registry.get("mandi.answer")
                 resp = await chain.ainvoke({
                     "date": datetime.now().strftime("%Y-%m-%d"),
                     "query": query,
                     "tool_results": tool_results
                 })
                 return {"messages": [AIMessage(content=resp.content)]}
-            query = last.content
-            prompt = PromptTemplate(input_variables=["date", "query"], template=Template.mandi_template)
-            chain = await LLMChainFactory(model_type=default_model).get_llm_tool_chain(
-                prompt, [Tools.mandi_report_tool]
-            )
-            resp = await chain.ainvoke({
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "query": query
-            })
+            inputs = first_pass_inputs("MandiNode", last.content)
+            resp = await speculator.claim(last.id, "MandiNode", inputs)
+            if resp is None:
+                chain = await chain_registry.get("mandi.tools")
+                resp = await chain.ainvoke(inputs)
             if hasattr(resp, 'tool_calls') and resp.tool_calls:
                 return {"messages": [resp]}
             return {"messages": [AIMessage(content=resp.content)]}
@@ -343,29 +328,7 @@ Based on the mandi data above, provide a comprehensive market analysis."""
                     f"Tool: {m.name}\nResult: {m.content}" 
                     for m in messages if isinstance(m, ToolMessage)
                 )
-                enhanced_template = f"""You are a helpful AI Assistant specializing in government schemes and programs for farmers in India.
-
-    Current date: {{date}}
-    Original Query: {{query}}
-    Government Scheme Tool Results:
-    {{tool_results}}
-    Based on the government scheme data above, provide a comprehensive and detailed response about the relevant government schemes. Include:
-    1. Scheme names and details
-    2. Eligibility criteria
-    3. Application process
-    4. Benefits provided
-    5. Contact information if available
-
-    Format the response in a clear and organized manner that helps the farmer understand and access these schemes.
-    Do NOT make any more tool calls. Use only the information from the tool results."""
-                
-                prompt = PromptTemplate(
-                    input_variables=["date", "query", "tool_results"],
-                    template=enhanced_template
-                )
-                
-                factory = LLMChainFactory(model_type=default_model)
-                chain = await factory.get_llm_chain_async(prompt)
+                chain = await chain_registry.get("gov_scheme.answer")
                 
                 response = await chain.ainvoke({
                     "date": datetime.now().strftime("%Y-%m-%d"),
@@ -374,20 +337,11 @@ Based on the mandi data above, provide a comprehensive market analysis."""
                 })
                 
                 return {"messages": [AIMessage(content=response.content)]}
-            query = last_message.content
-            
-            prompt = PromptTemplate(
-                input_variables=["date", "query"], 
-                template=Template.gov_scheme_template
-            )
-            
-            factory = LLMChainFactory(model_type=default_model)
-            chain = await factory.get_llm_tool_chain(prompt, [Tools.gov_scheme_tool, Tools.web_tool])
-            
-            response = await chain.ainvoke({
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "query": query
-            })
+            inputs = first_pass_inputs("GovSchemeNode", last_message.content)
+            response = await speculator.claim(last_message.id, "GovSchemeNode", inputs)
+            if response is None:
+                chain = await chain_registry.get("gov_scheme.tools")
+                response = await chain.ainvoke(inputs)
             if hasattr(response, 'tool_calls') and response.tool_calls:
                 return {"messages": [response]}
             else:
@@ -412,7 +366,7 @@ Based on the mandi data above, provide a comprehensive market analysis."""
             raise CustomException(e, sys) from e
 
     @staticmethod
-    async def MemoryIngestionNode(state: AICompanionState) -> dict:
+    async def MemoryIngestionNode(state: AICompanionState, config: RunnableConfig) -> dict:
         try:
             logging.info("Memory Ingestion Node -----------")
             messages = state["messages"]
@@ -420,7 +374,13 @@ Based on the mandi data above, provide a comprehensive market analysis."""
             last_ai_message = next((m.content for m in reversed(messages) if isinstance(m, AIMessage)), None)
             if last_user_message and last_ai_message:
                 conversation = f"User: {last_user_message}\nAI: {last_ai_message}"
-                await memory_manager.store_in_memory(state["collection_name"], conversation)
+                thread_id = config.get("configurable", {}).get("thread_id")
+                if not state.get("cache_hit"):
+                    semantic_cache.commit(thread_id, last_user_message, last_ai_message)
+                # Summarising and indexing happen on the ingestion workers, not on the turn
+                await memory_ingestion_queue.submit(state["collection_name"], conversation, thread_id)
+                # The rolling summary is updated on a detached task; the next turn's history_node reads it
+                conversation_summaries.schedule(thread_id, messages)
             else:
                 logging.info("No valid query-response pair found to store")
             return {}
@@ -434,16 +394,17 @@ Based on the mandi data above, provide a comprehensive market analysis."""
             logging.info("Calling ImageNode")
             together_api_key = os.getenv('TOGETHER_API_KEY')
             if not together_api_key:
-                logging.warning("TOGETHER_API_KEY is not set — ImageNode returning empty image")
-                return {"image": b""}
+                logging.warning("TOGETHER_API_KEY is not set — ImageNode returning no image")
+                return {"image_ref": None}
             query = state["messages"][-1].content
-            prompt = PromptTemplate(input_variables=["text"], template=Template.image_template)
-            factory = LLMChainFactory(model_type=default_model)
-            chain = await factory.get_llm_chain_async(prompt)
+            chain = await chain_registry.get("image.prompt")
             img_prompt = (await chain.ainvoke({"text": query})).content
             loop = asyncio.get_event_loop()
-            img_bytes = await loop.run_in_executor(None, lambda: factory.get_image_model(img_prompt))
-            return {"image": img_bytes}
+            img_bytes = await loop.run_in_executor(None, lambda: chain_registry.factory.get_image_model(img_prompt))
+            if not img_bytes:
+                return {"image_ref": None}
+            # Only the reference goes into (checkpointed) state
+            return {"image_ref": await media_store.put(img_bytes, "image/png")}
         except CustomException as e:
             logging.error(f"Error in ImageNode: {e}")
             raise CustomException(e, sys) from e
@@ -452,12 +413,13 @@ Based on the mandi data above, provide a comprehensive market analysis."""
     async def VoiceNode(state: AICompanionState) -> dict:
         try:
             logging.info("Calling VoiceNode")
+            cartesia_client = get_cartesia_client()
             if not cartesia_client:
-                logging.warning("CARTESIA_API_KEY is not set — VoiceNode returning empty audio")
-                return {"voice": ""}
+                logging.warning("CARTESIA_API_KEY is not set — VoiceNode returning no audio")
+                return {"voice_ref": None}
             response_text = state["messages"][-1].content
             if not response_text:
-                return {"voice": ""}
+                return {"voice_ref": None}
             voice_id = "ef8390dc-0fc0-473b-bbc0-7277503793f7"
             audio_generator = cartesia_client.tts.bytes(
                 model_id="sonic",
@@ -478,10 +440,7 @@ Based on the mandi data above, provide a comprehensive market analysis."""
                 wav_file.setsampwidth(4)
                 wav_file.setframerate(16000)
                 wav_file.writeframes(audio_data)
-            wav_buffer.seek(0)
-            wav_bytes = wav_buffer.read()
-            audio_base64 = base64.b64encode(wav_bytes).decode('utf-8')
-            return {"voice": audio_base64}
+            return {"voice_ref": await media_store.put(wav_buffer.getvalue(), "audio/wav")}
         except CustomException as e:
             logging.error(f"Error in VoiceNode: {e}")
             raise CustomException(e, sys) from e
@@ -1,8 +1,18 @@
 from langgraph.graph import MessagesState
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Optional
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
+
+def merge_errors(existing: Optional[list[str]], update: Optional[list[str]]) -> list[str]:
+    """Reducer for errors reported by parallel branches.
+    Branch errors are concatenated; an explicit None (sent with each new turn) clears them.
+    """
+    if update is None:
+        return []
+    return (existing or []) + update
+
+
 class AICompanionState(TypedDict):
     """State class for the AI Companion workflow.
     Extends MessagesState to track conversation history and maintains the last message received.
@@ -10,8 +20,13 @@ class AICompanionState(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
     collection_name: str
     workflow: str
+    workflow_hint: Optional[str]   # explicit workflow requested by the client, if any
     output: str
     current_activity: str
     long_term_context: str   # injected per-user long-term memories from AsyncPostgresStore
-    image: bytes
-    voice: bytes
\ No newline at end of file
+    location: str                # coarse "state/district" of the user, partitions the answer cache
+    cache_hit: bool              # this turn was answered from the semantic cache
+    history: str                 # prompt history: rolling summary + recent turns within the token budget
+    image_ref: Optional[str]     # media store reference of this turn's generated image
+    voice_ref: Optional[str]     # media store reference of this turn's voice reply (WAV)
+    errors: Annotated[list[str], merge_errors]   # non-fatal errors from the parallel pre-answer branches
\ No newline at end of file
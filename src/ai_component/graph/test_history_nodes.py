@@ -0,0 +1,109 @@
+"""
+Unit tests for the history window (before the answer) and the rolling
+summary (updated on a detached task after it).
+
+A stub summary chain stands in for the LLM, an in-memory LangGraph store for
+Postgres, and the window is cut to two turns.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from langchain_core.messages import HumanMessage, AIMessage
+from langgraph.store.memory import InMemoryStore
+
+from src.ai_component.graph.nodes import Nodes
+from src.ai_component.modules.memory import conversation_window
+from src.ai_component.modules.memory.conversation_summary import ConversationSummaries, NAMESPACE_ROOT, KEY
+
+
+def _thread(turns: int):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i}", id=f"h{i}"))
+        messages.append(AIMessage(content=f"answer {i}", id=f"a{i}"))
+    return messages
+
+
+class StubChain:
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def ainvoke(self, inputs):
+        self.calls.append(inputs)
+        await self.release.wait()
+        return AIMessage(content=f"summary of: {inputs['conversation']}")
+
+
+class TestHistoryNodes(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.chain = StubChain()
+        registry = mock.patch("src.ai_component.modules.memory.conversation_summary.chain_registry")
+        self.registry = registry.start()
+        self.registry.get = mock.AsyncMock(return_value=self.chain)
+        self.addCleanup(registry.stop)
+        window = mock.patch.object(conversation_window.select_window, "__defaults__", (2, 10_000))
+        window.start()
+        self.addCleanup(window.stop)
+        self.store = InMemoryStore()
+
+        async def get_store():
+            return self.store
+
+        self.summaries = ConversationSummaries(get_store=get_store)
+        patcher = mock.patch("src.ai_component.graph.nodes.conversation_summaries", self.summaries)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = {"configurable": {"thread_id": "t1"}}
+
+    async def test_history_node_never_calls_the_llm(self):
+        await self.store.aput((NAMESPACE_ROOT, "t1"), KEY, {"summary": "summary of turn 0", "cursor": "a0"})
+        state = {"messages": _thread(3) + [HumanMessage(content="question 3", id="h3")]}
+        result = await Nodes.history_node(state, self.config)
+        self.assertEqual(self.chain.calls, [])
+        # Turn 1 was pushed out by this message; it is kept until the summary catches up
+        self.assertIn("summary of turn 0", result["history"])
+        self.assertIn("User: question 1", result["history"])
+        self.assertNotIn("question 0", result["history"])
+        self.assertEqual(self.summaries.cached("t1"), ("summary of turn 0", "a0"))
+
+    async def test_summary_is_updated_off_the_turn(self):
+        state = {"messages": _thread(3), "collection_name": "farmer1", "cache_hit": True}
+        self.chain.release.clear()
+        with mock.patch("src.ai_component.graph.nodes.memory_ingestion_queue") as queue:
+            queue.submit = mock.AsyncMock()
+            self.assertEqual(await Nodes.MemoryIngestionNode(state, self.config), {})
+        # The node returned while the summary call is still waiting
+        self.assertEqual(self.summaries.get_stats()["in_flight"], 1)
+        self.chain.release.set()
+        await self.summaries.aclose()
+        self.assertEqual(await self.summaries.get("t1"), ("summary of: User: question 0\nAI: answer 0", "a0"))
+        # Nothing new left the window: no LLM call
+        await self.summaries.schedule("t1", _thread(3))
+        self.assertEqual(len(self.chain.calls), 1)
+
+    async def test_one_update_per_thread_at_a_time(self):
+        self.chain.release.clear()
+        task = self.summaries.schedule("t1", _thread(3))
+        self.assertIsNone(self.summaries.schedule("t1", _thread(4)))
+        self.chain.release.set()
+        await task
+        # The skipped turn's evictions are folded in by the next update
+        await self.summaries.schedule("t1", _thread(4))
+        self.assertEqual((await self.summaries.get("t1"))[1], "a1")
+        self.assertEqual(self.summaries.get_stats()["skipped"], 1)
+
+    async def test_failed_summary_keeps_the_previous_one(self):
+        self.registry.get = mock.AsyncMock(side_effect=ConnectionError)
+        await self.summaries.schedule("t1", _thread(3))
+        self.assertEqual(await self.summaries.get("t1"), ("", None))
+        self.assertEqual(self.summaries.get_stats()["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,11 @@
 import sys
 import asyncio
 from pydantic import BaseModel , Field
-from typing import Optional, Literal , Union
+from typing import Optional, Literal , Union, List
 from src.ai_component.llm import LLMChainFactory
 from src.ai_component.core.prompts import Template
 from src.ai_component.config import default_model
+from src.ai_component.tools.all_tools import Tools
 from langchain.prompts import PromptTemplate, ChatPromptTemplate
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
@@ -14,6 +15,20 @@ class Router(BaseModel):
         output: Literal["TextNode", "ImageNode", "VoiceNode"] = Field(..., description="Give in which format user want answer")
 
 
+class MemoryAnalysis1(BaseModel):
+    is_important: Literal['Yes', 'No'] = Field(..., description="Is these conversation is important to store or not")
+
+class MemoryAnalysis2(BaseModel):
+    summary: str = Field(..., description="The short summary of the conversation between user and LLM")
+
+class TurnMemory(BaseModel):
+    turn: int = Field(..., description="Number of the turn being analysed, as given in the input")
+    is_important: Literal['Yes', 'No'] = Field(..., description="Is this turn important to store or not")
+    summary: str = Field("", description="Short summary of the turn; empty when it is not important")
+
+class MemoryBatchAnalysis(BaseModel):
+    turns: List[TurnMemory] = Field(..., description="One entry per conversation turn")
+
 
 async def async_router_chain():
     try:
@@ -25,19 +40,170 @@ async def async_router_chain():
 
         factory = LLMChainFactory(model_type=default_model)
         chain = await factory.get_structured_llm_chain_async(prompt, Router)
-        
+
         return chain
     except CustomException as e:
         logging.error(f"Error in Engineering Node : {str(e)}")
         raise CustomException(e, sys) from e
 
 
+# ---------------------------------------------------------------------------
+# Post-tool answer templates — the node template plus the tool results
+# ---------------------------------------------------------------------------
+
+general_answer_template = f"""{Template.general_template}
+
+    Original Query: {{query}}
+
+    Tool Results:
+    {{tool_results}}
+
+    Based on the tool results above, provide a comprehensive and helpful response to the user's query.
+    Do NOT make any more tool calls. Use only the information from the tool results."""
+
+disease_answer_template = f"{Template.disease_template}\nOriginal Query: {{query}}\nTool Results:\n{{tool_results}}"
+
+weather_answer_template = f"""{Template.weather_template}
+Original Query: {{query}}
+Weather Tool Results:
+{{tool_results}}
+Based on the weather data above, provide a comprehensive weather report."""
+
+mandi_answer_template = f"""{Template.mandi_template}
+Original Query: {{query}}
+Tool Results:
+{{tool_results}}
+Based on the mandi data above, provide a comprehensive market analysis."""
+
+gov_scheme_answer_template = """You are a helpful AI Assistant specializing in government schemes and programs for farmers in India.
+
+    Current date: {date}
+    Original Query: {query}
+    Government Scheme Tool Results:
+    {tool_results}
+    Based on the government scheme data above, provide a comprehensive and detailed response about the relevant government schemes. Include:
+    1. Scheme names and details
+    2. Eligibility criteria
+    3. Application process
+    4. Benefits provided
+    5. Contact information if available
+
+    Format the response in a clear and organized manner that helps the farmer understand and access these schemes.
+    Do NOT make any more tool calls. Use only the information from the tool results."""
+
+
+class ChainRegistry:
+    """
+    Process-wide registry of prebuilt chains.
+
+    Every prompt | llm pipeline used by the graph nodes and the memory manager
+    is compiled once and reused on every turn, so the per-message path no
+    longer builds LLM clients, prompt templates, tool bindings or
+    structured-output wrappers.  Chains are compiled on their first `get`, so
+    a workflow's tools (and their heavy dependencies) are only imported when
+    that workflow is first used.
+    """
+
+    def __init__(self, model_type: str = default_model):
+        self.factory = LLMChainFactory(model_type=model_type)
+        self._chains: dict = {}
+
+    # ------------------------------------------------------------------ #
+    #  Chain builders                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _builders(self) -> dict:
+        factory = self.factory
+        return {
+            "router": lambda: factory.get_structured_llm_chain_async(
+                PromptTemplate(input_variables=["query"], template=Template.router_template),
+                Router,
+            ),
+            "general.tools": lambda: factory.get_llm_tool_chain(
+                PromptTemplate(input_variables=["history", "current_activity", "query"], template=Template.general_template),
+                [Tools.rag_tool, Tools.call_tool],
+            ),
+            "general.answer": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["history", "current_activity", "query", "tool_results"], template=general_answer_template)
+            ),
+            "disease.tools": lambda: factory.get_llm_tool_chain(
+                PromptTemplate(input_variables=["history", "query"], template=Template.disease_template),
+                [Tools.web_tool],
+            ),
+            "disease.answer": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["query", "tool_results"], template=disease_answer_template)
+            ),
+            "weather.tools": lambda: factory.get_llm_tool_chain(
+                PromptTemplate(input_variables=["date", "query"], template=Template.weather_template),
+                [Tools.weather_forecast_tool, Tools.weather_report_tool],
+            ),
+            "weather.answer": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["date", "query", "tool_results"], template=weather_answer_template)
+            ),
+            "mandi.tools": lambda: factory.get_llm_tool_chain(
+                PromptTemplate(input_variables=["date", "query"], template=Template.mandi_template),
+                [Tools.mandi_report_tool],
+            ),
+            "mandi.answer": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["date", "query", "tool_results"], template=mandi_answer_template)
+            ),
+            "gov_scheme.tools": lambda: factory.get_llm_tool_chain(
+                PromptTemplate(input_variables=["date", "query"], template=Template.gov_scheme_template),
+                [Tools.gov_scheme_tool, Tools.web_tool],
+            ),
+            "gov_scheme.answer": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["date", "query", "tool_results"], template=gov_scheme_answer_template)
+            ),
+            "image.prompt": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["text"], template=Template.image_template)
+            ),
+            "memory.importance": lambda: factory.get_structured_llm_chain_async(
+                PromptTemplate(input_variables=["conversation"], template=Template.memory_template1),
+                MemoryAnalysis1,
+            ),
+            "memory.summary": lambda: factory.get_structured_llm_chain_async(
+                PromptTemplate(input_variables=["conversation"], template=Template.memory_template2),
+                MemoryAnalysis2,
+            ),
+            "memory.batch": lambda: factory.get_structured_llm_chain_async(
+                PromptTemplate(input_variables=["conversations"], template=Template.memory_batch_template),
+                MemoryBatchAnalysis,
+            ),
+            "history.summary": lambda: factory.get_llm_chain_async(
+                PromptTemplate(input_variables=["summary", "conversation"], template=Template.history_summary_template)
+            ),
+        }
+
+    async def build(self, names: Optional[List[str]] = None) -> None:
+        """Compile the named chains (default: all of them) ahead of use. Safe to call repeatedly."""
+        try:
+            builders = self._builders()
+            for name in names if names is not None else builders:
+                if name not in self._chains:
+                    self._chains[name] = await builders[name]()
+            logging.info(f"Chain registry ready with {len(self._chains)} chains")
+        except CustomException as e:
+            logging.error(f"Error in building chain registry : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def get(self, name: str):
+        """Return a prebuilt chain, compiling it on first use."""
+        chain = self._chains.get(name)
+        if chain is None:
+            await self.build([name])
+            chain = self._chains[name]
+        return chain
+
+
+chain_registry = ChainRegistry()
+
+
 if __name__ == "__main__":
-    
+
     async def test_async():
         query = "What are the symptoms of leaf blight in rice?"
-        chain = await async_router_chain()
+        chain = await chain_registry.get("router")
         response = await chain.ainvoke({"query": query})
         print(f"result: {response.route_node}")
 
-    asyncio.run(test_async())
\ No newline at end of file
+    asyncio.run(test_async())
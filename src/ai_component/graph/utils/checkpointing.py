@@ -0,0 +1,204 @@
+"""
+Checkpoint durability modes for the compiled graph.
+
+`AsyncPostgresSaver` is called after every superstep, and each call is a
+network round trip to Neon; a tool-using turn makes about ten of them.
+`checkpoint_durability` selects how much of that the turn pays for:
+
+  * "step"          — LangGraph's default, a checkpoint per superstep
+  * "exit"          — `checkpoint_during=False`: the turn runs from memory and
+    writes one checkpoint when it finishes
+  * "write_behind"  — "exit" plus `WriteBehindSaver`, which returns at once and
+    writes from a background task every `checkpoint_flush_interval` seconds
+
+Write-behind never serves stale state: reading, listing or deleting a thread
+first flushes that thread's buffered writes, so the next turn of a
+conversation always sees the previous one.  What a crash can lose is bounded
+by the flush interval.  "step" stays the default; the other two trade crash
+durability for latency and are opt-in via CHECKPOINT_DURABILITY.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+from src.ai_component.config import checkpoint_durability, checkpoint_flush_interval, checkpoint_max_pending
+from src.ai_component.logger import logging
+
+DURABILITY_MODES = ("step", "exit", "write_behind")
+
+PendingWrite = Callable[[], Awaitable[Any]]
+
+
+def checkpoint_during(mode: str = checkpoint_durability) -> bool:
+    """Value for LangGraph's `checkpoint_during` run option under `mode`."""
+    if mode not in DURABILITY_MODES:
+        raise ValueError(f"Unknown checkpoint durability '{mode}' (expected one of {', '.join(DURABILITY_MODES)})")
+    return mode == "step"
+
+
+class WriteBehindSaver(BaseCheckpointSaver):
+    """
+    Buffers checkpoint writes per thread and flushes them in the background.
+
+    Writes for one thread are applied in order by at most one drain at a
+    time; threads drain concurrently.  Reads go to the wrapped saver after
+    the thread's buffer is flushed.
+    """
+
+    def __init__(
+        self,
+        saver: BaseCheckpointSaver,
+        flush_interval: float = checkpoint_flush_interval,
+        max_pending: int = checkpoint_max_pending,
+    ):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[str, List[PendingWrite]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}     # thread -> drain in progress
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"buffered": 0, "flushed": 0, "inline_flushes": 0, "errors": 0}
+
+    # ------------------------------------------------------------------ #
+    #  Buffering                                                          #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def pending(self) -> int:
+        return sum(len(writes) for writes in self._pending.values())
+
+    async def _buffer(self, thread_id: str, write: PendingWrite) -> None:
+        self._pending.setdefault(thread_id, []).append(write)
+        self.stats["buffered"] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_periodically())
+        if self.pending >= self.max_pending:
+            # Back-pressure: the producer pays for the flush instead of growing the buffer
+            self.stats["inline_flushes"] += 1
+            await self.flush()
+
+    async def _drain(self, thread_id: str) -> None:
+        writes = self._pending.pop(thread_id, [])
+        for i, write in enumerate(writes):
+            try:
+                await write()
+                self.stats["flushed"] += 1
+            except Exception:
+                self.stats["errors"] += 1
+                # Keep the failed write and everything after it for the next flush
+                self._pending[thread_id] = writes[i:] + self._pending.get(thread_id, [])
+                raise
+
+    async def flush_thread(self, thread_id: str) -> None:
+        """Write everything buffered for `thread_id`, in order."""
+        while True:
+            inflight = self._inflight.get(thread_id)
+            if inflight is not None:
+                # Another caller is draining this thread; wait, then check for newer writes
+                await asyncio.wait([inflight])
+                continue
+            if thread_id not in self._pending:
+                return
+            task = asyncio.ensure_future(self._drain(thread_id))
+            self._inflight[thread_id] = task
+            try:
+                await task
+            finally:
+                if self._inflight.get(thread_id) is task:
+                    del self._inflight[thread_id]
+
+    async def flush(self) -> None:
+        """Write everything buffered for every thread."""
+        results = await asyncio.gather(
+            *(self.flush_thread(thread_id) for thread_id in list(self._pending)),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+
+    async def _flush_periodically(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.warning(f"Write-behind checkpoint flush failed, retrying: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Flush on shutdown, before the wrapped saver's connection closes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    # ------------------------------------------------------------------ #
+    #  BaseCheckpointSaver interface                                      #
+    # ------------------------------------------------------------------ #
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        await self._buffer(
+            configurable["thread_id"],
+            lambda: self.saver.aput(config, checkpoint, metadata, new_versions),
+        )
+        return {
+            "configurable": {
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        writes = list(writes)
+        await self._buffer(
+            config["configurable"]["thread_id"],
+            lambda: self.saver.aput_writes(config, writes, task_id, task_path),
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self.flush_thread(config["configurable"]["thread_id"])
+        return await self.saver.aget_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config is not None:
+            await self.flush_thread(config["configurable"]["thread_id"])
+        else:
+            await self.flush()
+        async for item in self.saver.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        inflight = self._inflight.get(thread_id)
+        if inflight is not None:
+            await asyncio.wait([inflight])
+        self._pending.pop(thread_id, None)
+        await self.saver.adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.saver.get_next_version(current, channel)
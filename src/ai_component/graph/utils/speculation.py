@@ -0,0 +1,175 @@
+"""
+Speculative answer generation while the LLM router is in flight.
+
+When the local intent classifier is unsure, `route_node` has to wait for a
+full router LLM round trip before any workflow node can start.  With
+`speculation_enabled` the first answer pass of the most likely workflow (the
+thread's previous route, else GeneralNode) is started at the same time:
+
+  * router agrees     -> the workflow node claims the finished (or still
+                         running) result instead of calling the model again
+  * router disagrees  -> the speculative call is cancelled immediately
+  * cache hit / error -> unclaimed work is cancelled or expires after
+                         `speculation_ttl` seconds
+
+Speculative calls run in an empty context, so their tokens never reach the
+streaming callbacks; a claimed result is forwarded as one chunk.  Results are
+keyed by the id of the turn's HumanMessage and handed over only if the node
+would have sent exactly the same prompt variables (the history is built with
+the same `prompt_history` as history_node); otherwise they count as stale.
+"""
+
+import time
+import asyncio
+import contextvars
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from src.ai_component.config import speculation_enabled, speculation_ttl
+from src.ai_component.graph.utils.chains import chain_registry
+from src.ai_component.modules.memory.conversation_window import prompt_history, estimate_tokens
+from src.ai_component.modules.schedule.context_generation import ScheduleContextGenerator
+from src.ai_component.logger import logging
+
+# Workflow -> chain used for its first (tool-selection / direct answer) pass
+FIRST_PASS_CHAINS = {
+    "GeneralNode":   "general.tools",
+    "DiseaseNode":   "disease.tools",
+    "WeatherNode":   "weather.tools",
+    "MandiNode":     "mandi.tools",
+    "GovSchemeNode": "gov_scheme.tools",
+}
+
+
+def first_pass_inputs(workflow: str, query: str, history: str = "", current_activity: str = "") -> Dict[str, Any]:
+    """Prompt variables of a workflow's first pass — shared by the nodes and the speculator."""
+    if workflow == "GeneralNode":
+        return {"history": history, "current_activity": current_activity, "query": query}
+    if workflow == "DiseaseNode":
+        return {"history": history, "query": query}
+    return {"date": datetime.now().strftime("%Y-%m-%d"), "query": query}
+
+
+@dataclass
+class _Speculation:
+    workflow: str
+    inputs: Dict[str, Any]
+    task: asyncio.Task
+    prompt_tokens: int
+    started_at: float
+
+
+class Speculator:
+    """Runs, hands over or cancels speculative first passes."""
+
+    def __init__(self, enabled: bool = speculation_enabled, ttl: float = speculation_ttl):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._running: Dict[str, _Speculation] = {}
+        self.stats: Dict[str, int] = {
+            "started": 0, "hits": 0, "misses": 0, "stale": 0, "discarded": 0, "expired": 0, "wasted_tokens": 0,
+        }
+
+    def predict(self, state: dict) -> str:
+        """Most likely workflow: the thread's previous route, else GeneralNode."""
+        previous = state.get("workflow")
+        return previous if previous in FIRST_PASS_CHAINS else "GeneralNode"
+
+    def start(self, key: Optional[str], state: dict, summary: Tuple[str, Optional[str]] = ("", None)) -> Optional[str]:
+        """
+        Kick off the predicted workflow's first pass, with the thread's rolling
+        `summary` and cursor as last seen. Returns the workflow, if started.
+        """
+        if not self.enabled or not key or key in self._running:
+            return None
+        self._expire()
+
+        workflow = self.predict(state)
+        inputs = first_pass_inputs(
+            workflow,
+            query=state["messages"][-1].content,
+            history=prompt_history(state["messages"], *summary),
+            current_activity=ScheduleContextGenerator.get_current_activity() or "No scheduled activity.",
+        )
+        # A fresh context keeps the speculative call out of the graph's
+        # callbacks (tracing, token streaming) until it is claimed.
+        task = asyncio.create_task(self._run(workflow, inputs), context=contextvars.Context())
+        self._running[key] = _Speculation(
+            workflow=workflow,
+            inputs=inputs,
+            task=task,
+            prompt_tokens=estimate_tokens(" ".join(str(v) for v in inputs.values())),
+            started_at=time.monotonic(),
+        )
+        self.stats["started"] += 1
+        logging.info(f"Speculatively started {workflow} while routing")
+        return workflow
+
+    async def _run(self, workflow: str, inputs: Dict[str, Any]):
+        chain = await chain_registry.get(FIRST_PASS_CHAINS[workflow])
+        return await chain.ainvoke(inputs)
+
+    def resolve(self, key: Optional[str], workflow: str) -> None:
+        """Called with the router's decision; cancels a speculation it disagrees with."""
+        spec = self._running.get(key) if key else None
+        if spec is None or spec.workflow == workflow:
+            return
+        self.stats["misses"] += 1
+        logging.info(f"Router chose {workflow}; cancelling speculative {spec.workflow}")
+        self._cancel(key)
+
+    async def claim(self, key: Optional[str], workflow: str, inputs: Dict[str, Any]):
+        """
+        Result of a speculation of `workflow` with exactly these prompt `inputs`,
+        or None if the node must run the model itself.
+        """
+        spec = self._running.get(key) if key else None
+        if spec is None or spec.workflow != workflow:
+            return None
+        if spec.inputs != inputs:
+            # Started from other prompt variables than the node ended up with
+            self.stats["stale"] += 1
+            logging.info(f"Speculative {workflow} was built from a different prompt; running it normally")
+            self._cancel(key)
+            return None
+        del self._running[key]
+        try:
+            result = await spec.task
+        except Exception as e:
+            logging.warning(f"Speculative {workflow} failed, running it normally: {str(e)}")
+            return None
+        self.stats["hits"] += 1
+        return result
+
+    def discard(self, key: Optional[str]) -> None:
+        """Cancel a speculation that will never be claimed (e.g. a cache hit)."""
+        if key and key in self._running:
+            self.stats["discarded"] += 1
+            self._cancel(key)
+
+    def _cancel(self, key: str) -> None:
+        spec = self._running.pop(key)
+        wasted = spec.prompt_tokens
+        if spec.task.done() and not spec.task.cancelled() and spec.task.exception() is None:
+            usage = getattr(spec.task.result(), "usage_metadata", None) or {}
+            wasted = usage.get("total_tokens", wasted)
+        else:
+            spec.task.cancel()
+        self.stats["wasted_tokens"] += wasted
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, s in self._running.items() if now - s.started_at > self.ttl]:
+            self.stats["expired"] += 1
+            self._cancel(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        decided = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / decided, 3) if decided else 0.0
+        stats["in_flight"] = len(self._running)
+        return stats
+
+
+speculator = Speculator()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the checkpoint durability modes and the write-behind saver.
+
+A small two-node graph over LangGraph's in-memory saver stands in for the
+chat graph and Postgres.
+"""
+
+import unittest
+from typing import TypedDict
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from src.ai_component.graph.utils.checkpointing import WriteBehindSaver, checkpoint_during
+
+
+class CountState(TypedDict):
+    count: int
+
+
+def _graph(saver):
+    builder = StateGraph(CountState)
+    builder.add_node("first", lambda state: {"count": state["count"] + 1})
+    builder.add_node("second", lambda state: {"count": state["count"] + 1})
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    builder.add_edge("second", END)
+    return builder.compile(checkpointer=saver)
+
+
+class TestCheckpointDuring(unittest.TestCase):
+
+    def test_modes(self):
+        self.assertTrue(checkpoint_during("step"))
+        self.assertFalse(checkpoint_during("exit"))
+        self.assertFalse(checkpoint_during("write_behind"))
+        with self.assertRaises(ValueError):
+            checkpoint_during("sometimes")
+
+
+class TestWriteBehindSaver(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.inner = InMemorySaver()
+        self.saver = WriteBehindSaver(self.inner, flush_interval=60, max_pending=100)
+        self.graph = _graph(self.saver)
+        self.config = {"configurable": {"thread_id": "t1"}}
+
+    async def asyncTearDown(self):
+        await self.saver.aclose()
+
+    async def test_exit_mode_buffers_one_checkpoint_per_turn(self):
+        await self.graph.ainvoke({"count": 0}, self.config, checkpoint_during=False)
+        self.assertEqual(self.saver.pending, 1)
+        self.assertIsNone(await self.inner.aget_tuple(self.config))
+
+    async def test_next_turn_reads_its_own_buffered_state(self):
+        await self.graph.ainvoke({"count": 0}, self.config, checkpoint_during=False)
+        result = await self.graph.ainvoke({"count": 10}, self.config, checkpoint_during=False)
+        self.assertEqual(result["count"], 12)
+        state = await self.graph.aget_state(self.config)
+        self.assertEqual(state.values["count"], 12)
+        self.assertEqual(self.saver.pending, 0)
+
+    async def test_flush_writes_in_order(self):
+        await self.graph.ainvoke({"count": 0}, self.config, checkpoint_during=True)
+        await self.saver.flush()
+        history = [c async for c in self.inner.alist(self.config)]
+        # Newest first; each checkpoint's parent is the one written before it
+        for newer, older in zip(history, history[1:]):
+            self.assertEqual(newer.parent_config["configurable"]["checkpoint_id"],
+                             older.config["configurable"]["checkpoint_id"])
+        self.assertEqual(history[0].checkpoint["channel_values"]["count"], 2)
+
+    async def test_delete_drops_buffered_writes(self):
+        await self.graph.ainvoke({"count": 0}, self.config, checkpoint_during=False)
+        await self.saver.adelete_thread("t1")
+        self.assertEqual(self.saver.pending, 0)
+        self.assertIsNone(await self.saver.aget_tuple(self.config))
+
+    async def test_failed_flush_keeps_writes(self):
+        await self.graph.ainvoke({"count": 0}, self.config, checkpoint_during=False)
+        original = self.inner.aput
+
+        async def failing_aput(*args, **kwargs):
+            raise ConnectionError("database unavailable")
+
+        self.inner.aput = failing_aput
+        with self.assertRaises(ConnectionError):
+            await self.saver.flush()
+        self.assertEqual(self.saver.pending, 1)
+
+        self.inner.aput = original
+        await self.saver.flush()
+        self.assertEqual(self.saver.pending, 0)
+        self.assertIsNotNone(await self.inner.aget_tuple(self.config))
+
+
+if __name__ == "__main__":
+    unittest.main()
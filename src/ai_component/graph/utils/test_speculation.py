@@ -0,0 +1,89 @@
+"""
+Unit tests for speculative first passes started while the router decides.
+
+A stub chain that records its inputs stands in for the workflow LLMs.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from langchain_core.messages import HumanMessage, AIMessage
+
+from src.ai_component.graph.utils.speculation import Speculator, first_pass_inputs
+from src.ai_component.modules.memory.conversation_window import prompt_history
+
+
+class StubChain:
+
+    def __init__(self):
+        self.inputs = []
+
+    async def ainvoke(self, inputs):
+        self.inputs.append(inputs)
+        await asyncio.sleep(0.01)
+        return AIMessage(content=f"answer to {inputs['query']}")
+
+
+def _state(**extra):
+    messages = [
+        HumanMessage(content="aphids on my mustard", id="h0"),
+        AIMessage(content="spray neem oil", id="a0"),
+        HumanMessage(content="how often should I spray", id="h1"),
+    ]
+    return {"messages": messages, "workflow": "DiseaseNode", **extra}
+
+
+class TestSpeculator(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.chain = StubChain()
+        registry = mock.patch("src.ai_component.graph.utils.speculation.chain_registry")
+        registry.start().get = mock.AsyncMock(return_value=self.chain)
+        self.addCleanup(registry.stop)
+        self.speculator = Speculator(enabled=True, ttl=60)
+
+    def _node_inputs(self, state, summary=""):
+        """What DiseaseNode sends: the history built by history_node."""
+        history = prompt_history(state["messages"], summary)
+        return first_pass_inputs("DiseaseNode", state["messages"][-1].content, history)
+
+    async def test_matching_turn_is_claimed(self):
+        state = _state()
+        self.assertEqual(self.speculator.start("h1", state), "DiseaseNode")
+        result = await self.speculator.claim("h1", "DiseaseNode", self._node_inputs(state))
+        self.assertEqual(result.content, "answer to how often should I spray")
+        self.assertEqual(len(self.chain.inputs), 1)
+        self.assertEqual(self.speculator.get_stats()["hits"], 1)
+
+    async def test_speculation_from_another_prompt_is_not_claimed(self):
+        self.speculator.start("h1", _state())
+        # The node's prompt ended up with a different history than the speculation saw
+        # (the rolling summary landed after the router read it)
+        changed = self._node_inputs(_state(), summary="Farmer grows mustard in Bihar")
+        self.assertIsNone(await self.speculator.claim("h1", "DiseaseNode", changed))
+        stats = self.speculator.get_stats()
+        self.assertEqual((stats["hits"], stats["stale"], stats["in_flight"]), (0, 1, 0))
+
+    async def test_router_disagreement_cancels(self):
+        self.speculator.start("h1", _state())
+        task = self.speculator._running["h1"].task
+        self.speculator.resolve("h1", "WeatherNode")
+        await asyncio.sleep(0)
+        self.assertTrue(task.cancelled())
+        self.assertIsNone(await self.speculator.claim("h1", "WeatherNode", first_pass_inputs("WeatherNode", "x")))
+        self.assertEqual(self.speculator.get_stats()["misses"], 1)
+
+    async def test_first_turn_predicts_general(self):
+        state = {"messages": [HumanMessage(content="namaste", id="h0")]}
+        self.assertEqual(self.speculator.start("h0", state), "GeneralNode")
+        self.speculator.discard("h0")
+        self.assertEqual(self.speculator.get_stats()["discarded"], 1)
+
+    async def test_disabled_speculator_does_nothing(self):
+        self.assertIsNone(Speculator(enabled=False).start("h1", _state()))
+        self.assertIsNone(await self.speculator.claim("h1", "DiseaseNode", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
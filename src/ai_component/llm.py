@@ -1,10 +1,7 @@
 import sys
 import requests
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.prompts import PromptTemplate
-from together import Together
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
@@ -28,6 +25,15 @@ os.environ['LANGSMITH_TRACING'] = os.getenv("LANGSMITH_TRACING")
 os.environ['LANGSMITH_PROJECT'] = os.getenv("LANGSMITH_PROJECT")
 os.environ["TOGETHER_API_KEY"]  = os.getenv("TOGETHER_API_KEY")
 
+# Process-wide client cache — one chat model per provider and one Together
+# client, shared by every factory so all chains reuse the same pooled HTTP
+# connections instead of paying client construction + TLS handshakes per turn.
+# Provider SDKs are imported on first use so a worker only loads the ones it
+# actually talks to.
+_llm_clients: dict = {}
+_image_client = None
+
+
 class LLMChainFactory:
     def __init__(self, model_type: str = "gemini"):
         """
@@ -40,13 +46,32 @@ class LLMChainFactory:
         self.groq_model_kwargs = groq_model_kwargs
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.groq_api_key = os.getenv("GROQ_API_KEY")
-        self.imgClient = Together()
+
+    @property
+    def imgClient(self) -> "Together":
+        """Shared Together client, created on first image request."""
+        global _image_client
+        if _image_client is None:
+            from together import Together
+            _image_client = Together()
+        return _image_client
 
     def _get_llm(self):
         """
-        Returns the appropriate LLM instance based on model type.
+        Returns the shared LLM instance for this model type, creating it once per process.
+        """
+        llm = _llm_clients.get(self.model_type)
+        if llm is None:
+            llm = self._create_llm()
+            _llm_clients[self.model_type] = llm
+        return llm
+
+    def _create_llm(self):
+        """
+        Builds a new LLM instance based on model type.
         """
         if self.model_type == "gemini":
+            from langchain_google_genai import ChatGoogleGenerativeAI
             return ChatGoogleGenerativeAI(
                 model=self.gemini_model_name,
                 google_api_key=self.google_api_key,
@@ -54,6 +79,7 @@ class LLMChainFactory:
                 **self.gemini_model_kwargs 
             )
         elif self.model_type == "groq":
+            from langchain_groq import ChatGroq
             return ChatGroq(
                 model=self.groq_model_name,
                 api_key=self.groq_api_key,
@@ -0,0 +1,301 @@
+"""
+Prometheus metrics for the chat path, exposed on `/metrics`.
+
+  * `kisan_node_duration_seconds`      — every LangGraph node (`timed_node`)
+  * `kisan_tool_duration_seconds`      — every tool run; `stage="call"` is what
+    the graph waited for (cache hits included), `stage="upstream"` the wrapped
+    tool a `CachedTool` actually called
+  * `kisan_llm_duration_seconds` and `kisan_llm_first_token_seconds`
+    — every chat model call, by provider, model and calling node
+  * `kisan_qdrant_duration_seconds`    — `LongTermMemory` operations (`observe_qdrant`)
+  * `kisan_db_query_duration_seconds`  — SQLAlchemy queries (`instrument_engine`)
+  * `kisan_db_pool_wait_seconds` and `kisan_db_pool_connections` — connection
+    checkout waits and utilisation of the Postgres pools (`src/database/pool.py`)
+  * `kisan_embedding_cache_lookups_total` — embedding cache outcomes
+    (`modules/cache/embedding_cache.py`)
+  * `kisan_intent_routes_total`       — routing decisions by route and source
+    (hint, local classifier, LLM fallback; `modules/intent/intent_classifier.py`)
+  * `kisan_graph_runs_in_flight`, `kisan_sse_streams`, `kisan_stream_ttft_seconds`
+    and `kisan_queue_depth` for load and back-pressure
+
+LLM and tool timings come from `MetricsCallbackHandler`, which is registered
+as a LangChain configure hook so every runnable invocation picks it up
+without threading callbacks through the graph config.
+
+The default registry is per process; the backend runs a single uvicorn
+worker, so one scrape sees everything.
+"""
+
+import re
+import time
+import asyncio
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from prometheus_client import Counter, Gauge, Histogram
+
+from src.ai_component.config import metrics_latency_buckets, metrics_query_buckets
+
+# ---------------------------------------------------------------------------
+# Metric families
+# ---------------------------------------------------------------------------
+
+NODE_DURATION = Histogram(
+    "kisan_node_duration_seconds", "LangGraph node run time",
+    ["node", "status"], buckets=metrics_latency_buckets,
+)
+TOOL_DURATION = Histogram(
+    "kisan_tool_duration_seconds", "Tool run time",
+    ["tool", "stage", "status"], buckets=metrics_latency_buckets,
+)
+LLM_DURATION = Histogram(
+    "kisan_llm_duration_seconds", "Chat model call time",
+    ["provider", "model", "node", "status"], buckets=metrics_latency_buckets,
+)
+LLM_FIRST_TOKEN = Histogram(
+    "kisan_llm_first_token_seconds", "Time to the first streamed token of a chat model call",
+    ["provider", "model", "node"], buckets=metrics_latency_buckets,
+)
+QDRANT_DURATION = Histogram(
+    "kisan_qdrant_duration_seconds", "Qdrant operation time",
+    ["operation", "status"], buckets=metrics_latency_buckets,
+)
+DB_QUERY_DURATION = Histogram(
+    "kisan_db_query_duration_seconds", "SQLAlchemy query time",
+    ["verb", "table", "status"], buckets=metrics_query_buckets,
+)
+DB_POOL_WAIT = Histogram(
+    "kisan_db_pool_wait_seconds", "Time spent waiting to check a connection out of a Postgres pool",
+    ["pool"], buckets=metrics_query_buckets,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "kisan_db_pool_connections", "Postgres pool connections by state (in_use, idle, waiting, max)",
+    ["pool", "state"],
+)
+STREAM_TTFT = Histogram(
+    "kisan_stream_ttft_seconds", "Time from request to the first answer token sent to the client",
+    ["workflow"], buckets=metrics_latency_buckets,
+)
+GRAPH_RUNS_IN_FLIGHT = Gauge(
+    "kisan_graph_runs_in_flight", "Graph runs currently executing", ["mode"],
+)
+SSE_STREAMS = Gauge(
+    "kisan_sse_streams", "Open server-sent-event answer streams",
+)
+QUEUE_DEPTH = Gauge(
+    "kisan_queue_depth", "Items waiting in background queues", ["queue"],
+)
+EMBEDDING_CACHE = Counter(
+    "kisan_embedding_cache_lookups", "Embedding cache lookups by outcome (hit, disk_hit, coalesced, miss)",
+    ["kind", "outcome"],
+)
+INTENT_ROUTES = Counter(
+    "kisan_intent_routes", "Routing decisions by route and source (hint, local, fallback)",
+    ["route", "source"],
+)
+
+
+def _status(exc: Optional[BaseException]) -> str:
+    if exc is None:
+        return "ok"
+    return "cancelled" if isinstance(exc, asyncio.CancelledError) else "error"
+
+
+# ---------------------------------------------------------------------------
+# Graph nodes and Qdrant operations
+# ---------------------------------------------------------------------------
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a graph node so each run lands in `kisan_node_duration_seconds`.
+
+    `functools.wraps` keeps the original signature visible to LangGraph, so
+    nodes that take `config` still receive it.
+    """
+    @functools.wraps(node)
+    async def run(*args, **kwargs):
+        start = time.perf_counter()
+        exc = None
+        try:
+            return await node(*args, **kwargs)
+        except BaseException as e:
+            exc = e
+            raise
+        finally:
+            NODE_DURATION.labels(name, _status(exc)).observe(time.perf_counter() - start)
+
+    return run
+
+
+def observe_qdrant(operation: str) -> Callable:
+    """Decorator timing a (sync or async) vector-store method as one Qdrant operation."""
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def run_async(*args, **kwargs):
+                start = time.perf_counter()
+                exc = None
+                try:
+                    return await fn(*args, **kwargs)
+                except BaseException as e:
+                    exc = e
+                    raise
+                finally:
+                    QDRANT_DURATION.labels(operation, _status(exc)).observe(time.perf_counter() - start)
+            return run_async
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            start = time.perf_counter()
+            exc = None
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                exc = e
+                raise
+            finally:
+                QDRANT_DURATION.labels(operation, _status(exc)).observe(time.perf_counter() - start)
+        return run
+
+    return decorate
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+
+_TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE)\s+"?(\w+)', re.IGNORECASE)
+
+
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """(verb, table) of a SQL statement, e.g. ("SELECT", "users")."""
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    match = _TABLE_RE.search(statement)
+    return verb, match.group(1).lower() if match else "-"
+
+
+def instrument_engine(engine) -> None:
+    """Time every query run through `engine` (sync or async) into `kisan_db_query_duration_seconds`."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("kisan_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("kisan_query_start")
+        if starts:
+            DB_QUERY_DURATION.labels(*statement_labels(statement), "ok").observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        conn = context.connection
+        starts = conn.info.get("kisan_query_start") if conn is not None else None
+        if starts:
+            labels = statement_labels(context.statement or "")
+            DB_QUERY_DURATION.labels(*labels, "error").observe(time.perf_counter() - starts.pop())
+
+
+# ---------------------------------------------------------------------------
+# LLM and tool callbacks
+# ---------------------------------------------------------------------------
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Times chat model and tool runs from LangChain callbacks.
+
+    Runs inline (never in the default executor) and ignores chain and
+    retriever events, so the per-event cost is a dict lookup.  Tool events
+    are gated by `ignore_agent` in LangChain, so that one stays off.
+    """
+
+    run_inline = True
+    ignore_chain = True
+    ignore_retriever = True
+
+    # Cancelled tool runs never report an end event; cap what they can leave behind
+    max_open_runs = 4096
+
+    def __init__(self):
+        self._llm_runs: Dict[UUID, Tuple[float, Tuple[str, str, str]]] = {}
+        self._first_token_seen: set = set()
+        self._tool_runs: Dict[UUID, Tuple[float, Tuple[str, str]]] = {}
+
+    def _track(self, runs: Dict[UUID, Any], run_id: UUID, value: Any) -> None:
+        if len(runs) >= self.max_open_runs:
+            runs.pop(next(iter(runs)))
+        runs[run_id] = value
+
+    # --- chat models ---------------------------------------------------
+
+    def _start_llm(self, run_id: UUID, metadata: Optional[Dict[str, Any]]) -> None:
+        metadata = metadata or {}
+        labels = (
+            str(metadata.get("ls_provider", "unknown")),
+            str(metadata.get("ls_model_name", "unknown")),
+            str(metadata.get("langgraph_node", "background")),
+        )
+        self._track(self._llm_runs, run_id, (time.perf_counter(), labels))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start_llm(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start_llm(run_id, metadata)
+
+    def on_llm_new_token(self, token, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id in self._first_token_seen:
+            return
+        run = self._llm_runs.get(run_id)
+        if run is not None:
+            self._first_token_seen.add(run_id)
+            LLM_FIRST_TOKEN.labels(*run[1]).observe(time.perf_counter() - run[0])
+
+    def _end_llm(self, run_id: UUID, status: str) -> None:
+        self._first_token_seen.discard(run_id)
+        run = self._llm_runs.pop(run_id, None)
+        if run is not None:
+            LLM_DURATION.labels(*run[1], status).observe(time.perf_counter() - run[0])
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_llm(run_id, "ok")
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_llm(run_id, "error")
+
+    # --- tools ---------------------------------------------------------
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                      **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        # A tool started inside another tool run is the upstream call of a CachedTool
+        stage = "upstream" if parent_run_id in self._tool_runs else "call"
+        self._track(self._tool_runs, run_id, (time.perf_counter(), (name, stage)))
+
+    def _end_tool(self, run_id: UUID, status: str) -> None:
+        run = self._tool_runs.pop(run_id, None)
+        if run is not None:
+            TOOL_DURATION.labels(*run[1], status).observe(time.perf_counter() - run[0])
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id, "error")
+
+
+metrics_handler = MetricsCallbackHandler()
+
+# Every LangChain callback manager built while this var is set adds the handler
+_metrics_handler_var: ContextVar[Optional[MetricsCallbackHandler]] = ContextVar(
+    "kisan_metrics_handler", default=metrics_handler
+)
+register_configure_hook(_metrics_handler_var, inheritable=True)
@@ -0,0 +1,247 @@
+"""
+Process-wide embedding cache in front of the embedding model.
+
+The same farmer text used to be embedded several times per turn — by the
+semantic answer cache, the long-term memory search, the scheme search and
+the people search — and again on every repeat of a common question.
+`CachedEmbeddings` wraps any LangChain `Embeddings` and embeds each distinct
+text once:
+
+  * keys       — sha256 of (model, kind, text); query and document
+    embeddings differ for retrieval models, so `kind` keeps them apart
+  * memory     — LRU over `embedding_cache_max_entries` float32 vectors
+  * disk       — optional SQLite file (`embedding_cache_path`) read on a
+    memory miss and written on every embed, so restarts start warm
+  * batching   — `embed_documents` sends only the uncached texts, in one call
+  * single-flight — concurrent async lookups of one text share one request,
+    run as its own task so a cancelled caller does not fail the others
+  * async      — SQLite reads and writes of the async methods run in a
+    worker thread, off the event loop
+
+Lookups are counted per outcome in `kisan_embedding_cache_lookups_total` and
+in `get_stats()` (on /api/health).
+"""
+
+import asyncio
+import hashlib
+import functools
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.ai_component.config import embedding_cache_max_entries, embedding_cache_path
+from src.ai_component.logger import logging
+from src.ai_component.metrics import EMBEDDING_CACHE
+
+QUERY, DOCUMENT = "query", "document"
+
+# Lookup outcome -> `stats` counter
+_OUTCOMES = {"hit": "hits", "disk_hit": "disk_hits", "coalesced": "coalesced", "miss": "misses"}
+
+
+def cache_key(model: str, kind: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{kind}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class _DiskStore:
+    """key -> float32 vector bytes in one SQLite table."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """`Embeddings` that serves every text it has embedded before from memory or disk."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        max_entries: int = embedding_cache_max_entries,
+        path: Optional[str] = embedding_cache_path,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.max_entries = max_entries
+        self._disk = _DiskStore(path) if path else None
+        if self._disk is not None:
+            logging.info(f"Embedding cache for {model} persisted to {path}")
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()   # LRU order
+        self._lock = threading.Lock()     # sync callers run in worker threads
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {
+            "lookups": 0, "hits": 0, "disk_hits": 0, "coalesced": 0, "misses": 0, "evictions": 0,
+        }
+        _caches[model] = self
+
+    # ------------------------------------------------------------------ #
+    #  Storage                                                            #
+    # ------------------------------------------------------------------ #
+
+    def _count(self, kind: str, outcome: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats["lookups"] += n
+            self.stats[_OUTCOMES[outcome]] += n
+        EMBEDDING_CACHE.labels(kind, outcome).inc(n)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _lookup(self, key: str, kind: str) -> Optional[np.ndarray]:
+        """Memory first, then disk; counts hits but not misses."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+        if vector is not None:
+            self._count(kind, "hit")
+            return vector
+        if self._disk is not None:
+            vector = self._disk.get(key)
+            if vector is not None:
+                self._remember(key, vector)
+                self._count(kind, "disk_hit")
+                return vector
+        return None
+
+    def _store(self, keys: List[str], vectors: List[List[float]]) -> List[np.ndarray]:
+        stored = [np.asarray(v, dtype=np.float32) for v in vectors]
+        for key, vector in zip(keys, stored):
+            self._remember(key, vector)
+        if self._disk is not None:
+            self._disk.put_many(dict(zip(keys, stored)))
+        return stored
+
+    async def _off_loop(self, fn, *args):
+        """Run `fn` in a worker thread when it may touch SQLite; memory-only caches stay inline."""
+        if self._disk is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _pending(self, texts: List[str], kind: str):
+        """Keys of `texts`, cached vectors found so far, and the distinct uncached keys -> text."""
+        keys = [cache_key(self.model, kind, t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        missing: "OrderedDict[str, str]" = OrderedDict()
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                self._count(kind, "hit")       # repeated within the batch
+                continue
+            vector = self._lookup(key, kind)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing[key] = text
+        return keys, found, missing
+
+    # ------------------------------------------------------------------ #
+    #  Embeddings interface                                               #
+    # ------------------------------------------------------------------ #
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._pending(texts, DOCUMENT)
+        if missing:
+            self._count(DOCUMENT, "miss", len(missing))
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            found.update(zip(missing, self._store(list(missing), vectors)))
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = cache_key(self.model, QUERY, text)
+        vector = self._lookup(key, QUERY)
+        if vector is None:
+            self._count(QUERY, "miss")
+            [vector] = self._store([key], [self.embeddings.embed_query(text)])
+        return vector.tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await self._off_loop(self._pending, texts, DOCUMENT)
+        if missing:
+            self._count(DOCUMENT, "miss", len(missing))
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            found.update(zip(missing, await self._off_loop(self._store, list(missing), vectors)))
+        return [found[key].tolist() for key in keys]
+
+    async def _fetch_query(self, key: str, text: str) -> np.ndarray:
+        vector = await self.embeddings.aembed_query(text)
+        [stored] = await self._off_loop(self._store, [key], [vector])
+        return stored
+
+    def _fetched(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()        # retrieved: callers re-raise it, even if all of them left
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = cache_key(self.model, QUERY, text)
+        vector = await self._off_loop(self._lookup, key, QUERY)
+        if vector is not None:
+            return vector.tolist()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count(QUERY, "coalesced")
+        else:
+            self._count(QUERY, "miss")
+            # Its own task: cancelling the caller that started it leaves it
+            # running for the callers coalesced onto it
+            task = asyncio.create_task(self._fetch_query(key, text))
+            task.add_done_callback(functools.partial(self._fetched, key))
+            self._inflight[key] = task
+        return (await asyncio.shield(task)).tolist()
+
+    # ------------------------------------------------------------------ #
+    #  Metrics                                                            #
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["disk_hits"] + stats["coalesced"]
+        stats["hit_rate"] = round(served / stats["lookups"], 3) if stats["lookups"] else 0.0
+        stats["disk"] = self._disk is not None
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_caches: Dict[str, CachedEmbeddings] = {}
+
+
+def embedding_cache_stats() -> Dict[str, Dict]:
+    """Lookup counters and hit rate per embedding model."""
+    return {model: cache.get_stats() for model, cache in _caches.items()}
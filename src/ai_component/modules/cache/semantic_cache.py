@@ -0,0 +1,288 @@
+"""
+Semantic answer cache for repeated farmer questions.
+
+Many farmers ask near-identical questions (PM-Kisan eligibility, wheat sowing
+time, a common pest) and each one used to run the full tool + answer
+pipeline.  After routing, the query embedding is compared with recent answers
+for the same workflow, place and crops; above `semantic_cache_threshold` the
+cached answer is returned immediately.
+
+  * partitions  — (workflow, place, crops).  The place is the one the query
+    names ("onion price in Nashik"), else the farmer's profile location; the
+    crops are those the query names.  Embeddings barely separate "onion price
+    in Nashik" from "onion price in Pune", so these never share an answer
+  * TTLs        — per workflow (`semantic_cache_ttls`); workflows without a
+    TTL (GeneralNode and DiseaseNode, which answer from the conversation
+    history) are never cached
+  * eviction    — global LRU over `semantic_cache_max_entries`
+  * index       — one in-process numpy matrix per partition, rebuilt lazily
+
+The query embedding computed on a miss is parked per thread and reused when
+the answer is committed at the end of the turn.
+"""
+
+import re
+import time
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.ai_component.config import (
+    semantic_cache_enabled,
+    semantic_cache_threshold,
+    semantic_cache_max_entries,
+    semantic_cache_min_words,
+    semantic_cache_ttls,
+)
+from src.ai_component.modules.intent.intent_classifier import IntentClassifier
+from src.ai_component.logger import logging
+
+Partition = Tuple[str, str, str]     # (workflow, place, crops)
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+# States and the larger districts / mandi towns farmers ask about by name
+PLACES = frozenset("""
+assam bihar chhattisgarh goa gujarat haryana karnataka kerala maharashtra manipur
+meghalaya mizoram nagaland odisha punjab rajasthan sikkim telangana tripura
+uttarakhand delhi jammu kashmir ladakh
+agra ahmedabad ahmednagar ajmer akola aligarh allahabad prayagraj amravati
+amritsar anand aurangabad bathinda belgaum bengaluru bangalore bhopal
+bhubaneswar bikaner chandigarh chennai coimbatore cuttack davangere dehradun
+dewas dharwad erode gorakhpur guntur guwahati gwalior hisar hubli hyderabad
+indore jabalpur jaipur jalandhar jalgaon jodhpur junagadh kanpur karnal kolhapur
+kolkata kota kurnool latur lucknow ludhiana madurai meerut moga mumbai muzaffarnagar
+mysore mysuru nagpur nanded nashik nizamabad patiala patna pune raipur rajkot
+ranchi ratlam rohtak sangli satara shimla sikar solapur surat thanjavur
+udaipur ujjain vadodara varanasi vidisha vijayawada warangal yavatmal
+""".split()) | {
+    "andhra pradesh", "arunachal pradesh", "himachal pradesh", "madhya pradesh",
+    "tamil nadu", "uttar pradesh", "west bengal",
+}
+CROPS = frozenset(IntentClassifier.COMMODITIES)
+# Unknown villages / towns: the word after "in", "at" or "near"
+_PLACE_AFTER = re.compile(r"\b(?:in|at|near|around)\s+([a-z]+)")
+_NOT_A_PLACE = frozenset("""
+a an the my our this that his her their your next coming today tomorrow week
+month year season time kharif rabi summer winter monsoon march april may june
+july august one two three four five india
+""".split())
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (query or "").lower())).strip()
+
+
+def query_entities(query: str) -> Tuple[List[str], List[str]]:
+    """(places, crops) named in the query, sorted; answers depend on both."""
+    text = normalize_query(query)
+    words = text.split()
+    terms = set(words) | {" ".join(pair) for pair in zip(words, words[1:])}
+    places = (terms & PLACES) | {
+        word for word in _PLACE_AFTER.findall(text)
+        if word not in _NOT_A_PLACE and word not in CROPS
+    }
+    # "in uttar pradesh": "uttar" is part of the state, not a place of its own
+    places = {p for p in places if not any(p != q and p in q.split() for q in places)}
+    # Singular forms: "onions" → "onion", "tomatoes" → "tomato"
+    crops = {
+        stem for word in words
+        for stem in (word, re.sub(r"s$", "", word), re.sub(r"es$", "", word)) if stem in CROPS
+    }
+    return sorted(places), sorted(crops)
+
+
+@dataclass
+class CacheEntry:
+    id: int
+    partition: Partition
+    query: str
+    answer: str
+    vector: np.ndarray
+    expires_at: float
+
+
+class _PartitionIndex:
+    """Entry ids plus a stacked, L2-normalised vector matrix for one partition."""
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.dirty = False
+
+    def add(self, entry_id: int) -> None:
+        self.ids.append(entry_id)
+        self.dirty = True
+
+    def remove(self, entry_id: int) -> None:
+        self.ids.remove(entry_id)
+        self.dirty = True
+
+
+class SemanticCache:
+    """In-process semantic response cache with per-workflow TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        embed: Optional[Embedder] = None,
+        threshold: float = semantic_cache_threshold,
+        max_entries: int = semantic_cache_max_entries,
+        min_words: int = semantic_cache_min_words,
+        ttls: Optional[Dict[str, float]] = None,
+        enabled: bool = semantic_cache_enabled,
+    ):
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.min_words = min_words
+        self.ttls = dict(semantic_cache_ttls if ttls is None else ttls)
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()   # LRU order
+        self._indexes: Dict[Partition, _PartitionIndex] = {}
+        self._exact: Dict[Tuple[Partition, str], int] = {}
+        self._pending: "OrderedDict[str, Tuple[Partition, str, np.ndarray]]" = OrderedDict()
+        self._ids = itertools.count()
+        self.stats: Dict[str, int] = {
+            "lookups": 0, "hits": 0, "misses": 0, "bypassed": 0,
+            "stores": 0, "evictions": 0, "expirations": 0,
+        }
+        self.workflow_stats: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Helpers                                                            #
+    # ------------------------------------------------------------------ #
+
+    async def _vector(self, query: str) -> np.ndarray:
+        if self._embed is None:
+            from src.ai_component.modules.memory.vector_store import memory
+            self._embed = memory.embeddings.aembed_query
+        vec = np.asarray(await self._embed(query), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def cacheable(self, query: str, workflow: str) -> bool:
+        """Only self-contained queries for workflows with a TTL are cached."""
+        if not self.enabled or not self.ttls.get(workflow):
+            return False
+        # Very short messages are usually follow-ups ("and for wheat?") whose
+        # meaning depends on the conversation.
+        return len(normalize_query(query).split()) >= self.min_words
+
+    def _count(self, workflow: str, outcome: str) -> None:
+        self.stats[outcome] += 1
+        per = self.workflow_stats.setdefault(workflow, {"hits": 0, "misses": 0})
+        if outcome in per:
+            per[outcome] += 1
+
+    def _drop(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        self._indexes[entry.partition].remove(entry_id)
+        self._exact.pop((entry.partition, normalize_query(entry.query)), None)
+
+    def _search(self, partition: Partition, vector: np.ndarray) -> Tuple[Optional[CacheEntry], float]:
+        index = self._indexes.get(partition)
+        if index is None or not index.ids:
+            return None, 0.0
+        if index.dirty or index.matrix is None:
+            index.matrix = np.stack([self._entries[i].vector for i in index.ids])
+            index.dirty = False
+        scores = index.matrix @ vector
+        best = int(np.argmax(scores))
+        return self._entries[index.ids[best]], float(scores[best])
+
+    def _fresh(self, entry: CacheEntry) -> bool:
+        if entry.expires_at > time.time():
+            return True
+        self._drop(entry.id)
+        self.stats["expirations"] += 1
+        return False
+
+    def _hit(self, entry: CacheEntry, workflow: str, score: float) -> str:
+        self._entries.move_to_end(entry.id)
+        self._count(workflow, "hits")
+        logging.info(f"Semantic cache hit for {workflow} (similarity {score:.3f})")
+        return entry.answer
+
+    # ------------------------------------------------------------------ #
+    #  Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def partition(self, query: str, workflow: str, location: str = "") -> Partition:
+        """The place and crops named in the query; the profile `location` if it names no place."""
+        places, crops = query_entities(query)
+        return workflow, ",".join(places) or (location or "").lower(), ",".join(crops)
+
+    async def lookup(self, query: str, workflow: str, location: str = "", thread_id: str = "") -> Optional[str]:
+        """Return a cached answer, or None and remember the query for `commit`."""
+        if not self.cacheable(query, workflow):
+            self.stats["bypassed"] += 1
+            return None
+
+        self.stats["lookups"] += 1
+        partition = self.partition(query, workflow, location)
+
+        exact_id = self._exact.get((partition, normalize_query(query)))
+        if exact_id is not None and self._fresh(self._entries[exact_id]):
+            return self._hit(self._entries[exact_id], workflow, 1.0)
+
+        vector = await self._vector(query)
+        entry, score = self._search(partition, vector)
+        if entry is not None and score >= self.threshold and self._fresh(entry):
+            return self._hit(entry, workflow, score)
+
+        self._count(workflow, "misses")
+        if thread_id:
+            self._pending[thread_id] = (partition, query, vector)
+            self._pending.move_to_end(thread_id)
+            while len(self._pending) > self.max_entries:
+                self._pending.popitem(last=False)
+        return None
+
+    def commit(self, thread_id: str, query: str, answer: str) -> bool:
+        """Store the answer for a query that missed earlier in this turn."""
+        pending = self._pending.pop(thread_id, None)
+        if pending is None or not answer:
+            return False
+        partition, pending_query, vector = pending
+        if pending_query != query:
+            return False
+
+        entry = CacheEntry(
+            id=next(self._ids),
+            partition=partition,
+            query=query,
+            answer=answer,
+            vector=vector,
+            expires_at=time.time() + self.ttls[partition[0]],
+        )
+        self._entries[entry.id] = entry
+        self._indexes.setdefault(partition, _PartitionIndex()).add(entry.id)
+        self._exact[(partition, normalize_query(query))] = entry.id
+        self.stats["stores"] += 1
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats["evictions"] += 1
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._indexes.clear()
+        self._exact.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["entries"] = len(self._entries)
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        stats["by_workflow"] = {w: dict(c) for w, c in self.workflow_stats.items()}
+        return stats
+
+
+semantic_cache = SemanticCache()
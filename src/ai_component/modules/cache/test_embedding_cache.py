@@ -0,0 +1,133 @@
+"""
+Unit tests for the process-wide embedding cache.
+
+A counting fake stands in for the Google embedding model.
+"""
+
+import os
+import asyncio
+import tempfile
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain_core.embeddings import Embeddings
+
+from src.ai_component.modules.cache.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Query and document vectors differ, as they do for retrieval models."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 0.0]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(0.01)
+        return self.embed_query(text)
+
+
+class TestCachedEmbeddings(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.model = CountingEmbeddings()
+        self.cache = CachedEmbeddings(self.model, model="test-model", max_entries=3, path=None)
+
+    async def test_each_text_is_embedded_once(self):
+        first = await self.cache.aembed_query("wheat sowing time")
+        self.assertEqual(self.cache.embed_query("wheat sowing time"), first)
+        self.assertEqual(await self.cache.aembed_query("wheat sowing time"), first)
+        self.assertEqual(len(self.model.calls), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["hit_rate"], 0.667)
+
+    async def test_query_and_document_vectors_are_kept_apart(self):
+        self.assertNotEqual(self.cache.embed_query("rice"), self.cache.embed_documents(["rice"])[0])
+        self.assertEqual(len(self.model.calls), 2)
+
+    async def test_documents_embed_only_uncached_texts_in_one_call(self):
+        self.cache.embed_documents(["a", "bb"])
+        vectors = await self.cache.aembed_documents(["bb", "ccc", "ccc", "a"])
+        self.assertEqual(self.model.calls, [["a", "bb"], ["ccc"]])
+        self.assertEqual([v[0] for v in vectors], [2.0, 3.0, 3.0, 1.0])
+
+    async def test_concurrent_queries_share_one_call(self):
+        results = await asyncio.gather(*(self.cache.aembed_query("pm kisan") for _ in range(5)))
+        self.assertEqual(len(self.model.calls), 1)
+        self.assertEqual(len({tuple(r) for r in results}), 1)
+        self.assertEqual(self.cache.get_stats()["coalesced"], 4)
+
+    async def test_cancelled_leader_does_not_fail_coalesced_callers(self):
+        leader = asyncio.create_task(self.cache.aembed_query("pm kisan"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(self.cache.aembed_query("pm kisan"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual(await waiter, [8.0, 0.0])
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(len(self.model.calls), 1)
+        # The result was cached even though the caller that asked first left
+        self.assertEqual(await self.cache.aembed_query("pm kisan"), [8.0, 0.0])
+        self.assertEqual(len(self.model.calls), 1)
+
+    async def test_failed_request_is_raised_to_every_caller_and_retried(self):
+        with mock.patch.object(self.model, "aembed_query", side_effect=ConnectionError):
+            results = await asyncio.gather(*(self.cache.aembed_query("rain") for _ in range(2)),
+                                           return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(await self.cache.aembed_query("rain"), [4.0, 0.0])
+
+    async def test_lru_eviction(self):
+        for text in ("a", "bb", "ccc", "dddd"):
+            self.cache.embed_query(text)
+        self.cache.embed_query("a")
+        self.assertEqual(len(self.model.calls), 5)
+        self.assertEqual(self.cache.get_stats()["evictions"], 2)
+
+
+class TestDiskStore(unittest.IsolatedAsyncioTestCase):
+
+    async def test_async_lookups_read_sqlite_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CachedEmbeddings(CountingEmbeddings(), model="thread-model", path=os.path.join(tmp, "e.sqlite"))
+            loop_thread = threading.get_ident()
+            threads = []
+            get = cache._disk.get
+
+            def recording_get(key):
+                threads.append(threading.get_ident())
+                return get(key)
+
+            with mock.patch.object(cache._disk, "get", recording_get):
+                await cache.aembed_query("onion price")
+                await cache.aembed_documents(["onion price", "wheat price"])
+            cache._disk.close()
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_vectors_survive_a_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "embeddings.sqlite")
+            model = CountingEmbeddings()
+            before = CachedEmbeddings(model, model="disk-model", path=path).embed_query("onion price")
+            after = CachedEmbeddings(model, model="disk-model", path=path)
+            self.assertEqual(after.embed_query("onion price"), before)
+            self.assertEqual(len(model.calls), 1)
+            self.assertEqual(after.get_stats()["disk_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the semantic answer cache.
+
+A deterministic bag-of-words embedder stands in for the Google embedding
+model, so no provider keys or network access are needed.
+"""
+
+import time
+import zlib
+import unittest
+
+from src.ai_component.modules.cache.semantic_cache import SemanticCache, query_entities
+
+
+async def bag_of_words(text: str):
+    vec = [0.0] * 128
+    for word in text.lower().replace("?", " ").split():
+        vec[zlib.crc32(word.encode()) % 128] += 1.0
+    return vec
+
+
+TTLS = {"GovSchemeNode": 3600, "WeatherNode": 60, "MandiNode": 60}
+
+
+class TestSemanticCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = SemanticCache(embed=bag_of_words, threshold=0.9, max_entries=3, ttls=TTLS)
+
+    async def _store(self, query, answer, workflow="GovSchemeNode", location="up/varanasi", thread="t1"):
+        self.assertIsNone(await self.cache.lookup(query, workflow, location, thread))
+        self.assertTrue(self.cache.commit(thread, query, answer))
+
+    async def test_near_duplicate_hits(self):
+        await self._store("am I eligible for pm kisan scheme", "Yes if you own land.")
+        answer = await self.cache.lookup("Am I eligible for PM Kisan scheme?", "GovSchemeNode", "up/varanasi", "t2")
+        self.assertEqual(answer, "Yes if you own land.")
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    async def test_different_question_misses(self):
+        await self._store("am I eligible for pm kisan scheme", "Yes if you own land.")
+        self.assertIsNone(await self.cache.lookup("how do I apply for kisan credit card", "GovSchemeNode", "up/varanasi", "t2"))
+
+    async def test_partitioned_by_workflow_and_location(self):
+        await self._store("will it rain tomorrow in my village", "Light rain.", workflow="WeatherNode")
+        self.assertIsNone(await self.cache.lookup("will it rain tomorrow in my village", "WeatherNode", "punjab/ludhiana", "t2"))
+        self.assertIsNone(await self.cache.lookup("will it rain tomorrow in my village", "GovSchemeNode", "up/varanasi", "t3"))
+
+    async def test_place_and_crop_named_in_the_query_are_part_of_the_key(self):
+        await self._store("what is the onion price in Nashik mandi today", "Rs 1800/q.", workflow="MandiNode")
+        # Same profile location, but another city or crop in the question
+        self.assertIsNone(await self.cache.lookup("what is the onion price in Pune mandi today", "MandiNode", "up/varanasi", "t2"))
+        self.assertIsNone(await self.cache.lookup("what is the potato price in Nashik mandi today", "MandiNode", "up/varanasi", "t3"))
+        # A farmer elsewhere asking about Nashik gets the Nashik answer
+        self.assertEqual(await self.cache.lookup("What is the onion price in Nashik mandi today?", "MandiNode", "punjab/ludhiana", "t4"),
+                         "Rs 1800/q.")
+
+    def test_query_entities(self):
+        self.assertEqual(query_entities("Tomatoes and wheat rate in Uttar Pradesh"), (["uttar pradesh"], ["tomato", "wheat"]))
+        self.assertEqual(query_entities("will it rain near Sitapur this week"), (["sitapur"], []))
+        self.assertEqual(query_entities("will it rain tomorrow in my village"), ([], []))
+
+    async def test_history_dependent_workflows_are_not_cached(self):
+        cache = SemanticCache(embed=bag_of_words)
+        self.assertIsNone(await cache.lookup("what should I spray on these yellow leaves", "DiseaseNode", "", "t1"))
+        self.assertFalse(cache.commit("t1", "what should I spray on these yellow leaves", "Neem oil."))
+        self.assertEqual(cache.get_stats()["bypassed"], 1)
+
+    async def test_uncached_workflows_and_short_queries_bypass(self):
+        self.assertIsNone(await self.cache.lookup("find farmers near me with this pest", "GeneralNode", "", "t1"))
+        self.assertIsNone(await self.cache.lookup("and wheat?", "GovSchemeNode", "", "t1"))
+        self.assertEqual(self.cache.get_stats()["bypassed"], 2)
+        self.assertFalse(self.cache.commit("t1", "and wheat?", "..."))
+
+    async def test_ttl_expiry(self):
+        await self._store("will it rain tomorrow in my village", "Light rain.", workflow="WeatherNode")
+        for entry in self.cache._entries.values():
+            entry.expires_at = time.time() - 1
+        self.assertIsNone(await self.cache.lookup("will it rain tomorrow in my village", "WeatherNode", "up/varanasi", "t2"))
+        self.assertEqual(self.cache.get_stats()["expirations"], 1)
+
+    async def test_lru_eviction(self):
+        queries = [
+            "am I eligible for pm kisan scheme",
+            "how do I apply for kisan credit card",
+            "what subsidy exists for drip irrigation",
+            "tell me about crop insurance under pmfby",
+        ]
+        for i, q in enumerate(queries[:3]):
+            await self._store(q, f"answer {i}", thread=f"t{i}")
+        # touch the oldest entry so the second one becomes least recently used
+        self.assertEqual(await self.cache.lookup(queries[0], "GovSchemeNode", "up/varanasi", "x"), "answer 0")
+        await self._store(queries[3], "answer 3", thread="t3")
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+        self.assertIsNone(await self.cache.lookup(queries[1], "GovSchemeNode", "up/varanasi", "y"))
+        self.assertEqual(await self.cache.lookup(queries[0], "GovSchemeNode", "up/varanasi", "z"), "answer 0")
+
+    async def test_commit_requires_matching_query(self):
+        self.assertIsNone(await self.cache.lookup("am I eligible for pm kisan scheme", "GovSchemeNode", "", "t1"))
+        self.assertFalse(self.cache.commit("t1", "a different question entirely", "answer"))
+
+
+if __name__ == "__main__":
+    unittest.main()
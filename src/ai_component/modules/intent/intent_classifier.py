@@ -0,0 +1,286 @@
+"""
+Local intent classifier — a CPU-only fast path in front of the LLM router.
+
+Every message used to pay a full structured-output LLM call just to pick one of
+six workflow nodes and one of three output formats.  This classifier scores the
+query locally with
+
+  1. keyword / gazetteer rules (scheme names, crops + price words, pests, ...)
+  2. a nearest-centroid model over hashed n-gram vectors of example queries
+
+and only hands the query to the LLM router when its confidence is below
+`intent_confidence_threshold`.  An explicit workflow hint from the client is
+always honoured.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Literal
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.ai_component.config import intent_confidence_threshold
+from src.ai_component.metrics import INTENT_ROUTES
+from src.ai_component.logger import logging
+
+
+ROUTES = (
+    "DiseaseNode",
+    "WeatherNode",
+    "MandiNode",
+    "GovSchemeNode",
+    "CarbonFootprintNode",
+    "GeneralNode",
+)
+
+
+class IntentPrediction(BaseModel):
+    route_node: Literal['DiseaseNode', 'WeatherNode', 'MandiNode', 'GovSchemeNode', 'CarbonFootprintNode', 'GeneralNode']
+    output: Literal["TextNode", "ImageNode", "VoiceNode"]
+    confidence: float
+    source: Literal["hint", "local"]
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse everything that is not a letter or digit to single spaces."""
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """One regex per route; tolerates simple plurals ('pests', 'diseases')."""
+    alternation = "|".join(sorted((re.escape(_normalize(k)) for k in keywords), key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})(?:s|es)?\b")
+
+
+class IntentClassifier:
+    """Keyword + nearest-centroid router with per-route hit/fallback counters."""
+
+    KEYWORDS: Dict[str, List[str]] = {
+        "DiseaseNode": [
+            "disease", "symptom", "blight", "rust", "wilt", "rot", "mildew", "fungus", "fungal",
+            "pest", "insect", "aphid", "whitefly", "bollworm", "caterpillar", "larva", "locust",
+            "leaf spot", "yellow leaves", "leaves turning", "curl", "infection", "infected",
+            "pesticide", "fungicide", "insecticide", "treatment", "cure", "keeda", "rog", "bimari",
+        ],
+        "WeatherNode": [
+            "weather", "rain", "rainfall", "raining", "forecast", "temperature", "humidity",
+            "monsoon", "storm", "hailstorm", "wind", "sunny", "cloudy", "heatwave", "frost",
+            "mausam", "barish", "baarish",
+        ],
+        "MandiNode": [
+            "mandi", "market price", "price", "rate", "rates", "bhav", "daam", "apmc",
+            "selling price", "sell", "msp rate", "commodity", "trend",
+        ],
+        "GovSchemeNode": [
+            "scheme", "yojana", "subsidy", "pm kisan", "pmkisan", "pmfby", "fasal bima",
+            "crop insurance", "kcc", "kisan credit card", "soil health card", "government",
+            "sarkari", "pension", "enam", "pmksy", "eligibility", "apply for",
+        ],
+        "CarbonFootprintNode": [
+            "carbon", "footprint", "emission", "greenhouse gas", "co2", "carbon credit",
+        ],
+        "GeneralNode": [
+            "call", "phone", "connect me", "contact", "farmers near", "people near",
+            "similar problem", "someone who", "talk to", "hello", "namaste",
+        ],
+    }
+
+    # Keywords common outside their route ("rate" of interest, "call" my son,
+    # "treatment" of a cow): they count for less, and one of them alone never
+    # clears the threshold — that takes a specific keyword or several hits.
+    BROAD_KEYWORDS: Dict[str, List[str]] = {
+        "DiseaseNode": ["symptom", "rot", "rust", "curl", "infection", "infected", "treatment", "cure"],
+        "WeatherNode": ["temperature", "wind", "sunny", "cloudy"],
+        "MandiNode": ["price", "rate", "rates", "sell", "commodity", "trend"],
+        "GovSchemeNode": ["government", "pension", "eligibility", "apply for"],
+        "CarbonFootprintNode": ["emission"],
+        "GeneralNode": ["call", "phone", "contact", "connect me", "talk to", "someone who", "hello", "namaste"],
+    }
+
+    # Crop / commodity gazetteer — strong evidence only when a price word is present.
+    COMMODITIES: List[str] = [
+        "wheat", "rice", "paddy", "cotton", "soybean", "maize", "barley", "pulses", "groundnut",
+        "mustard", "onion", "potato", "tomato", "sugarcane", "gram", "chana", "tur", "arhar",
+        "moong", "urad", "bajra", "jowar", "garlic", "chilli",
+    ]
+
+    OUTPUT_KEYWORDS: Dict[str, List[str]] = {
+        "ImageNode": ["image", "picture", "photo", "chart", "infographic", "diagram", "draw", "tasveer"],
+        "VoiceNode": ["voice", "audio", "speak", "read aloud", "voice note", "voice message", "awaaz"],
+    }
+
+    EXAMPLES: Dict[str, List[str]] = {
+        "DiseaseNode": [
+            "what are the symptoms of leaf blight in rice",
+            "my tomato leaves are turning yellow with brown spots",
+            "how do I control aphids on mustard",
+            "white powder on my wheat leaves what disease is it",
+            "best pesticide for bollworm in cotton",
+            "potato plants are wilting and the stem is rotting",
+        ],
+        "WeatherNode": [
+            "will it rain tomorrow in varanasi",
+            "what is the weather forecast for the next five days",
+            "current temperature and humidity in lucknow",
+            "when will the monsoon arrive this year",
+            "is there any storm expected this week",
+        ],
+        "MandiNode": [
+            "what is the price of onion in nashik mandi",
+            "wheat rate in uttar pradesh today",
+            "potato market price trend for last ten days",
+            "should I sell my soybean now or wait for better price",
+            "forecast tomato prices for next week",
+        ],
+        "GovSchemeNode": [
+            "am I eligible for pm kisan",
+            "how to apply for kisan credit card",
+            "what subsidy is available for drip irrigation",
+            "tell me about crop insurance scheme pmfby",
+            "how do I get a soil health card",
+        ],
+        "CarbonFootprintNode": [
+            "what is the carbon footprint of my farm",
+            "how much emission does urea fertilizer cause",
+            "can I earn carbon credits from farming",
+        ],
+        "GeneralNode": [
+            "find farmers near me with the same problem",
+            "call this farmer and tell him about my issue",
+            "hello how are you",
+            "connect me with someone who grows organic vegetables",
+            "when should I sow wheat",
+            "how much urea should I use per acre",
+        ],
+    }
+
+    KEYWORD_WEIGHT = 0.35   # score added per specific keyword (capped at 3 matches)
+    BROAD_WEIGHT = 0.1      # score added per broad keyword
+    TEMPERATURE = 0.1       # softmax temperature turning scores into a confidence
+    DIMS = 2048             # hashed feature space for the centroid model
+
+    def __init__(self, threshold: float = intent_confidence_threshold):
+        self.threshold = threshold
+        self._route_patterns = {
+            r: _keyword_pattern([k for k in keywords if k not in self.BROAD_KEYWORDS[r]])
+            for r, keywords in self.KEYWORDS.items()
+        }
+        self._broad_patterns = {r: _keyword_pattern(k) for r, k in self.BROAD_KEYWORDS.items()}
+        self._commodity_pattern = _keyword_pattern(self.COMMODITIES)
+        self._output_patterns = {o: _keyword_pattern(k) for o, k in self.OUTPUT_KEYWORDS.items()}
+        self._centroids = np.stack([self._centroid(self.EXAMPLES[r]) for r in ROUTES])
+        self.stats: Dict[str, Dict[str, int]] = {
+            route: {"hint": 0, "local": 0, "fallback": 0} for route in ROUTES
+        }
+
+    # ------------------------------------------------------------------ #
+    #  Features                                                           #
+    # ------------------------------------------------------------------ #
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Hashed bag of words + character trigrams, L2-normalised."""
+        vec = np.zeros(self.DIMS, dtype=np.float32)
+        for word in _normalize(text).split():
+            vec[zlib.crc32(word.encode()) % self.DIMS] += 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                vec[zlib.crc32(padded[i:i + 3].encode()) % self.DIMS] += 0.5
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _centroid(self, examples: List[str]) -> np.ndarray:
+        centroid = np.mean([self._embed(e) for e in examples], axis=0)
+        norm = np.linalg.norm(centroid)
+        return centroid / norm if norm else centroid
+
+    def _keyword_hits(self, text: str) -> Dict[str, int]:
+        """Specific keyword matches per route."""
+        hits = {route: len(set(p.findall(text))) for route, p in self._route_patterns.items()}
+        # A crop name plus a price word is market talk, not a disease question.
+        if (hits["MandiNode"] or self._broad_patterns["MandiNode"].search(text)) \
+                and self._commodity_pattern.search(text):
+            hits["MandiNode"] += 1
+        return hits
+
+    def _broad_hits(self, text: str) -> Dict[str, int]:
+        return {route: len(set(p.findall(text))) for route, p in self._broad_patterns.items()}
+
+    def detect_output(self, query: str) -> str:
+        """Text unless the user explicitly asks for an image or a voice reply."""
+        text = _normalize(query)
+        for output, pattern in self._output_patterns.items():
+            if pattern.search(text):
+                return output
+        return "TextNode"
+
+    # ------------------------------------------------------------------ #
+    #  Prediction                                                         #
+    # ------------------------------------------------------------------ #
+
+    def predict(self, query: str) -> IntentPrediction:
+        """Score every route and return the best one with its confidence."""
+        text = _normalize(query)
+        similarities = self._centroids @ self._embed(text)
+        hits, broad = self._keyword_hits(text), self._broad_hits(text)
+        scores = np.array([
+            similarities[i] + self.KEYWORD_WEIGHT * min(hits[route], 3) + self.BROAD_WEIGHT * min(broad[route], 3)
+            for i, route in enumerate(ROUTES)
+        ])
+        probs = np.exp((scores - scores.max()) / self.TEMPERATURE)
+        probs /= probs.sum()
+        best = int(np.argmax(probs))
+        confidence = float(probs[best])
+        if not hits[ROUTES[best]] and broad[ROUTES[best]] < 2:
+            # Not enough evidence to skip the router, however the softmax came out
+            confidence = min(confidence, self.threshold - 0.01)
+        return IntentPrediction(
+            route_node=ROUTES[best],
+            output=self.detect_output(query),
+            confidence=confidence,
+            source="local",
+        )
+
+    def classify(self, query: str, hint: Optional[str] = None) -> Optional[IntentPrediction]:
+        """
+        Return a routing decision, or None when the LLM router should decide.
+
+        Args:
+            query: the latest user message
+            hint: workflow explicitly requested by the client, if any
+        """
+        if hint in ROUTES:
+            self._count(hint, "hint")
+            return IntentPrediction(route_node=hint, output=self.detect_output(query),
+                                    confidence=1.0, source="hint")
+
+        prediction = self.predict(query)
+        if prediction.confidence >= self.threshold:
+            self._count(prediction.route_node, "local")
+            logging.info(
+                f"Intent classifier routed to {prediction.route_node} "
+                f"(confidence {prediction.confidence:.2f})"
+            )
+            return prediction
+
+        logging.info(
+            f"Intent classifier unsure ({prediction.route_node} at "
+            f"{prediction.confidence:.2f}) — falling back to LLM router"
+        )
+        return None
+
+    def record_fallback(self, route: str) -> None:
+        """Count a turn whose route had to come from the LLM router."""
+        if route in self.stats:
+            self._count(route, "fallback")
+
+    def _count(self, route: str, source: str) -> None:
+        self.stats[route][source] += 1
+        INTENT_ROUTES.labels(route, source).inc()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-route hint/local/fallback counters (reported by /api/health)."""
+        return {route: dict(counts) for route, counts in self.stats.items()}
+
+
+intent_classifier = IntentClassifier()
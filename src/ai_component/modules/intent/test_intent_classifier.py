@@ -0,0 +1,105 @@
+"""
+Unit tests for the local intent classifier that fronts the LLM router.
+
+The classifier is pure CPU code (regex rules + hashed n-gram centroids), so
+these tests run without any provider keys or network access.
+"""
+
+import unittest
+
+from prometheus_client import REGISTRY
+
+from src.ai_component.modules.intent.intent_classifier import IntentClassifier, ROUTES
+
+
+class TestIntentClassifierRouting(unittest.TestCase):
+    """Confident queries are routed locally to the expected workflow."""
+
+    def setUp(self):
+        self.classifier = IntentClassifier(threshold=0.75)
+
+    def test_confident_queries_route_locally(self):
+        cases = {
+            "What are the symptoms of leaf blight in rice?": "DiseaseNode",
+            "Will it rain tomorrow in Patna?": "WeatherNode",
+            "Onion price in Nashik mandi today": "MandiNode",
+            "Am I eligible for PM-Kisan?": "GovSchemeNode",
+            "What is the carbon footprint of my farm?": "CarbonFootprintNode",
+        }
+        for query, expected in cases.items():
+            prediction = self.classifier.classify(query)
+            self.assertIsNotNone(prediction, query)
+            self.assertEqual(prediction.route_node, expected, query)
+            self.assertEqual(prediction.source, "local")
+
+    def test_ambiguous_query_falls_back_to_llm(self):
+        """Nothing but a crop name is not enough evidence to skip the router."""
+        self.assertIsNone(self.classifier.classify("tell me about wheat"))
+
+    def test_single_broad_keyword_falls_back_to_llm(self):
+        """Words like "rate", "call" or "treatment" are common outside their route."""
+        for query in (
+            "what is the rate of interest on my loan",
+            "call my son",
+            "treatment for my cow fever",
+            "can I sell my tractor",
+            "I want to contact the bank",
+            "what is the trend",
+        ):
+            prediction = self.classifier.predict(query)
+            self.assertLess(prediction.confidence, 0.75, query)
+            self.assertIsNone(self.classifier.classify(query), query)
+
+    def test_broad_keywords_count_with_specific_evidence(self):
+        self.assertEqual(self.classifier.classify("wheat price today").route_node, "MandiNode")
+        self.assertEqual(
+            self.classifier.classify("Can you connect me to someone who grows onion").route_node, "GeneralNode"
+        )
+
+    def test_threshold_is_tunable(self):
+        strict = IntentClassifier(threshold=1.01)
+        self.assertIsNone(strict.classify("Will it rain tomorrow in Patna?"))
+
+
+class TestIntentClassifierOutputAndHints(unittest.TestCase):
+    """Output format detection, workflow hints and counters."""
+
+    def setUp(self):
+        self.classifier = IntentClassifier()
+
+    def test_output_defaults_to_text(self):
+        self.assertEqual(self.classifier.detect_output("wheat price in punjab"), "TextNode")
+
+    def test_output_detects_image_and_voice(self):
+        self.assertEqual(self.classifier.detect_output("show me a chart of onion prices"), "ImageNode")
+        self.assertEqual(self.classifier.detect_output("send a voice note about the weather"), "VoiceNode")
+
+    def test_explicit_hint_is_honoured(self):
+        prediction = self.classifier.classify("Will it rain tomorrow?", hint="MandiNode")
+        self.assertEqual(prediction.route_node, "MandiNode")
+        self.assertEqual(prediction.source, "hint")
+
+    def test_unknown_hint_is_ignored(self):
+        prediction = self.classifier.classify("Will it rain tomorrow in Patna?", hint="NotANode")
+        self.assertEqual(prediction.route_node, "WeatherNode")
+
+    def test_counters_track_hint_local_and_fallback(self):
+        def exported():
+            return REGISTRY.get_sample_value(
+                "kisan_intent_routes_total", {"route": "DiseaseNode", "source": "fallback"}
+            ) or 0.0
+
+        before = exported()
+        self.classifier.classify("Will it rain tomorrow in Patna?")
+        self.classifier.classify("anything", hint="GeneralNode")
+        self.classifier.record_fallback("DiseaseNode")
+        stats = self.classifier.get_stats()
+        self.assertEqual(set(stats), set(ROUTES))
+        self.assertEqual(stats["WeatherNode"]["local"], 1)
+        self.assertEqual(stats["GeneralNode"]["hint"], 1)
+        self.assertEqual(stats["DiseaseNode"]["fallback"], 1)
+        self.assertEqual(exported() - before, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
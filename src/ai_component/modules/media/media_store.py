@@ -0,0 +1,201 @@
+"""
+Content-addressed store for generated media (images, voice replies).
+
+`ImageNode` and `VoiceNode` used to return the raw bytes (or a base64 WAV)
+into graph state, so `AsyncPostgresSaver` wrote the blob into every
+checkpoint of the turn and `POST /message` base64-encoded it once more into
+the JSON response.  The nodes now `put()` the bytes here and keep only the
+returned reference — `<sha256>.<ext>` — in state; the API hands out
+`url_for(ref)` instead of the payload.
+
+Backends are chosen by `media_store_url`:
+
+  * `file://<dir>`            — local disk (default `data/media`)
+  * `s3://<bucket>/<prefix>`  — S3 or any S3-compatible object store (boto3)
+
+Further schemes can be added with `register_backend`.  Identical content maps
+to the same reference, so a repeated answer is stored once.
+"""
+
+import os
+import re
+import sys
+import asyncio
+import hashlib
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from src.ai_component.config import media_store_url, media_s3_endpoint_url, media_public_base_url
+from src.ai_component.logger import logging
+from src.ai_component.exception import CustomException
+
+MEDIA_ROUTE = "/api/v1/media"
+
+REF_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "webp": "image/webp",
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "bin": "application/octet-stream",
+}
+_EXTENSIONS = {content_type: ext for ext, content_type in CONTENT_TYPES.items()}
+
+
+def sniff_extension(data: bytes, default: str = "bin") -> str:
+    """File extension from the leading magic bytes."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data.startswith(b"ID3") or data[:2] == b"\xff\xfb":
+        return "mp3"
+    return default
+
+
+def content_type_of(ref: str) -> str:
+    return CONTENT_TYPES.get(ref.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class LocalMediaBackend:
+    """Blobs as files under `root`, fanned out by the first two hex digits."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, ref: str) -> str:
+        return os.path.join(self.root, ref[:2], ref)
+
+    def _write(self, ref: str, data: bytes) -> None:
+        path = self._path(ref)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a reader never sees a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read(self, ref: str) -> Optional[bytes]:
+        try:
+            with open(self._path(ref), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    async def write(self, ref: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(self._write, ref, data)
+
+    async def read(self, ref: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, ref)
+
+
+class S3MediaBackend:
+    """Blobs as objects under `s3://bucket/prefix`; boto3 is imported on first use."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError("s3:// media storage needs boto3 (pip install boto3)") from e
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url)
+        return self._client
+
+    def _key(self, ref: str) -> str:
+        return f"{self.prefix}/{ref}" if self.prefix else ref
+
+    def _write(self, ref: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=self._key(ref), Body=data, ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+
+    def _read(self, ref: str) -> Optional[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(ref))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    async def write(self, ref: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(self._write, ref, data, content_type)
+
+    async def read(self, ref: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, ref)
+
+
+_BACKENDS: Dict[str, Callable] = {
+    "file": lambda url: LocalMediaBackend(url.netloc + url.path),
+    "s3":   lambda url: S3MediaBackend(url.netloc, url.path, endpoint_url=media_s3_endpoint_url),
+}
+
+
+def register_backend(scheme: str, factory: Callable) -> None:
+    """Add a storage backend for `<scheme>://...` URLs; `factory` gets the parsed URL."""
+    _BACKENDS[scheme] = factory
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class MediaStore:
+    """Puts bytes under their content hash and hands out references and URLs."""
+
+    def __init__(self, url: str = media_store_url, public_base_url: str = media_public_base_url):
+        self.url = url
+        self.public_base_url = public_base_url
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            parsed = urlparse(self.url)
+            factory = _BACKENDS.get(parsed.scheme)
+            if factory is None:
+                raise ValueError(f"No media backend for '{self.url}' (known: {', '.join(sorted(_BACKENDS))})")
+            self._backend = factory(parsed)
+        return self._backend
+
+    async def put(self, data: bytes, content_type: Optional[str] = None) -> str:
+        """Store `data` and return its reference (`<sha256>.<ext>`)."""
+        try:
+            ext = sniff_extension(data, default=_EXTENSIONS.get(content_type, "bin"))
+            ref = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+            await self.backend.write(ref, data, content_type or content_type_of(ref))
+            logging.info(f"Stored {len(data)} bytes of media as {ref}")
+            return ref
+        except Exception as e:
+            logging.error(f"Error storing media: {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def get(self, ref: str) -> Optional[bytes]:
+        """The stored bytes, or None for an unknown or malformed reference."""
+        if not REF_PATTERN.match(ref):
+            return None
+        return await self.backend.read(ref)
+
+    def url_for(self, ref: str) -> str:
+        base = self.public_base_url or MEDIA_ROUTE
+        return f"{base}/{ref}"
+
+
+media_store = MediaStore()
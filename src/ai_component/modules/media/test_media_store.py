@@ -0,0 +1,71 @@
+"""
+Unit tests for the content-addressed media store (local filesystem backend).
+"""
+
+import os
+import hashlib
+import tempfile
+import unittest
+
+from src.ai_component.modules.media.media_store import MediaStore, register_backend, sniff_extension
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+WAV = b"RIFF\x24\x00\x00\x00WAVEfmt " + b"\x00" * 24
+
+
+class TestMediaStore(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = MediaStore(url=f"file://{self.tmp.name}", public_base_url="")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_put_returns_content_addressed_reference(self):
+        ref = await self.store.put(PNG, "image/png")
+        self.assertEqual(ref, f"{hashlib.sha256(PNG).hexdigest()}.png")
+        self.assertEqual(await self.store.get(ref), PNG)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, ref[:2], ref)))
+
+    async def test_identical_content_is_stored_once(self):
+        first = await self.store.put(WAV, "audio/wav")
+        second = await self.store.put(WAV, "audio/wav")
+        self.assertEqual(first, second)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp.name, first[:2]))), 1)
+
+    async def test_unknown_and_malformed_references(self):
+        self.assertIsNone(await self.store.get("0" * 64 + ".png"))
+        self.assertIsNone(await self.store.get("../../etc/passwd"))
+
+    def test_urls(self):
+        ref = "a" * 64 + ".wav"
+        self.assertEqual(self.store.url_for(ref), f"/api/v1/media/{ref}")
+        cdn = MediaStore(url="file:///unused", public_base_url="https://cdn.example.org/kisan")
+        self.assertEqual(cdn.url_for(ref), f"https://cdn.example.org/kisan/{ref}")
+
+    def test_sniff_extension(self):
+        self.assertEqual(sniff_extension(PNG), "png")
+        self.assertEqual(sniff_extension(WAV), "wav")
+        self.assertEqual(sniff_extension(b"\xff\xd8\xff\xe0jpeg"), "jpg")
+        self.assertEqual(sniff_extension(b"plain", default="png"), "png")
+
+    async def test_registered_backend(self):
+        blobs = {}
+
+        class MemoryBackend:
+            async def write(self, ref, data, content_type):
+                blobs[ref] = data
+
+            async def read(self, ref):
+                return blobs.get(ref)
+
+        register_backend("memtest", lambda url: MemoryBackend())
+        store = MediaStore(url="memtest://bucket")
+        ref = await store.put(PNG)
+        self.assertEqual(await store.get(ref), PNG)
+        self.assertEqual(list(blobs), [ref])
+
+
+if __name__ == "__main__":
+    unittest.main()
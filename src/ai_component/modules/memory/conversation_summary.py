@@ -0,0 +1,127 @@
+"""
+Rolling conversation summaries, updated off the response path.
+
+The turns that leave the prompt window (`conversation_window`) are folded
+into a per-thread summary by the "history.summary" chain.  That call used to
+be a graph node after the answer, so POST /message and the SSE done frame
+still waited for it.  MemoryIngestionNode now only `schedule`s it: the
+update runs on a detached task and saves {summary, cursor} in the LangGraph
+store under ("conversation_summary", thread_id), where the next turn's
+history_node reads it.  It is kept out of graph state because a task that
+outlives the run cannot write the checkpoint without racing the next turn.
+
+One update runs per thread at a time; a turn that finds one in flight skips
+it, and its evicted turns are picked up by the next update (the cursor only
+moves when a summary is saved).
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+from langgraph.store.base import BaseStore
+
+from src.ai_component.graph.utils.chains import chain_registry
+from src.ai_component.modules.memory.conversation_window import select_window, unsummarized, format_messages
+from src.ai_component.logger import logging
+
+NAMESPACE_ROOT = "conversation_summary"
+KEY = "rolling"
+
+Summary = Tuple[str, Optional[str]]   # (summary, id of the last message folded into it)
+
+
+async def _graph_store() -> BaseStore:
+    from src.ai_component.graph.graph import get_store   # graph imports this module
+    return await get_store()
+
+
+class ConversationSummaries:
+    """Reads, caches and updates the rolling summary of each thread."""
+
+    def __init__(self, get_store: Callable[[], Awaitable[BaseStore]] = _graph_store, cache_size: int = 1024):
+        self._get_store = get_store
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Summary]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {"updated": 0, "skipped": 0, "failed": 0}
+
+    def _remember(self, thread_id: str, value: Summary) -> None:
+        self._cache[thread_id] = value
+        self._cache.move_to_end(thread_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def cached(self, thread_id: Optional[str]) -> Summary:
+        """Last summary this process read or wrote for the thread; no I/O (used by the speculator)."""
+        return self._cache.get(thread_id, ("", None)) if thread_id else ("", None)
+
+    async def get(self, thread_id: Optional[str]) -> Summary:
+        """The thread's saved summary and cursor, or ("", None) if there is none yet."""
+        if not thread_id:
+            return "", None
+        store = await self._get_store()
+        item = await store.aget((NAMESPACE_ROOT, thread_id), KEY)
+        value = (item.value.get("summary", ""), item.value.get("cursor")) if item else ("", None)
+        self._remember(thread_id, value)
+        return value
+
+    def schedule(self, thread_id: Optional[str], messages: List[BaseMessage]) -> Optional[asyncio.Task]:
+        """Start folding the turns that left the window into the summary. Returns the task, if started."""
+        if not thread_id:
+            return None
+        if thread_id in self._tasks:
+            self.stats["skipped"] += 1
+            return None
+        older, _ = select_window(messages)
+        if not older:
+            return None
+        task = asyncio.create_task(self._update(thread_id, list(messages)))
+        self._tasks[thread_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(thread_id, None))
+        return task
+
+    async def _update(self, thread_id: str, messages: List[BaseMessage]) -> None:
+        try:
+            summary, cursor = await self.get(thread_id)
+            older, window = select_window(messages)
+            evicted = unsummarized(older, window, cursor)
+            if not evicted:
+                return
+            chain = await chain_registry.get("history.summary")
+            response = await chain.ainvoke({
+                "summary": summary or "None yet",
+                "conversation": format_messages(evicted),
+            })
+            value = (response.content.strip(), evicted[-1].id)
+            store = await self._get_store()
+            await store.aput((NAMESPACE_ROOT, thread_id), KEY, {"summary": value[0], "cursor": value[1]}, index=False)
+            self._remember(thread_id, value)
+            self.stats["updated"] += 1
+            logging.info(f"Folded {len(evicted)} messages into the conversation summary")
+        except Exception as e:
+            # Keep the previous summary; the evicted turns are retried after the next answer
+            self.stats["failed"] += 1
+            logging.warning(f"Conversation summary update skipped: {str(e)}")
+
+    async def delete(self, thread_id: str) -> None:
+        """Forget a deleted thread's summary."""
+        self._cache.pop(thread_id, None)
+        store = await self._get_store()
+        await store.adelete((NAMESPACE_ROOT, thread_id), KEY)
+
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Let in-flight updates finish (up to `timeout` seconds), then cancel the rest."""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "in_flight": len(self._tasks), "cached_threads": len(self._cache)}
+
+
+conversation_summaries = ConversationSummaries()
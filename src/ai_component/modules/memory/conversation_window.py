@@ -0,0 +1,108 @@
+"""
+Token-budgeted conversation window.
+
+Workflow prompts used to receive every message of the checkpointed thread, so
+prompt size (and LLM latency / cost) grew with the age of the thread.  The
+window keeps the most recent turns verbatim — at most `history_max_turns`
+turns and roughly `history_token_budget` tokens — and everything older is
+folded into a rolling summary (`conversation_summary`).  The summary is
+updated on a detached task after the answer, so no turn waits for it; the
+turn that was just pushed out of the window is kept verbatim until then.
+
+A turn starts at a HumanMessage and runs up to the next one, so a tool call
+and its results are never split from the question that caused them.
+"""
+
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+
+from src.ai_component.config import history_max_turns, history_token_budget
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) — no tokenizer needed."""
+    return (len(text) + 3) // 4
+
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a HumanMessage."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def format_messages(messages: List[BaseMessage]) -> str:
+    """Render messages as 'User: / AI:' lines, skipping tool traffic."""
+    lines = []
+    for message in messages:
+        if isinstance(message, ToolMessage) or not message.content:
+            continue
+        if isinstance(message, AIMessage) and message.tool_calls:
+            continue
+        role = "User" if isinstance(message, HumanMessage) else "AI"
+        lines.append(f"{role}: {message.content}")
+    return "\n".join(lines)
+
+
+def select_window(
+    messages: List[BaseMessage],
+    max_turns: int = history_max_turns,
+    token_budget: int = history_token_budget,
+) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+    """
+    Split messages into (older, window).
+
+    The newest turn is always kept; earlier turns are added newest-first until
+    either limit would be exceeded.
+    """
+    turns = split_turns(messages)
+    kept: List[List[BaseMessage]] = []
+    used = 0
+    for turn in reversed(turns):
+        cost = estimate_tokens(format_messages(turn))
+        if kept and (len(kept) >= max_turns or used + cost > token_budget):
+            break
+        kept.append(turn)
+        used += cost
+    kept.reverse()
+    window = [m for turn in kept for m in turn]
+    return messages[:len(messages) - len(window)], window
+
+
+def unsummarized(
+    older: List[BaseMessage], window: List[BaseMessage], cursor: Optional[str]
+) -> List[BaseMessage]:
+    """Messages that fell out of the window after the summary cursor."""
+    if not cursor:
+        return older
+    for i, message in enumerate(older):
+        if message.id == cursor:
+            return older[i + 1:]
+    if any(message.id == cursor for message in window):
+        # The window grew back over already-summarised turns
+        return []
+    return older
+
+
+def build_history(summary: str, window: List[BaseMessage]) -> str:
+    """The history block handed to workflow prompts."""
+    recent = format_messages(window)
+    if not summary:
+        return recent
+    return f"Summary of earlier conversation:\n{summary}\n\nRecent messages:\n{recent}"
+
+
+def prompt_history(messages: List[BaseMessage], summary: str = "", cursor: Optional[str] = None) -> str:
+    """
+    The history of the current turn's prompts: the summary, the turn this
+    message pushed out of the window (not summarised until after the answer)
+    and the window.
+    """
+    older, window = select_window(messages)
+    pending = split_turns(unsummarized(older, window, cursor))[-1:]
+    return build_history(summary, [m for turn in pending for m in turn] + window)
@@ -0,0 +1,287 @@
+"""
+Index the government scheme PDFs into Qdrant, incrementally.
+
+    python -m src.ai_component.modules.memory.ingest_schemes [--data-path data] [--workers 4] [--rebuild] [--dry-run]
+
+`StoreInMemory2` used to load and split every PDF in memory and push it all
+through one `Qdrant.from_documents` call, started lazily by the scheme tool
+inside a user request.  This pipeline runs on its own and only pays for what
+changed:
+
+  * state     — every point records its PDF's path, sha256, chunk index and
+    chunk count (and the chunking settings), so what is indexed is read back
+    from the collection itself, from any host; unchanged, fully indexed PDFs
+    are skipped
+  * parsing   — PDFs are parsed and split in a process pool; each file's
+    chunks are embedded as soon as that file is parsed
+  * embedding — `scheme_embed_batch_size` chunks per `embed_documents` call
+    and upsert, in chunk order, so a crash resumes at the first chunk missing
+    from the collection
+  * removal   — vectors of deleted or changed PDFs (and of the old loader,
+    which recorded other paths) are removed by their `metadata.source`; a data
+    path without any PDF is refused rather than emptying the collection
+
+Point ids derive from (source, sha256, chunk index), so re-indexing a chunk
+overwrites it.  Changing the chunking parameters re-indexes everything.
+"""
+
+import os
+import uuid
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
+
+from src.ai_component.config import (
+    scheme_collection,
+    scheme_data_path,
+    scheme_chunk_size,
+    scheme_chunk_overlap,
+    scheme_embed_batch_size,
+    scheme_parse_workers,
+)
+from src.ai_component.logger import logging
+
+SCHEME_TYPE = "government_scheme"
+SOURCE_KEY = "metadata.source"
+PAGE_SIZE = 256
+
+# Namespace of the deterministic chunk point ids
+_ID_NAMESPACE = uuid.UUID("2d8f6a53-91c4-4f0e-8b7a-5e3c1d9a4b62")
+
+Chunk = Tuple[str, int]     # (text, page number)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_pdf(path: str, chunk_size: int = scheme_chunk_size, chunk_overlap: int = scheme_chunk_overlap) -> List[Chunk]:
+    """Split one PDF into (text, page) chunks; runs in a worker process."""
+    from pypdf import PdfReader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks: List[Chunk] = []
+    for page_number, page in enumerate(PdfReader(path).pages, 1):
+        chunks.extend((text, page_number) for text in splitter.split_text(page.extract_text() or ""))
+    return chunks
+
+
+def point_id(source: str, sha256: str, index: int) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, f"{source}\n{sha256}\n{index}"))
+
+
+def scan(data_path: str) -> Dict[str, str]:
+    """{path relative to data_path: absolute path} of every PDF below data_path."""
+    found = {}
+    for root, _dirs, files in os.walk(data_path):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                path = os.path.join(root, name)
+                found[os.path.relpath(path, data_path)] = path
+    return dict(sorted(found.items()))
+
+
+def _indexed_prefix(chunk_ids) -> int:
+    """Chunks 0..n-1 are all in the collection; batches are written in order."""
+    n = 0
+    while n in chunk_ids:
+        n += 1
+    return n
+
+
+class SchemeIngestion:
+    """One incremental indexing run of the scheme PDFs into `collection_name`."""
+
+    def __init__(
+        self,
+        vector_store,
+        data_path: str = scheme_data_path,
+        collection_name: str = scheme_collection,
+        chunk_size: int = scheme_chunk_size,
+        chunk_overlap: int = scheme_chunk_overlap,
+        batch_size: int = scheme_embed_batch_size,
+        workers: int = scheme_parse_workers,
+        parse: Callable[[str, int, int], List[Chunk]] = parse_pdf,
+    ):
+        self.vector_store = vector_store
+        self.data_path = data_path
+        self.collection_name = collection_name
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.batch_size = batch_size
+        self.workers = workers
+        self.parse = parse
+        self.settings = {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+        self.stats = {"files": 0, "unchanged": 0, "indexed_files": 0, "resumed_files": 0,
+                      "removed_files": 0, "chunks": 0}
+
+    # ------------------------------------------------------------------ #
+    #  Qdrant                                                             #
+    # ------------------------------------------------------------------ #
+
+    def _prepare_collection(self) -> None:
+        self.vector_store.create_collection(collection_name=self.collection_name, vector_size=768)
+        from qdrant_client.models import PayloadSchemaType
+        self.vector_store.client.create_payload_index(
+            collection_name=self.collection_name, field_name=SOURCE_KEY, field_schema=PayloadSchemaType.KEYWORD,
+        )
+
+    def indexed(self) -> Dict[str, Dict]:
+        """{source: {"hashes", "chunk_ids", "chunks", "settings"}} read back from the point payloads."""
+        state: Dict[str, Dict] = {}
+        if not self.vector_store._collection_exists(self.collection_name):
+            return state
+        fields = ("source", "file_hash", "chunk", "chunks", "chunk_size", "chunk_overlap")
+        offset = None
+        while True:
+            points, offset = self.vector_store.client.scroll(
+                collection_name=self.collection_name, limit=PAGE_SIZE, offset=offset,
+                with_payload=[f"metadata.{field}" for field in fields], with_vectors=False,
+            )
+            for point in points:
+                meta = (point.payload or {}).get("metadata") or {}
+                entry = state.setdefault(meta.get("source"), {"hashes": set(), "chunk_ids": set(),
+                                                              "chunks": None, "settings": set()})
+                entry["hashes"].add(meta.get("file_hash"))
+                entry["chunk_ids"].add(meta.get("chunk"))
+                entry["chunks"] = meta.get("chunks", entry["chunks"])
+                entry["settings"].add((meta.get("chunk_size"), meta.get("chunk_overlap")))
+            if offset is None:
+                return state
+
+    def _delete_source(self, source: str) -> None:
+        from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
+        self.vector_store.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=Filter(must=[FieldCondition(key=SOURCE_KEY, match=MatchValue(value=source))])),
+        )
+
+    def _index_batch(self, source: str, sha256: str, start: int, chunks: List[Chunk], total: int) -> None:
+        from langchain.schema import Document
+
+        documents = [
+            Document(page_content=text, metadata=self.vector_store._metadata(
+                SCHEME_TYPE, collection=self.collection_name, source=source, page=page, chunk=start + i,
+                chunks=total, file_hash=sha256, **self.settings,
+            ))
+            for i, (text, page) in enumerate(chunks)
+        ]
+        vectors = self.vector_store.embeddings.embed_documents([doc.page_content for doc in documents])
+        ids = [point_id(source, sha256, start + i) for i in range(len(chunks))]
+        self.vector_store.client.upsert(
+            collection_name=self.collection_name,
+            points=self.vector_store._points(documents, vectors, ids=ids),
+        )
+
+    # ------------------------------------------------------------------ #
+    #  Run                                                                #
+    # ------------------------------------------------------------------ #
+
+    def plan(self) -> Tuple[Dict[str, str], Dict[str, int], List[str]]:
+        """
+        ({source: sha256} to index, {source: chunks already indexed} to resume,
+        [indexed sources to remove: deleted, changed or written by the old loader])
+        """
+        on_disk = scan(self.data_path)
+        self.stats["files"] = len(on_disk)
+        state = self.indexed()
+        orphans = state.pop(None, None)
+        if orphans:
+            logging.warning(f"{len(orphans['chunk_ids'])} points of {self.collection_name} have no source; "
+                            f"`--rebuild` removes them")
+        if not on_disk and state:
+            raise FileNotFoundError(f"No PDFs under '{self.data_path}'; refusing to remove all "
+                                    f"{len(state)} indexed files (use --rebuild to start over)")
+        removed = [source for source in state if source not in on_disk]
+        todo, resume = {}, {}
+        settings = (self.chunk_size, self.chunk_overlap)
+        for source, path in on_disk.items():
+            sha256 = file_hash(path)
+            todo[source] = sha256
+            entry = state.get(source)
+            if entry is None:
+                continue
+            if entry["hashes"] != {sha256} or entry["settings"] != {settings}:
+                removed.append(source)       # vectors of the previous version
+                continue
+            done = _indexed_prefix(entry["chunk_ids"])
+            if done == entry["chunks"]:
+                self.stats["unchanged"] += 1
+                del todo[source]
+            else:
+                resume[source] = done
+        return todo, resume, removed
+
+    def _index_file(self, source: str, sha256: str, chunks: List[Chunk], done: int) -> None:
+        if done:
+            self.stats["resumed_files"] += 1
+            logging.info(f"Resuming {source} at chunk {done}/{len(chunks)}")
+        for start in range(done, len(chunks), self.batch_size):
+            batch = chunks[start:start + self.batch_size]
+            self._index_batch(source, sha256, start, batch, len(chunks))
+            self.stats["chunks"] += len(batch)
+        self.stats["indexed_files"] += 1
+        logging.info(f"Indexed {source}: {len(chunks)} chunks")
+
+    def _parsed(self, todo: Dict[str, str]):
+        """(source, chunks) as each PDF finishes parsing, parsed in a process pool."""
+        paths = {source: os.path.join(self.data_path, source) for source in todo}
+        if self.workers <= 1:
+            for source, path in paths.items():
+                yield source, self.parse(path, self.chunk_size, self.chunk_overlap)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(self.parse, path, self.chunk_size, self.chunk_overlap): source
+                for source, path in paths.items()
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def run(self, dry_run: bool = False) -> Dict[str, int]:
+        todo, resume, removed = self.plan()
+        if dry_run:
+            self.stats.update(removed_files=len(set(removed) - set(todo)), to_index=len(todo))
+            return self.stats
+
+        self._prepare_collection()
+        for source in removed:
+            self._delete_source(source)
+            if source not in todo:     # else: the previous version of a changed PDF
+                self.stats["removed_files"] += 1
+        for source, chunks in self._parsed(todo):
+            self._index_file(source, todo[source], chunks, resume.get(source, 0))
+        return self.stats
+
+
+def ingest(vector_store, rebuild: bool = False, dry_run: bool = False, **options) -> Dict[str, int]:
+    """Index what changed under the data path; `rebuild` drops the collection first."""
+    ingestion = SchemeIngestion(vector_store, **options)
+    if rebuild and not dry_run:
+        vector_store.delete_collection(ingestion.collection_name)
+    return ingestion.run(dry_run=dry_run)
+
+
+def main(args) -> None:
+    from src.ai_component.modules.memory.vector_store import memory
+
+    counts = ingest(memory, rebuild=args.rebuild, dry_run=args.dry_run,
+                    data_path=args.data_path, workers=args.workers)
+    prefix = "[dry run] " if args.dry_run else ""
+    print(prefix + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+    logging.info(f"Scheme ingestion into {scheme_collection}: {counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path", default=scheme_data_path, help="directory searched for PDFs")
+    parser.add_argument("--workers", type=int, default=scheme_parse_workers, help="PDF parsing processes")
+    parser.add_argument("--rebuild", action="store_true", help="drop the collection and index everything")
+    parser.add_argument("--dry-run", action="store_true", help="count what would change without writing")
+    main(parser.parse_args())
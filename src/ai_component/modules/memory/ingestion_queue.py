@@ -0,0 +1,297 @@
+"""
+Background memory ingestion — keeps long-term memory writes off the response path.
+
+`MemoryIngestionNode` used to await `memory_manager.store_in_memory` (two LLM
+calls, an embedding, a Qdrant upsert and a store write) before the turn could
+finish.  The node now only enqueues the finished conversation; a small pool of
+in-process workers drains the bounded queue.
+
+Overload handling
+  * backpressure — with the "block" policy the producer waits up to
+    `ingestion_enqueue_timeout` for a free slot
+  * drop — when the queue is full the oldest job ("drop_oldest") or the new
+    job ("drop_new", and "block" after its timeout) is discarded
+  * degrade — once the queue is above `ingestion_degrade_watermark` of its
+    capacity, jobs skip the embedding and write summaries to the Postgres
+    store unindexed (`migrate_memory --to postgres` indexes them later)
+
+Batching — turns are buffered per thread and handed to the workers
+`memory_batch_size` at a time (or after `memory_batch_max_wait` seconds), so
+one structured LLM call summarises the whole batch instead of two calls per
+turn.  At most `ingestion_queue_size` turns are buffered across threads; past
+that the oldest thread's partial batch is flushed early, into the bounded
+queue and its overflow policy.
+
+Failed jobs are retried with exponential backoff.  `drain()` is called from
+the FastAPI lifespan so buffered and queued memories are flushed before
+shutdown.
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.ai_component.config import (
+    ingestion_queue_size,
+    ingestion_workers,
+    ingestion_max_retries,
+    ingestion_retry_backoff,
+    ingestion_overflow_policy,
+    ingestion_enqueue_timeout,
+    ingestion_degrade_watermark,
+    ingestion_drain_timeout,
+    memory_batch_size,
+    memory_batch_max_wait,
+)
+from src.ai_component.logger import logging
+from src.ai_component.metrics import QUEUE_DEPTH
+
+
+@dataclass
+class IngestionJob:
+    collection_name: str
+    conversations: List[str]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+    degraded: bool = False
+
+
+# handler(collection_name, conversations, index_vectors) -> stored?
+IngestionHandler = Callable[[str, List[str], bool], Awaitable[Optional[bool]]]
+
+
+class MemoryIngestionQueue:
+    """Bounded asyncio queue plus a worker pool for long-term memory writes."""
+
+    POLICIES = ("drop_oldest", "drop_new", "block")
+
+    def __init__(
+        self,
+        handler: Optional[IngestionHandler] = None,
+        maxsize: int = ingestion_queue_size,
+        workers: int = ingestion_workers,
+        max_retries: int = ingestion_max_retries,
+        retry_backoff: float = ingestion_retry_backoff,
+        overflow_policy: str = ingestion_overflow_policy,
+        enqueue_timeout: float = ingestion_enqueue_timeout,
+        degrade_watermark: float = ingestion_degrade_watermark,
+        batch_size: int = memory_batch_size,
+        batch_max_wait: float = memory_batch_max_wait,
+    ):
+        if overflow_policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy!r}; expected one of {self.POLICIES}")
+        self._handler = handler
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout
+        self.degrade_watermark = degrade_watermark
+        self.batch_size = batch_size
+        self.batch_max_wait = batch_max_wait
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[Tuple[str, str], List[str]] = {}     # (collection, thread) -> buffered turns
+        self._buffered = 0                                        # turns across all of _pending
+        self._timers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._closing = False
+        self.stats: Dict[str, float] = {
+            "enqueued": 0, "batches": 0, "processed": 0, "stored": 0, "skipped": 0, "failed": 0,
+            "retried": 0, "dropped": 0, "degraded": 0, "max_depth": 0, "total_latency": 0.0,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle                                                          #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop. Safe to call repeatedly."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._closing = False
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"memory-ingestion-{i}")
+            for i in range(self.workers)
+        ]
+        logging.info(f"Memory ingestion queue started with {self.workers} workers (size {self.maxsize})")
+
+    async def drain(self, timeout: float = ingestion_drain_timeout) -> None:
+        """Stop accepting jobs, wait for queued ones to finish, then stop the workers."""
+        if not self.running:
+            return
+        self._closing = True
+        for key in list(self._pending):
+            await self._flush(key)
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            logging.info("Memory ingestion queue drained")
+        except asyncio.TimeoutError:
+            logging.warning(f"Memory ingestion drain timed out with {self._queue.qsize()} jobs left")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ------------------------------------------------------------------ #
+    #  Producer                                                           #
+    # ------------------------------------------------------------------ #
+
+    async def submit(self, collection_name: str, conversation: str, thread_id: Optional[str] = None) -> bool:
+        """Enqueue a conversation turn for ingestion. Returns False if it was dropped."""
+        if self._closing:
+            logging.warning("Memory ingestion queue is draining; dropping job")
+            self.stats["dropped"] += 1
+            return False
+        self.start()
+        self.stats["enqueued"] += 1
+
+        if self.batch_size <= 1:
+            return await self._enqueue(collection_name, [conversation])
+
+        key = (collection_name, thread_id or collection_name)
+        buffer = self._pending.setdefault(key, [])
+        buffer.append(conversation)
+        self._buffered += 1
+        if len(buffer) >= self.batch_size:
+            return await self._flush(key)
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+        while self._buffered > self.maxsize:
+            # Buffered turns count toward the limit: the oldest partial batch goes to the queue now
+            oldest = next(iter(self._pending))
+            if not await self._flush(oldest) and oldest == key:
+                return False
+        return True
+
+    async def _flush_later(self, key: Tuple[str, str]) -> None:
+        await asyncio.sleep(self.batch_max_wait)
+        await self._flush(key)
+
+    async def _flush(self, key: Tuple[str, str]) -> bool:
+        """Hand a thread's buffered turns to the workers as one batch."""
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        conversations = self._pending.pop(key, [])
+        self._buffered -= len(conversations)
+        if not conversations:
+            return True
+        return await self._enqueue(key[0], conversations)
+
+    async def _enqueue(self, collection_name: str, conversations: List[str]) -> bool:
+        job = IngestionJob(collection_name=collection_name, conversations=conversations)
+        if self._queue.qsize() >= self.degrade_watermark * self.maxsize:
+            job.degraded = True
+            self.stats["degraded"] += 1
+
+        if not await self._put(job):
+            self.stats["dropped"] += len(conversations)
+            logging.warning(f"Memory ingestion queue full; dropped {len(conversations)} turns for {collection_name}")
+            return False
+
+        self.stats["batches"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+        return True
+
+    async def _put(self, job: IngestionJob) -> bool:
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow_policy == "drop_oldest":
+            try:
+                dropped = self._queue.get_nowait()
+                self._queue.task_done()
+                self.stats["dropped"] += len(dropped.conversations)
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(job)
+            return True
+
+        if self.overflow_policy == "block":
+            try:
+                await asyncio.wait_for(self._queue.put(job), timeout=self.enqueue_timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+        return False
+
+    # ------------------------------------------------------------------ #
+    #  Consumers                                                          #
+    # ------------------------------------------------------------------ #
+
+    async def _handle(self, job: IngestionJob) -> Optional[bool]:
+        if self._handler is not None:
+            return await self._handler(job.collection_name, job.conversations, not job.degraded)
+
+        from src.ai_component.modules.memory.memory_manager import memory_manager
+        if self.batch_size <= 1:
+            return await memory_manager.store_in_memory(job.collection_name, job.conversations[0], not job.degraded)
+        return await memory_manager.store_batch(job.collection_name, job.conversations, not job.degraded)
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: IngestionJob) -> None:
+        while True:
+            job.attempts += 1
+            try:
+                stored = await self._handle(job)
+                self.stats["processed"] += 1
+                self.stats["stored" if stored else "skipped"] += 1
+                self.stats["total_latency"] += time.monotonic() - job.enqueued_at
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if job.attempts > self.max_retries:
+                    self.stats["failed"] += 1
+                    logging.error(
+                        f"Memory ingestion for {job.collection_name} failed after "
+                        f"{job.attempts} attempts: {str(e)}"
+                    )
+                    return
+                self.stats["retried"] += 1
+                delay = self.retry_backoff * (2 ** (job.attempts - 1))
+                logging.warning(f"Memory ingestion attempt {job.attempts} failed, retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------ #
+    #  Metrics                                                            #
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        stats["depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["buffered"] = self._buffered
+        stats["workers"] = len(self._tasks)
+        total_latency = stats.pop("total_latency")
+        stats["avg_latency_s"] = round(total_latency / stats["processed"], 3) if stats["processed"] else 0.0
+        return stats
+
+
+memory_ingestion_queue = MemoryIngestionQueue()
+
+# Sampled at scrape time: queued jobs, and turns still buffered per thread
+QUEUE_DEPTH.labels("memory_ingestion").set_function(
+    lambda: memory_ingestion_queue._queue.qsize() if memory_ingestion_queue._queue is not None else 0
+)
+QUEUE_DEPTH.labels("memory_batch_buffer").set_function(
+    lambda: memory_ingestion_queue._buffered
+)
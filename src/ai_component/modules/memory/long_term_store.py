@@ -0,0 +1,126 @@
+"""
+Long-term memory: per-user conversation summaries, ranked by relevance.
+
+Summaries used to be written twice — to `AsyncPostgresStore` under
+("long_term", user) and to the user's Qdrant collection — while the context
+node read them back with `store.asearch(query=...)` from a store that had no
+embedding index, i.e. an unranked scan.  One backend now holds them,
+selected by `long_term_memory_backend`:
+
+  * "postgres" — the LangGraph store, created with a pgvector index on
+    `summary` (`store_index_config()`); a turn does one batched write and
+    one ranked `asearch`
+  * "qdrant"   — the user's tenant of the shared Qdrant memory collection,
+    points typed "conversation_summary"
+
+`migrate_memory` moves existing summaries between the two.
+"""
+
+from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langgraph.store.base import BaseStore, PutOp
+
+from src.ai_component.config import long_term_memory_backend, long_term_memory_dims, long_term_memory_limit
+from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.modules.memory.vector_writer import vector_writer
+from src.ai_component.logger import logging
+
+LONG_TERM_BACKENDS = ("postgres", "qdrant")
+NAMESPACE_ROOT = "long_term"
+SUMMARY_TYPE = "conversation_summary"
+
+
+def namespace(collection_name: str) -> Tuple[str, str]:
+    """Store namespace of one user's summaries."""
+    return (NAMESPACE_ROOT, collection_name)
+
+
+class LazyEmbeddings(Embeddings):
+    """Defers to `memory.embeddings`, so creating the store does not build the embedding client."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return memory.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return memory.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await memory.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await memory.embeddings.aembed_query(text)
+
+
+def store_index_config(backend: str = long_term_memory_backend) -> Optional[Dict[str, Any]]:
+    """`AsyncPostgresStore` index: pgvector over `summary` under "postgres", none otherwise."""
+    if backend != "postgres":
+        return None
+    return {"dims": long_term_memory_dims, "embed": LazyEmbeddings(), "fields": ["summary"]}
+
+
+async def _graph_store() -> BaseStore:
+    from src.ai_component.graph.graph import get_store   # graph imports this module
+    return await get_store()
+
+
+class PostgresLongTermStore:
+    """Summaries in the vector-indexed LangGraph store."""
+
+    def __init__(self, get_store: Callable[[], Awaitable[BaseStore]] = _graph_store):
+        self._get_store = get_store
+
+    async def put(self, collection_name: str, summaries: List[str], index: bool = True) -> None:
+        """
+        One batched write.  `index=False` (ingestion queue under load) skips
+        the embedding: the summary is kept but not found by ranked search
+        until `migrate_memory --to postgres` indexes it.
+        """
+        store = await self._get_store()
+        await store.abatch([
+            PutOp(namespace(collection_name), str(uuid4()), {"summary": s}, index=None if index else False)
+            for s in summaries
+        ])
+        logging.info(f"{len(summaries)} summaries stored in AsyncPostgresStore for {collection_name}")
+
+    async def search(self, collection_name: str, query: str, limit: int = long_term_memory_limit) -> List[str]:
+        """The user's summaries most relevant to `query`, best first."""
+        store = await self._get_store()
+        results = await store.asearch(namespace(collection_name), query=query, limit=limit)
+        return [r.value["summary"] for r in results if r.value.get("summary")]
+
+
+class QdrantLongTermStore:
+    """Summaries as typed points of the user's tenant in the Qdrant memory collection (PII-free metadata)."""
+
+    def __init__(self, vector_store=memory, get_store: Callable[[], Awaitable[BaseStore]] = _graph_store,
+                 writer=vector_writer):
+        self.vector_store = vector_store
+        self.writer = writer
+        self._fallback = PostgresLongTermStore(get_store)
+
+    async def put(self, collection_name: str, summaries: List[str], index: bool = True) -> None:
+        if not index:
+            # Shedding Qdrant load: keep the summary in the Postgres store until it is migrated
+            await self._fallback.put(collection_name, summaries, index=False)
+            return
+        # Embedded and upserted with other users' summaries in the next batch
+        await self.writer.add_memories(tenant=collection_name, data=summaries, doc_type=SUMMARY_TYPE)
+        logging.info(f"{len(summaries)} summaries buffered for Qdrant for {collection_name}")
+
+    async def search(self, collection_name: str, query: str, limit: int = long_term_memory_limit) -> List[str]:
+        docs = await self.vector_store.asearch_memories(query, collection_name, limit, doc_type=SUMMARY_TYPE)
+        return [doc.page_content for doc, _score in docs if doc.page_content]
+
+
+def make_long_term_store(backend: str = long_term_memory_backend):
+    """The long-term store for `backend` ("postgres" or "qdrant")."""
+    if backend == "postgres":
+        return PostgresLongTermStore()
+    if backend == "qdrant":
+        return QdrantLongTermStore()
+    raise ValueError(f"Unknown long-term memory backend '{backend}' (expected one of {', '.join(LONG_TERM_BACKENDS)})")
+
+
+long_term_store = make_long_term_store()
@@ -1,38 +1,22 @@
 import sys
-from uuid import uuid4
-from src.ai_component.modules.memory.vector_store import memory
-from src.ai_component.llm import LLMChainFactory
+from src.ai_component.modules.memory.long_term_store import long_term_store
+from src.ai_component.graph.utils.chains import chain_registry, MemoryAnalysis1, MemoryAnalysis2
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
-from src.ai_component.core.prompts import Template
-from src.ai_component.config import default_model
-from langchain.prompts import PromptTemplate
-from pydantic import BaseModel, Field
-from typing import Literal
-
-
-class MemoryAnalysis1(BaseModel):
-    is_important: Literal['Yes', 'No'] = Field(..., description="Is these conversation is important to store or not")
-
-class MemoryAnalysis2(BaseModel):
-    summary: str = Field(..., description="The short summary of the conversation between user and LLM")
+from typing import List, Literal
 
 
 class MemoryManager:
     def __init__(self):
-        self.vector_store = memory
-        self.llm = LLMChainFactory(model_type=default_model)
+        self.long_term_store = long_term_store
+        self.chains = chain_registry
         self.output_schema1 = MemoryAnalysis1
         self.output_schema2 = MemoryAnalysis2
 
     async def _should_store(self, conversation: str) -> Literal["Yes", "No"]:
         """Tell that weather to store the conversation in the memory or not"""
         try:
-            prompt = PromptTemplate(
-                input_variables=["conversation"],
-                template=Template.memory_template1
-            )
-            chain = await self.llm.get_structured_llm_chain_async(prompt=prompt, output_schema=self.output_schema1)
+            chain = await self.chains.get("memory.importance")
             response = await chain.ainvoke({"conversation": conversation})
             return response.is_important
         except CustomException as e:
@@ -50,20 +34,37 @@ class MemoryManager:
                 return None
 
             logging.info("Getting summary of conversation")
-            prompt = PromptTemplate(
-                input_variables=["conversation"],
-                template=Template.memory_template2
-            )
-            chain = await self.llm.get_structured_llm_chain_async(prompt=prompt, output_schema=self.output_schema2)
+            chain = await self.chains.get("memory.summary")
             response = await chain.ainvoke({"conversation": conversation})
             return response.summary
         except CustomException as e:
             logging.error(f"Error in generating summary: {str(e)}")
             raise CustomException(e, sys) from e
 
-    async def store_in_memory(self, collection_name: str, conversation: str):
-        """Store the conversation summary in the long-term store (AsyncPostgresStore) and
-        the embedding in Qdrant Cloud for vector search.  PII is never written to Qdrant.
+    async def _summarize_batch(self, conversations: List[str]) -> List[str]:
+        """
+        Importance and summary for several turns in one structured call.
+        Returns the summaries of the important turns, in input order.
+        """
+        try:
+            logging.info(f"Summarising {len(conversations)} turns in one call")
+            numbered = "\n\n".join(f"Turn {i}:\n{c}" for i, c in enumerate(conversations, start=1))
+            chain = await self.chains.get("memory.batch")
+            response = await chain.ainvoke({"conversations": numbered})
+            by_turn = {t.turn: t for t in response.turns}
+            return [
+                by_turn[i].summary.strip()
+                for i in range(1, len(conversations) + 1)
+                if i in by_turn and by_turn[i].is_important == "Yes" and by_turn[i].summary.strip()
+            ]
+        except CustomException as e:
+            logging.error(f"Error in generating batch summary: {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def store_in_memory(self, collection_name: str, conversation: str, index_vectors: bool = True):
+        """Store the conversation summary in the long-term store (`long_term_memory_backend`).
+        With index_vectors=False (ingestion queue under load) the summary is kept without
+        an embedding.
         """
         try:
             logging.info("Checking if conversation should be stored")
@@ -73,44 +74,37 @@ class MemoryManager:
                 logging.info("Conversation not important enough to store")
                 return False
 
-            # ------------------------------------------------------------------
-            # 1. Write durable summary to AsyncPostgresStore (Neon Postgres)
-            #    namespace = ("long_term", collection_name) ensures per-user isolation.
-            # ------------------------------------------------------------------
-            try:
-                from src.ai_component.graph.graph import get_store
-                store = await get_store()
-                if store is not None:
-                    namespace = ("long_term", collection_name)
-                    await store.aput(namespace, str(uuid4()), {"summary": summary})
-                    logging.info(f"Summary stored in AsyncPostgresStore for namespace {namespace}")
-                else:
-                    logging.warning("AsyncPostgresStore not available; skipping long-term store write")
-            except Exception as e:
-                logging.error(f"Failed to write to AsyncPostgresStore: {str(e)}")
-                # Do not raise — fall through to Qdrant write so embeddings still work
+            await self._write_summaries(collection_name, [summary], index_vectors)
+            return True
+        except CustomException as e:
+            logging.error(f"Error in storing the conversation {str(e)}")
+            raise CustomException(e, sys) from e
 
-            # ------------------------------------------------------------------
-            # 2. Write embedding to Qdrant Cloud for vector similarity search.
-            #    Only allowed metadata fields are written; NO PII.
-            # ------------------------------------------------------------------
-            try:
-                # PII-free metadata — phone, name, user_id, age, address are intentionally excluded
-                safe_metadata = {"type": "conversation_summary"}
-                result = self.vector_store.ingest_data(
-                    collection_name=collection_name,
-                    data=summary,
-                    additional_metadata=safe_metadata
-                )
-                logging.info("Embedding stored in Qdrant Cloud successfully")
-            except Exception as e:
-                logging.error(f"Failed to write to Qdrant: {str(e)}")
-                # Qdrant is best-effort; long-term store write above is the source of truth
+    async def store_batch(self, collection_name: str, conversations: List[str], index_vectors: bool = True):
+        """Batched variant of store_in_memory: one LLM call for all turns and
+        one bulk write to the long-term store.
+        """
+        try:
+            summaries = await self._summarize_batch(conversations)
+            if not summaries:
+                logging.info(f"None of {len(conversations)} turns important enough to store")
+                return False
 
+            await self._write_summaries(collection_name, summaries, index_vectors)
             return True
         except CustomException as e:
-            logging.error(f"Error in storing the conversation {str(e)}")
+            logging.error(f"Error in storing the conversation batch {str(e)}")
             raise CustomException(e, sys) from e
 
+    async def _write_summaries(self, collection_name: str, summaries: List[str], index_vectors: bool) -> None:
+        # One write to the configured long-term store (pgvector-indexed Postgres store or Qdrant),
+        # keyed per user; only the summary text is written, no PII metadata.
+        # A failure is raised so the ingestion queue retries the job.
+        try:
+            await self.long_term_store.put(collection_name, summaries, index=index_vectors)
+        except Exception as e:
+            logging.error(f"Failed to write long-term memory: {str(e)}")
+            raise
+
 
 memory_manager = MemoryManager()
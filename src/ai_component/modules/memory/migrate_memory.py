@@ -0,0 +1,151 @@
+"""
+Move long-term memory summaries between the Postgres store and Qdrant.
+
+    python -m src.ai_component.modules.memory.migrate_memory --to postgres [--prune-qdrant] [--dry-run]
+    python -m src.ai_component.modules.memory.migrate_memory --to qdrant [--dry-run]
+
+--to postgres  re-puts every summary already in the store through the
+               pgvector index (summaries written before the index existed,
+               or while ingestion was degraded, have no embedding and are
+               invisible to ranked search), then adds summaries that only
+               made it into Qdrant.  --prune-qdrant afterwards deletes the
+               "conversation_summary" points, ending the dual copy.
+--to qdrant    ingests store summaries missing from each user's tenant of the
+               shared memory collection.
+
+Summaries are matched by text, so the tool can be re-run safely.
+"""
+
+import asyncio
+import hashlib
+import argparse
+from typing import Dict, List
+
+from langgraph.store.base import BaseStore, PutOp
+
+from src.ai_component.config import memory_collection
+from src.ai_component.modules.memory.long_term_store import (
+    NAMESPACE_ROOT, SUMMARY_TYPE, namespace, store_index_config,
+)
+from src.ai_component.logger import logging
+
+PAGE_SIZE = 100
+MAX_ITEMS_PER_USER = 100_000
+
+
+async def store_summaries(store: BaseStore) -> Dict[str, Dict[str, str]]:
+    """{user collection: {key: summary}} for everything under the long-term namespace."""
+    users, offset = [], 0
+    while True:
+        page = await store.alist_namespaces(prefix=(NAMESPACE_ROOT,), max_depth=2, limit=PAGE_SIZE, offset=offset)
+        # With psycopg 3.3 the Postgres store returns text columns as bytes and
+        # clips the namespace root; only the user part is relied on.
+        users.extend(ns[-1] for ns in page if len(ns) == 2)
+        if len(page) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+
+    summaries: Dict[str, Dict[str, str]] = {}
+    for user in users:
+        # One read per user: batched puts share an updated_at, so offset pages are not stable
+        items = await store.asearch(namespace(user), limit=MAX_ITEMS_PER_USER)
+        summaries[user] = {
+            item.key.decode() if isinstance(item.key, bytes) else item.key: item.value["summary"]
+            for item in items if item.value.get("summary")
+        }
+    return summaries
+
+
+def qdrant_summaries(vector_store) -> Dict[str, List[str]]:
+    """{user collection: [summary]} for every "conversation_summary" point in the memory collection."""
+    vector_store.ensure_memory_collection()
+    type_filter = vector_store._memory_filter(doc_type=SUMMARY_TYPE)
+    summaries: Dict[str, List[str]] = {}
+    offset = None
+    while True:
+        points, offset = vector_store.client.scroll(
+            collection_name=memory_collection, scroll_filter=type_filter,
+            limit=PAGE_SIZE, offset=offset, with_payload=True, with_vectors=False,
+        )
+        for point in points:
+            tenant = (point.payload.get("metadata") or {}).get("tenant")
+            if tenant and point.payload.get("page_content"):
+                summaries.setdefault(tenant, []).append(point.payload["page_content"])
+        if offset is None:
+            break
+    return summaries
+
+
+async def migrate_to_postgres(store: BaseStore, qdrant: Dict[str, List[str]], dry_run: bool = False) -> Dict[str, int]:
+    """Index every store summary and add Qdrant-only ones; `store` must be created with the index."""
+    existing = await store_summaries(store)
+    ops = []
+    for collection_name, items in existing.items():
+        ops.extend(PutOp(namespace(collection_name), key, {"summary": s}) for key, s in items.items())
+    reindexed = len(ops)
+
+    for collection_name, texts in qdrant.items():
+        known = set(existing.get(collection_name, {}).values())
+        for text in dict.fromkeys(texts):
+            if text not in known:
+                ops.append(PutOp(namespace(collection_name), _key(collection_name, text), {"summary": text}))
+
+    if not dry_run:
+        for start in range(0, len(ops), PAGE_SIZE):
+            await store.abatch(ops[start:start + PAGE_SIZE])   # one embedding call per batch
+    return {"reindexed": reindexed, "copied_from_qdrant": len(ops) - reindexed}
+
+
+async def migrate_to_qdrant(store: BaseStore, vector_store, qdrant: Dict[str, List[str]],
+                            dry_run: bool = False) -> Dict[str, int]:
+    """Ingest store summaries that are not yet points of the user's tenant."""
+    copied = 0
+    for collection_name, items in (await store_summaries(store)).items():
+        known = set(qdrant.get(collection_name, []))
+        missing = [s for s in dict.fromkeys(items.values()) if s not in known]
+        if missing and not dry_run:
+            await asyncio.to_thread(
+                vector_store.add_memories, tenant=collection_name, data=missing, doc_type=SUMMARY_TYPE,
+            )
+        copied += len(missing)
+    return {"copied_to_qdrant": copied}
+
+
+def _key(collection_name: str, text: str) -> str:
+    """Deterministic key, so a re-run overwrites instead of duplicating."""
+    return hashlib.sha256(f"{collection_name}\n{text}".encode("utf-8")).hexdigest()[:32]
+
+
+async def main(args) -> None:
+    from langgraph.store.postgres.aio import AsyncPostgresStore
+    from src.ai_component.modules.memory.vector_store import memory
+    from src.database.pool import get_pool, close_pool
+
+    try:
+        store = AsyncPostgresStore(conn=await get_pool(), index=store_index_config(args.to))
+        await store.setup()   # idempotent; adds the vector tables when indexing
+        qdrant = await asyncio.to_thread(qdrant_summaries, memory)
+
+        if args.to == "postgres":
+            counts = await migrate_to_postgres(store, qdrant, dry_run=args.dry_run)
+            if args.prune_qdrant and not args.dry_run:
+                for collection_name in qdrant:
+                    await asyncio.to_thread(memory.delete_memories, tenant=collection_name, doc_type=SUMMARY_TYPE)
+                counts["pruned_tenants"] = len(qdrant)
+        else:
+            counts = await migrate_to_qdrant(store, memory, qdrant, dry_run=args.dry_run)
+
+        prefix = "[dry run] " if args.dry_run else ""
+        print(prefix + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+        logging.info(f"Long-term memory migration to {args.to}: {counts}")
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--to", choices=("postgres", "qdrant"), required=True, help="backend to migrate into")
+    parser.add_argument("--prune-qdrant", action="store_true",
+                        help="with --to postgres, delete the summary points from Qdrant afterwards")
+    parser.add_argument("--dry-run", action="store_true", help="count what would move without writing")
+    asyncio.run(main(parser.parse_args()))
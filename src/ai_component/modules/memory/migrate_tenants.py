@@ -0,0 +1,122 @@
+"""
+Move the old per-user Qdrant collections into the shared memory collection.
+
+    python -m src.ai_component.modules.memory.migrate_tenants [--drop-legacy] [--dry-run]
+
+Every collection other than `memory_collection` and the shared document
+collections holds one user's memory and is named after the user's
+unique_name, which becomes the points' `metadata.tenant`.  Points are copied
+with their vectors (nothing is re-embedded) under ids derived from the legacy
+collection and point id, so the tool runs while the app keeps serving and can
+be re-run: a re-run overwrites what it copied before and picks up points an
+older process was still writing to a legacy collection.
+
+A legacy profile is not copied when the tenant already has one in the memory
+collection — the seeder wrote a newer version after an edit.  --drop-legacy
+deletes each legacy collection once all of its points have been copied.
+"""
+
+import uuid
+import argparse
+from typing import Dict, List
+
+from src.ai_component.config import memory_collection, shared_collections
+from src.ai_component.modules.memory.profile_seeder import PROFILE_TYPE
+from src.ai_component.logger import logging
+
+PAGE_SIZE = 256
+
+# Namespace of the deterministic ids given to copied points
+_ID_NAMESPACE = uuid.UUID("6f1c2b8e-4a4d-4d7e-9a51-3b0c7e2f9d10")
+
+
+def legacy_collections(vector_store) -> List[str]:
+    """Names of the per-user collections still to migrate."""
+    skip = {memory_collection, *shared_collections}
+    return [name for name in vector_store._list_collection() if name not in skip]
+
+
+def _point_id(collection_name: str, point_id) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, f"{collection_name}/{point_id}"))
+
+
+def _has_profile(vector_store, tenant: str, copied_ids: set) -> bool:
+    """Whether the tenant has a profile in the memory collection that this tool did not copy."""
+    points, _ = vector_store.client.scroll(
+        collection_name=memory_collection, scroll_filter=vector_store._memory_filter(tenant, PROFILE_TYPE),
+        limit=PAGE_SIZE, with_payload=False, with_vectors=False,
+    )
+    return any(str(p.id) not in copied_ids for p in points)
+
+
+def migrate_collection(vector_store, collection_name: str, dry_run: bool = False) -> Dict[str, int]:
+    """Copy one legacy collection into the memory collection as tenant `collection_name`."""
+    from qdrant_client.models import PointStruct
+
+    pages, offset = [], None
+    while True:
+        points, offset = vector_store.client.scroll(
+            collection_name=collection_name, limit=PAGE_SIZE, offset=offset, with_payload=True, with_vectors=True,
+        )
+        pages.append(points)
+        if offset is None:
+            break
+
+    profile_ids = {
+        _point_id(collection_name, p.id) for page in pages for p in page
+        if (p.payload.get("metadata") or {}).get("type") == PROFILE_TYPE
+    }
+    skip_profiles = _has_profile(vector_store, collection_name, profile_ids)
+
+    copied = skipped = 0
+    for points in pages:
+        batch = []
+        for point in points:
+            metadata = dict(point.payload.get("metadata") or {})
+            if skip_profiles and metadata.get("type") == PROFILE_TYPE:
+                skipped += 1
+                continue
+            metadata.pop("collection", None)
+            metadata["tenant"] = collection_name
+            batch.append(PointStruct(
+                id=_point_id(collection_name, point.id),
+                vector=point.vector,
+                payload={**point.payload, "metadata": metadata},
+            ))
+        if batch and not dry_run:
+            vector_store.client.upsert(collection_name=memory_collection, points=batch, wait=True)
+        copied += len(batch)
+    return {"copied": copied, "skipped_profiles": skipped}
+
+
+def migrate(vector_store, drop_legacy: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """Copy every legacy collection; with `drop_legacy`, delete each one after its copy succeeds."""
+    vector_store.ensure_memory_collection()
+    totals = {"collections": 0, "copied": 0, "skipped_profiles": 0, "dropped": 0}
+    for collection_name in legacy_collections(vector_store):
+        counts = migrate_collection(vector_store, collection_name, dry_run=dry_run)
+        logging.info(f"Migrated {collection_name} into {memory_collection}: {counts}")
+        totals["collections"] += 1
+        totals["copied"] += counts["copied"]
+        totals["skipped_profiles"] += counts["skipped_profiles"]
+        if drop_legacy and not dry_run:
+            vector_store.delete_collection(collection_name)
+            totals["dropped"] += 1
+    return totals
+
+
+def main(args) -> None:
+    from src.ai_component.modules.memory.vector_store import memory
+
+    counts = migrate(memory, drop_legacy=args.drop_legacy, dry_run=args.dry_run)
+    prefix = "[dry run] " if args.dry_run else ""
+    print(prefix + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+    logging.info(f"Tenant migration into {memory_collection}: {counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--drop-legacy", action="store_true",
+                        help="delete each per-user collection after it has been copied")
+    parser.add_argument("--dry-run", action="store_true", help="count what would move without writing")
+    main(parser.parse_args())
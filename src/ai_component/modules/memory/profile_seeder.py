@@ -0,0 +1,125 @@
+"""
+Once-per-profile-version seeding of the user profile into the vector store.
+
+UserNode used to run an existence query, a collection check and a similarity
+search against Qdrant on every message just to find out that the profile was
+already there.  The seeder instead hashes the profile text and stores the hash
+on the `users` row; a profile is (re)ingested only when that hash changes, and
+an in-process cache means a warm turn does no Postgres or Qdrant work at all.
+Deleting an account deletes its profile vector.
+"""
+
+import sys
+import asyncio
+import hashlib
+import weakref
+from typing import Dict, Optional
+
+from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.logger import logging
+from src.ai_component.exception import CustomException
+from src.database.database import user_db
+
+PROFILE_TYPE = "user_profile"
+
+
+def build_profile_text(unique_name: str, user_data: dict) -> str:
+    """The profile document ingested as the user's memory."""
+    return f"""
+    User: {user_data.get("full_name") or unique_name} ({unique_name})
+    Age: {user_data.get("age")}
+    Location: {user_data.get("city") or ''}, {user_data.get("district") or ''}, {user_data.get("state") or ''}, {user_data.get("country") or ''}
+    Address: {user_data.get("resident") or 'Not provided'}
+    """.strip()
+
+
+def coarse_location(user_data: dict) -> str:
+    """'state/district' in lower case — coarse enough to share cached answers."""
+    parts = [(user_data.get(k) or "").strip().lower() for k in ("state", "district")]
+    return "/".join(p for p in parts if p)
+
+
+def profile_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ProfileSeeder:
+    """Seeds each user's profile vector once per profile version."""
+
+    def __init__(self):
+        self.vector_store = memory
+        self._seeded: Dict[str, str] = {}          # unique_name -> seeded hash
+        self._locations: Dict[str, str] = {}       # unique_name -> coarse location
+        # Only users being seeded right now hold a lock; the map does not grow with the user base
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def location(self, unique_name: str) -> str:
+        return self._locations.get(unique_name, "")
+
+    def invalidate(self, unique_name: str) -> None:
+        """Forget the cached version so the next turn re-checks the database."""
+        self._seeded.pop(unique_name, None)
+
+    async def ensure_seeded(self, unique_name: str) -> bool:
+        """
+        Make sure the current profile is in the vector store.
+
+        Returns False when the user does not exist.
+        """
+        if unique_name in self._seeded:
+            return True
+
+        lock = self._locks.get(unique_name)
+        if lock is None:
+            lock = self._locks[unique_name] = asyncio.Lock()
+        async with lock:
+            if unique_name in self._seeded:
+                return True
+            user_data = await user_db.get_user_by_unique_name(unique_name)
+            if not user_data:
+                return False
+            await self.seed(unique_name, user_data)
+            return True
+
+    async def reseed(self, unique_name: str) -> None:
+        """Re-check a profile after it was edited; ingests only if it changed."""
+        try:
+            self.invalidate(unique_name)
+            await self.ensure_seeded(unique_name)
+        except Exception as e:
+            logging.error(f"Error reseeding profile for {unique_name}: {e}")
+
+    async def delete_profile(self, unique_name: str) -> None:
+        """Remove the profile vector and cached state of a deleted account."""
+        self.invalidate(unique_name)
+        self._locations.pop(unique_name, None)
+        try:
+            await self.vector_store.adelete_memories(tenant=unique_name, doc_type=PROFILE_TYPE)
+        except Exception as e:
+            logging.error(f"Error deleting profile vector for {unique_name}: {e}")
+
+    async def seed(self, unique_name: str, user_data: dict) -> Optional[str]:
+        """Ingest the profile if its hash differs from the one stored on the user row."""
+        try:
+            text = build_profile_text(unique_name, user_data)
+            digest = profile_hash(text)
+            if user_data.get("profile_hash") == digest:
+                logging.info(f"Profile for {unique_name} already seeded")
+            else:
+                logging.info(f"Seeding profile version {digest[:8]} for {unique_name}")
+                await self._replace_profile(unique_name, text)
+                await user_db.set_profile_hash(unique_name, digest)
+            self._seeded[unique_name] = digest
+            self._locations[unique_name] = coarse_location(user_data)
+            return digest
+        except CustomException as e:
+            logging.error(f"Error in seeding profile : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def _replace_profile(self, unique_name: str, text: str) -> None:
+        """Drop the previous profile vector and ingest the new one."""
+        await self.vector_store.adelete_memories(tenant=unique_name, doc_type=PROFILE_TYPE)
+        await self.vector_store.aadd_memories(tenant=unique_name, data=text, doc_type=PROFILE_TYPE)
+
+
+profile_seeder = ProfileSeeder()
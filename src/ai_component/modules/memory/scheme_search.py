@@ -0,0 +1,232 @@
+"""
+Hybrid (BM25 + vector) retrieval over the government scheme collection.
+
+Dense vectors match the meaning of a question but miss the exact terms scheme
+questions are full of — "PMFBY", "KCC", "soil health card".  `SchemeRetriever`
+keeps an in-process BM25 index over the same chunks the indexer wrote
+(`ingest_schemes`) and fuses both rankings with reciprocal rank fusion:
+
+    score(chunk) = Σ  1 / (scheme_rrf_k + rank in that ranking)
+
+  * the index is loaded at startup with one paged scroll of the collection,
+    built in a worker thread; finding any point is also the readiness check,
+    so a query costs one Qdrant round trip (the vector search) instead of two
+  * after `scheme_index_refresh` seconds the index is reloaded in the
+    background while the old one keeps serving; an empty collection is
+    checked again after `scheme_not_ready_recheck` seconds
+  * if the vector search fails the BM25 ranking is served on its own
+"""
+
+import re
+import math
+import time
+import asyncio
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.schema import Document
+
+from src.ai_component.config import (
+    scheme_collection,
+    scheme_search_candidates,
+    scheme_rrf_k,
+    scheme_index_refresh,
+    scheme_not_ready_recheck,
+)
+from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.logger import logging
+
+PAGE_SIZE = 256
+
+# Function words that only dilute BM25 scores of scheme questions
+STOP_WORDS = frozenset("""
+a an and are as at be by can do does for from how i in is it me my of on or
+the to what when where which who will with about under scheme schemes
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric terms minus stop words; 'PM-KISAN' → ['pm', 'kisan']."""
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in STOP_WORDS]
+
+
+def _key(doc: Document) -> Tuple:
+    """Identity of a chunk across the two rankings."""
+    meta = doc.metadata or {}
+    if "source" in meta and "chunk" in meta:
+        return meta["source"], meta["chunk"]
+    return (doc.page_content,)
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of Documents."""
+
+    def __init__(self, documents: Sequence[Document], k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        for i, doc in enumerate(self.documents):
+            terms = Counter(tokenize(doc.page_content))
+            self._lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, []).append((i, frequency))
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _idf(self, term: str) -> float:
+        matches = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - matches + 0.5) / (matches + 0.5))
+
+    def search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """[(Document, score)] best first; only documents sharing a term with the query."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf(term)
+            for i, frequency in self._postings.get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._average_length or 1))
+                scores[i] = scores.get(i, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.documents[i], score) for i, score in best]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Tuple[Document, float]]], k: int,
+                           rrf_k: int = scheme_rrf_k) -> List[Tuple[Document, float]]:
+    """Fuse several best-first rankings; returns the top `k` as [(Document, RRF score)]."""
+    fused: Dict[Tuple, float] = {}
+    documents: Dict[Tuple, Document] = {}
+    for ranking in rankings:
+        for rank, (doc, _score) in enumerate(ranking, 1):
+            key = _key(doc)
+            documents.setdefault(key, doc)
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank)
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(documents[key], score) for key, score in best]
+
+
+class SchemeRetriever:
+    """BM25 + vector search of one collection, with a cached readiness check."""
+
+    def __init__(
+        self,
+        vector_store=memory,
+        collection_name: str = scheme_collection,
+        candidates: int = scheme_search_candidates,
+        refresh: float = scheme_index_refresh,
+        not_ready_recheck: float = scheme_not_ready_recheck,
+    ):
+        self.vector_store = vector_store
+        self.collection_name = collection_name
+        self.candidates = candidates
+        self.refresh = refresh
+        self.not_ready_recheck = not_ready_recheck
+        self._index: Optional[BM25Index] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"loads": 0, "queries": 0, "vector_errors": 0}
+
+    # ------------------------------------------------------------------ #
+    #  Index                                                              #
+    # ------------------------------------------------------------------ #
+
+    async def _scroll(self) -> List[Document]:
+        documents: List[Document] = []
+        if not await self.vector_store._acollection_exists(self.collection_name):
+            return documents
+        offset = None
+        while True:
+            points, offset = await self.vector_store.async_client.scroll(
+                collection_name=self.collection_name, limit=PAGE_SIZE, offset=offset,
+                with_payload=True, with_vectors=False,
+            )
+            documents.extend(
+                Document(page_content=point.payload.get("page_content") or "",
+                         metadata=point.payload.get("metadata") or {})
+                for point in points
+            )
+            if offset is None:
+                return documents
+
+    def _due(self, interval: float) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= interval
+
+    async def _load(self) -> None:
+        try:
+            documents = await self._scroll()
+            # Tokenising every chunk is CPU work; keep it off the event loop
+            index = await asyncio.to_thread(BM25Index, documents) if documents else None
+        except Exception as e:
+            # Keep serving the old index until the next check
+            logging.warning(f"Could not load {self.collection_name}: {e}")
+        else:
+            self._index = index
+            self.stats["loads"] += 1
+            logging.info(f"BM25 index of {self.collection_name}: {len(documents)} chunks")
+        self._checked_at = time.monotonic()
+
+    async def load(self) -> bool:
+        """(Re)load the BM25 index; True if the collection has chunks."""
+        async with self._lock:
+            await self._load()
+        return bool(self._index)
+
+    def start(self) -> None:
+        """Load the index in the background at startup, so no request pays for it."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.load())
+
+    async def ready(self) -> bool:
+        """
+        True once the index is loaded.  An index older than `refresh` is
+        reloaded in the background while the current one keeps serving; until
+        there is one, the collection is checked at most every `not_ready_recheck` seconds.
+        """
+        if self._index is not None:
+            if self._due(self.refresh):
+                self.start()
+            return True
+        if not self._due(self.not_ready_recheck):
+            return False
+        async with self._lock:
+            if self._due(self.not_ready_recheck):     # not loaded meanwhile by another request
+                await self._load()
+        return bool(self._index)
+
+    def invalidate(self) -> None:
+        """Reload on the next query (after re-indexing the collection)."""
+        self._checked_at = None
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ------------------------------------------------------------------ #
+    #  Search                                                             #
+    # ------------------------------------------------------------------ #
+
+    async def search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """Top `k` chunks by RRF of the BM25 and vector rankings; [] if the collection is empty."""
+        if not await self.ready():
+            return []
+        self.stats["queries"] += 1
+        keyword = self._index.search(query, self.candidates)
+        try:
+            dense = await self.vector_store._asimilarity_search(self.collection_name, query, self.candidates)
+        except Exception as e:
+            self.stats["vector_errors"] += 1
+            logging.warning(f"Vector search of {self.collection_name} failed, serving BM25 only: {e}")
+            dense = []
+        return reciprocal_rank_fusion([dense, keyword], k)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats["chunks"] = len(self._index) if self._index else 0
+        return stats
+
+
+scheme_retriever = SchemeRetriever()
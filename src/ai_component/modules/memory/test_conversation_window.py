@@ -0,0 +1,98 @@
+"""
+Unit tests for the token-budgeted conversation window.
+
+Pure message bookkeeping — no LLM, vector store or database involved.
+"""
+
+import unittest
+
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+
+from src.ai_component.modules.memory.conversation_window import (
+    estimate_tokens, split_turns, format_messages, select_window, unsummarized, build_history,
+)
+
+
+def _thread(turns: int, words: int = 5):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i} " + "word " * words, id=f"h{i}"))
+        messages.append(AIMessage(content=f"answer {i} " + "word " * words, id=f"a{i}"))
+    return messages
+
+
+class TestTurnSplitting(unittest.TestCase):
+
+    def test_tool_traffic_stays_with_its_question(self):
+        messages = [
+            HumanMessage(content="rain in patna?", id="h0"),
+            AIMessage(content="", id="a0", tool_calls=[{"name": "weather", "args": {}, "id": "c1"}]),
+            ToolMessage(content="30mm", tool_call_id="c1", id="t0"),
+            AIMessage(content="Yes, heavy rain.", id="a1"),
+            HumanMessage(content="thanks", id="h1"),
+        ]
+        turns = split_turns(messages)
+        self.assertEqual([len(t) for t in turns], [4, 1])
+        self.assertEqual(format_messages(turns[0]), "User: rain in patna?\nAI: Yes, heavy rain.")
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd" * 10), 10)
+
+
+class TestSelectWindow(unittest.TestCase):
+
+    def test_short_thread_is_kept_whole(self):
+        messages = _thread(3)
+        older, window = select_window(messages, max_turns=6, token_budget=10_000)
+        self.assertEqual(older, [])
+        self.assertEqual(window, messages)
+
+    def test_turn_limit(self):
+        messages = _thread(10)
+        older, window = select_window(messages, max_turns=4, token_budget=10_000)
+        self.assertEqual(len(window), 8)
+        self.assertEqual(window[0].id, "h6")
+        self.assertEqual(older + window, messages)
+
+    def test_token_budget(self):
+        messages = _thread(10, words=100)   # each turn is ~260 tokens
+        _, window = select_window(messages, max_turns=10, token_budget=600)
+        self.assertEqual(len(split_turns(window)), 2)
+
+    def test_newest_turn_always_kept(self):
+        messages = _thread(2, words=1000)
+        _, window = select_window(messages, max_turns=6, token_budget=10)
+        self.assertEqual([m.id for m in window], ["h1", "a1"])
+
+    def test_prompt_size_is_bounded(self):
+        for turns in (10, 50, 200):
+            _, window = select_window(_thread(turns), max_turns=6, token_budget=1500)
+            self.assertEqual(len(split_turns(window)), 6)
+            self.assertLessEqual(estimate_tokens(format_messages(window)), 1500)
+
+
+class TestSummaryCursor(unittest.TestCase):
+
+    def test_only_new_evictions_are_summarised(self):
+        messages = _thread(10)
+        older, window = select_window(messages, max_turns=4, token_budget=10_000)
+        self.assertEqual(unsummarized(older, window, None), older)
+        self.assertEqual([m.id for m in unsummarized(older, window, "a4")], ["h5", "a5"])
+        self.assertEqual(unsummarized(older, window, "a5"), [])
+
+    def test_cursor_inside_window(self):
+        messages = _thread(4)
+        older, window = select_window(messages, max_turns=4, token_budget=10_000)
+        self.assertEqual(unsummarized(older, window, "a1"), [])
+
+    def test_build_history(self):
+        window = _thread(1, words=0)
+        self.assertEqual(build_history("", window), "User: question 0 \nAI: answer 0 ")
+        self.assertTrue(build_history("farmer grows wheat", window).startswith(
+            "Summary of earlier conversation:\nfarmer grows wheat"
+        ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Unit tests for the incremental scheme PDF indexer.
+
+An in-memory Qdrant with a counting embedding stands in for Qdrant Cloud and
+text-embedding-004; `fake_parse` reads the "PDFs" as plain text, one chunk
+per line, except in the test of the real parser.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from qdrant_client import QdrantClient
+
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.ingest_schemes import ingest, parse_pdf
+
+COLLECTION = "Government_scheme"
+
+
+class CountingEmbeddings(Embeddings):
+
+    def __init__(self):
+        self.texts: List[str] = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(t)), 1.0] + [0.0] * 766 for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0] + [0.0] * 766
+
+
+def fake_parse(path, chunk_size, chunk_overlap):
+    with open(path, encoding="utf-8") as f:
+        return [(line, 1) for line in f.read().splitlines()]
+
+
+def minimal_pdf(text: str) -> bytes:
+    """A one-page PDF showing `text`, with a correct xref table."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+class TestSchemeIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = self.tmp.name
+        self.memory = LongTermMemory(google_api_key="test")
+        self.memory._client = QdrantClient(location=":memory:")
+        self.memory._embeddings = CountingEmbeddings()
+        self._write("pm_kisan.pdf", "PM-KISAN pays Rs 6000\nin three instalments\nto land-holding farmers")
+        self._write("schemes/pmfby.pdf", "PMFBY insures crops")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.data, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _ingest(self, **options):
+        return ingest(self.memory, data_path=self.data, collection_name=COLLECTION,
+                      parse=fake_parse, workers=1, batch_size=2, **options)
+
+    def _sources(self):
+        points, _ = self.memory.client.scroll(COLLECTION, limit=100)
+        return sorted((p.payload["metadata"]["source"], p.payload["page_content"]) for p in points)
+
+    def test_only_new_changed_and_removed_files_are_touched(self):
+        counts = self._ingest()
+        self.assertEqual((counts["indexed_files"], counts["chunks"]), (2, 4))
+        self.assertEqual(len(self._sources()), 4)
+
+        self.memory._embeddings.texts.clear()
+        counts = self._ingest()
+        self.assertEqual((counts["unchanged"], counts["indexed_files"]), (2, 0))
+        self.assertEqual(self.memory._embeddings.texts, [])
+
+        self._write("pm_kisan.pdf", "PM-KISAN pays Rs 6000 a year")
+        os.remove(os.path.join(self.data, "schemes", "pmfby.pdf"))
+        self.assertEqual(self._ingest(dry_run=True)["to_index"], 1)
+        counts = self._ingest()
+        self.assertEqual((counts["indexed_files"], counts["removed_files"]), (1, 1))
+        self.assertEqual(self.memory._embeddings.texts, ["PM-KISAN pays Rs 6000 a year"])
+        self.assertEqual(self._sources(), [("pm_kisan.pdf", "PM-KISAN pays Rs 6000 a year")])
+
+    def test_interrupted_run_resumes_after_the_last_indexed_batch(self):
+        upsert = self.memory.client.upsert
+        calls = 0
+
+        def failing_second_upsert(**kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise ConnectionError("Qdrant went away")
+            return upsert(**kwargs)
+
+        with mock.patch.object(self.memory.client, "upsert", failing_second_upsert):
+            with self.assertRaises(ConnectionError):
+                self._ingest()
+
+        self.memory._embeddings.texts.clear()
+        counts = self._ingest()
+        self.assertEqual(counts["resumed_files"], 1)
+        # Only the chunks after the checkpoint are embedded again
+        self.assertEqual(sorted(self.memory._embeddings.texts), ["PMFBY insures crops", "to land-holding farmers"])
+        self.assertEqual(len(self._sources()), 4)
+
+    def test_progress_lives_in_qdrant_not_on_the_host(self):
+        self._ingest()
+        # Another host / fresh checkout with the same PDFs: nothing to do, nothing deleted
+        other = tempfile.TemporaryDirectory()
+        self.addCleanup(other.cleanup)
+        for name in ("pm_kisan.pdf", "schemes/pmfby.pdf"):
+            os.makedirs(os.path.dirname(os.path.join(other.name, name)), exist_ok=True)
+            with open(os.path.join(self.data, name), "rb") as src, open(os.path.join(other.name, name), "wb") as dst:
+                dst.write(src.read())
+        counts = ingest(self.memory, data_path=other.name, collection_name=COLLECTION, parse=fake_parse, workers=1)
+        self.assertEqual((counts["unchanged"], counts["removed_files"]), (2, 0))
+        self.assertEqual(len(self._sources()), 4)
+
+    def test_empty_data_path_does_not_empty_the_collection(self):
+        self._ingest()
+        with self.assertRaises(FileNotFoundError):
+            ingest(self.memory, data_path=os.path.join(self.data, "missing"), collection_name=COLLECTION)
+        self.assertEqual(len(self._sources()), 4)
+
+    def test_points_of_the_old_loader_are_replaced(self):
+        self.memory.ingest_data(COLLECTION, [Document(page_content="old chunk", metadata={"source": "data/pm_kisan.pdf"})])
+        counts = self._ingest()
+        self.assertEqual(counts["removed_files"], 1)
+        self.assertNotIn("old chunk", [text for _, text in self._sources()])
+
+    def test_pdfs_are_parsed_in_worker_processes(self):
+        with open(os.path.join(self.data, "pm_kisan.pdf"), "wb") as f:
+            f.write(minimal_pdf("PM-KISAN pays Rs 6000 a year"))
+        os.remove(os.path.join(self.data, "schemes", "pmfby.pdf"))
+        self.assertEqual(parse_pdf(os.path.join(self.data, "pm_kisan.pdf"), 500, 20),
+                         [("PM-KISAN pays Rs 6000 a year", 1)])
+
+        counts = ingest(self.memory, data_path=self.data, collection_name=COLLECTION, workers=2)
+        self.assertEqual(counts["chunks"], 1)
+        self.assertEqual(self._sources(), [("pm_kisan.pdf", "PM-KISAN pays Rs 6000 a year")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Unit tests for the background memory-ingestion queue.
+
+The queue is driven with an in-memory handler, so no LLM, Qdrant or Postgres
+is touched.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from src.ai_component.modules.memory.ingestion_queue import MemoryIngestionQueue
+
+
+class RecordingHandler:
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, collection_name, conversations, index_vectors):
+        await self.release.wait()
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("store unavailable")
+        self.calls.append((collection_name, conversations, index_vectors))
+        return True
+
+
+class TestMemoryIngestionQueue(unittest.IsolatedAsyncioTestCase):
+
+    async def test_submit_returns_before_ingestion_finishes(self):
+        handler = RecordingHandler(delay=0.2)
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.assertTrue(await queue.submit("farmer1", "User: hi\nAI: hello"))
+        self.assertLess(loop.time() - start, 0.05)
+        self.assertEqual(handler.calls, [])
+        await queue.drain()
+        self.assertEqual(handler.calls, [("farmer1", ["User: hi\nAI: hello"], True)])
+        self.assertEqual(queue.get_stats()["stored"], 1)
+
+    async def test_retries_then_succeeds(self):
+        handler = RecordingHandler(failures=2)
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1, max_retries=3, retry_backoff=0.001)
+        await queue.submit("farmer1", "conv")
+        await queue.drain()
+        stats = queue.get_stats()
+        self.assertEqual(stats["retried"], 2)
+        self.assertEqual(stats["stored"], 1)
+        self.assertEqual(stats["failed"], 0)
+
+    async def test_gives_up_after_max_retries(self):
+        handler = RecordingHandler(failures=10)
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1, max_retries=1, retry_backoff=0.001)
+        await queue.submit("farmer1", "conv")
+        await queue.drain()
+        self.assertEqual(queue.get_stats()["failed"], 1)
+
+    async def test_drop_new_when_full(self):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1, maxsize=2,
+                                     overflow_policy="drop_new", degrade_watermark=1.0)
+        await queue.submit("farmer1", "conv 0")
+        await asyncio.sleep(0)          # worker picks up conv 0 and waits
+        results = [await queue.submit("farmer1", f"conv {i}") for i in range(1, 4)]
+        # two jobs wait in the queue, the third is rejected
+        self.assertEqual(results, [True, True, False])
+        handler.release.set()
+        await queue.drain()
+        self.assertEqual(queue.get_stats()["dropped"], 1)
+
+    async def test_drop_oldest_keeps_newest(self):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1, maxsize=1,
+                                     overflow_policy="drop_oldest", degrade_watermark=1.0)
+        await queue.submit("farmer1", "conv 0")
+        await asyncio.sleep(0)          # worker picks up conv 0 and waits
+        for i in range(1, 4):
+            self.assertTrue(await queue.submit("farmer1", f"conv {i}"))
+        handler.release.set()
+        await queue.drain()
+        self.assertEqual([c[1] for c in handler.calls], [["conv 0"], ["conv 3"]])
+
+    async def test_degrades_above_watermark(self):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = MemoryIngestionQueue(batch_size=1, handler=handler, workers=1, maxsize=4, degrade_watermark=0.5)
+        for i in range(4):
+            await queue.submit("farmer1", f"conv {i}")
+        handler.release.set()
+        await queue.drain()
+        self.assertIn(False, [c[2] for c in handler.calls])
+        self.assertGreater(queue.get_stats()["degraded"], 0)
+
+    async def test_rejects_jobs_while_draining(self):
+        queue = MemoryIngestionQueue(batch_size=1, handler=RecordingHandler(), workers=1)
+        await queue.submit("farmer1", "conv")
+        await queue.drain()
+        self.assertFalse(await queue.submit("farmer1", "late"))
+
+    async def test_batches_turns_per_thread(self):
+        handler = RecordingHandler()
+        queue = MemoryIngestionQueue(handler=handler, workers=1, batch_size=3, batch_max_wait=60)
+        for i in range(4):
+            await queue.submit("farmer1", f"a{i}", thread_id="t1")
+        await queue.submit("farmer1", "b0", thread_id="t2")
+        await asyncio.sleep(0.01)
+        self.assertEqual(handler.calls, [("farmer1", ["a0", "a1", "a2"], True)])
+        await queue.drain()             # partial batches are flushed on shutdown
+        self.assertCountEqual(handler.calls[1:], [("farmer1", ["a3"], True), ("farmer1", ["b0"], True)])
+        self.assertEqual(queue.get_stats()["batches"], 3)
+
+    async def test_partial_batch_flushes_after_max_wait(self):
+        handler = RecordingHandler()
+        queue = MemoryIngestionQueue(handler=handler, workers=1, batch_size=5, batch_max_wait=0.05)
+        await queue.submit("farmer1", "a0", thread_id="t1")
+        await queue.submit("farmer1", "a1", thread_id="t1")
+        await asyncio.sleep(0.1)
+        self.assertEqual(handler.calls, [("farmer1", ["a0", "a1"], True)])
+        await queue.drain()
+
+    async def test_buffered_turns_count_toward_the_limit(self):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = MemoryIngestionQueue(handler=handler, workers=1, batch_size=5, batch_max_wait=60, maxsize=2,
+                                     overflow_policy="drop_new", degrade_watermark=1.0)
+        # One partial batch per thread: without a bound these would pile up in memory
+        for i in range(6):
+            await queue.submit("farmer1", f"conv {i}", thread_id=f"t{i}")
+        stats = queue.get_stats()
+        self.assertLessEqual(stats["buffered"], 2)
+        self.assertLessEqual(stats["depth"], 2)
+        self.assertGreater(stats["dropped"], 0)      # the overflow policy applied to early-flushed batches
+        handler.release.set()
+        await queue.drain()
+        stats = queue.get_stats()
+        self.assertEqual(stats["buffered"], 0)
+        self.assertEqual(len(handler.calls) + stats["dropped"], 6)
+
+    async def test_failed_store_write_is_retried(self):
+        from src.ai_component.graph.utils.chains import MemoryAnalysis1, MemoryAnalysis2
+        from src.ai_component.modules.memory.memory_manager import MemoryManager
+
+        manager = MemoryManager()
+        chain = mock.Mock(ainvoke=mock.AsyncMock(side_effect=[
+            MemoryAnalysis1(is_important="Yes"), MemoryAnalysis2(summary="Grows wheat in Patna"),
+        ] * 2))
+        manager.chains = mock.Mock(get=mock.AsyncMock(return_value=chain))
+        manager.long_term_store = mock.Mock(put=mock.AsyncMock(side_effect=[ConnectionError("store down"), None]))
+        queue = MemoryIngestionQueue(batch_size=1, handler=manager.store_in_memory, workers=1,
+                                     max_retries=2, retry_backoff=0.001)
+        await queue.submit("farmer1", "User: I grow wheat in Patna\nAI: Noted")
+        await queue.drain()
+        stats = queue.get_stats()
+        self.assertEqual((stats["retried"], stats["stored"], stats["failed"]), (1, 1, 0))
+        self.assertEqual(manager.long_term_store.put.await_count, 2)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            MemoryIngestionQueue(overflow_policy="spill")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the long-term memory store and its migration helpers.
+
+LangGraph's in-memory store, indexed with a keyword embedding, stands in for
+the pgvector-backed AsyncPostgresStore.
+"""
+
+import unittest
+
+from langgraph.store.memory import InMemoryStore
+
+from src.ai_component.modules.memory.long_term_store import (
+    PostgresLongTermStore, make_long_term_store, namespace, store_index_config,
+)
+from src.ai_component.modules.memory.migrate_memory import migrate_to_postgres, store_summaries
+
+VOCABULARY = ("wheat", "rice", "loan", "rain")
+
+
+def keyword_embed(texts):
+    return [[float(word in text.lower()) for word in VOCABULARY] + [0.1] for text in texts]
+
+
+def _indexed_store() -> InMemoryStore:
+    return InMemoryStore(index={"dims": len(VOCABULARY) + 1, "embed": keyword_embed, "fields": ["summary"]})
+
+
+class TestPostgresLongTermStore(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.store = _indexed_store()
+
+        async def get_store():
+            return self.store
+
+        self.long_term = PostgresLongTermStore(get_store)
+
+    async def test_search_ranks_by_relevance_and_is_per_user(self):
+        await self.long_term.put("farmer1", [
+            "Grows rice on two acres", "Asked about a crop loan", "Sowed wheat in November",
+        ])
+        await self.long_term.put("farmer2", ["Sowed wheat last week"])
+        results = await self.long_term.search("farmer1", "When should I irrigate my wheat?", limit=2)
+        self.assertEqual(results[0], "Sowed wheat in November")
+        self.assertEqual(len(results), 2)
+        self.assertNotIn("Sowed wheat last week", results)
+
+    async def test_unindexed_put_is_kept_for_migration(self):
+        await self.long_term.put("farmer1", ["Worried about the rain"], index=False)
+        [item] = await self.store.asearch(namespace("farmer1"), query="rain")
+        self.assertEqual(item.value["summary"], "Worried about the rain")
+        self.assertIsNone(item.score)   # stored, but has no embedding to rank by
+
+
+class TestMigration(unittest.IsolatedAsyncioTestCase):
+
+    async def test_migrate_to_postgres_indexes_and_copies_missing_summaries(self):
+        store = _indexed_store()
+        await store.aput(namespace("farmer1"), "a", {"summary": "Asked about a crop loan"}, index=False)
+        qdrant = {"farmer1": ["Asked about a crop loan", "Grows rice"], "farmer2": ["Sowed wheat"]}
+
+        dry = await migrate_to_postgres(store, qdrant, dry_run=True)
+        self.assertEqual(dry, {"reindexed": 1, "copied_from_qdrant": 2})
+        self.assertEqual([r.score for r in await store.asearch(namespace("farmer1"), query="loan")], [None])
+
+        await migrate_to_postgres(store, qdrant)
+        self.assertEqual(await migrate_to_postgres(store, qdrant), {"reindexed": 3, "copied_from_qdrant": 0})
+        results = await store.asearch(namespace("farmer1"), query="loan")
+        self.assertEqual(results[0].value["summary"], "Asked about a crop loan")
+        self.assertTrue(all(r.score is not None for r in results))
+        self.assertEqual(
+            {user: sorted(items.values()) for user, items in (await store_summaries(store)).items()},
+            {"farmer1": ["Asked about a crop loan", "Grows rice"], "farmer2": ["Sowed wheat"]},
+        )
+
+
+class TestBackendSelection(unittest.TestCase):
+
+    def test_backends(self):
+        self.assertEqual(store_index_config("postgres")["fields"], ["summary"])
+        self.assertIsNone(store_index_config("qdrant"))
+        with self.assertRaises(ValueError):
+            make_long_term_store("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
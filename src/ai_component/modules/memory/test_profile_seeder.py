@@ -0,0 +1,106 @@
+"""
+Unit tests for the once-per-version profile seeder.
+
+An in-memory Qdrant with a keyword embedding stands in for Qdrant Cloud and
+text-embedding-004, and a dict-backed fake stands in for the `users` table.
+"""
+
+import gc
+import asyncio
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.profile_seeder import ProfileSeeder, PROFILE_TYPE
+
+
+class KeywordEmbeddings(Embeddings):
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float("patna" in text.lower()), float("nashik" in text.lower()), 0.1] + [0.0] * 765
+
+
+class FakeUsers:
+    """The `users` rows the seeder reads and writes."""
+
+    def __init__(self):
+        self.rows = {"farmer1": {"full_name": "Ravi", "age": 41, "city": "Patna", "district": "Patna", "state": "Bihar"}}
+        self.reads = 0
+
+    async def get_user_by_unique_name(self, unique_name):
+        self.reads += 1
+        await asyncio.sleep(0)
+        row = self.rows.get(unique_name)
+        return dict(row) if row else None
+
+    async def set_profile_hash(self, unique_name, profile_hash):
+        self.rows[unique_name]["profile_hash"] = profile_hash
+
+
+class TestProfileSeeder(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.memory = LongTermMemory(google_api_key="test")
+        self.memory._async_client = AsyncQdrantClient(location=":memory:")
+        self.memory._embeddings = KeywordEmbeddings()
+        self.users = FakeUsers()
+        patcher = mock.patch("src.ai_component.modules.memory.profile_seeder.user_db", self.users)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.seeder = ProfileSeeder()
+        self.seeder.vector_store = self.memory
+
+    async def _profiles(self, tenant="farmer1"):
+        docs = await self.memory.asearch_memories("profile", tenant, k=10, doc_type=PROFILE_TYPE)
+        return [doc.page_content for doc, _ in docs]
+
+    async def test_profile_is_seeded_once_per_version(self):
+        with mock.patch.object(self.memory, "aadd_memories", wraps=self.memory.aadd_memories) as add:
+            self.assertTrue(await self.seeder.ensure_seeded("farmer1"))
+            self.assertTrue(await self.seeder.ensure_seeded("farmer1"))
+            # A restarted process re-reads the row but finds the same hash
+            restarted = ProfileSeeder()
+            restarted.vector_store = self.memory
+            self.assertTrue(await restarted.ensure_seeded("farmer1"))
+        self.assertEqual(add.call_count, 1)
+        self.assertEqual(self.users.reads, 2)
+        self.assertEqual(self.seeder.location("farmer1"), "bihar/patna")
+
+    async def test_edited_profile_replaces_the_vector(self):
+        await self.seeder.ensure_seeded("farmer1")
+        self.users.rows["farmer1"].update(city="Nashik", district="Nashik", state="Maharashtra")
+        await self.seeder.reseed("farmer1")
+        [profile] = await self._profiles()
+        self.assertIn("Nashik", profile)
+        self.assertEqual(self.seeder.location("farmer1"), "maharashtra/nashik")
+
+    async def test_unknown_user_is_not_seeded(self):
+        self.assertFalse(await self.seeder.ensure_seeded("nobody"))
+        self.assertEqual(self.seeder.location("nobody"), "")
+
+    async def test_concurrent_turns_seed_once_and_locks_are_released(self):
+        results = await asyncio.gather(*(self.seeder.ensure_seeded("farmer1") for _ in range(5)))
+        self.assertEqual(results, [True] * 5)
+        self.assertEqual(self.users.reads, 1)
+        gc.collect()
+        self.assertEqual(len(self.seeder._locks), 0)
+
+    async def test_deleting_the_account_deletes_the_profile_vector(self):
+        await self.seeder.ensure_seeded("farmer1")
+        await self.memory.aadd_memories("farmer2", "Farmer from Nashik", doc_type=PROFILE_TYPE)
+        del self.users.rows["farmer1"]
+        await self.seeder.delete_profile("farmer1")
+        self.assertEqual(await self._profiles(), [])
+        self.assertEqual(await self._profiles("farmer2"), ["Farmer from Nashik"])
+        self.assertFalse(await self.seeder.ensure_seeded("farmer1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
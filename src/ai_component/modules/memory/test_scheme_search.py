@@ -0,0 +1,120 @@
+"""
+Unit tests for the hybrid BM25 + vector scheme retriever.
+
+An in-memory Qdrant with an embedding that only knows a few everyday words
+stands in for Qdrant Cloud and text-embedding-004, so — like the real model —
+it cannot tell scheme acronyms apart.
+"""
+
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.scheme_search import BM25Index, SchemeRetriever, reciprocal_rank_fusion
+
+COLLECTION = "Government_scheme"
+VOCABULARY = ("crop", "insurance", "loan", "farmer", "soil")
+
+CHUNKS = [
+    "Farmers get crop loan support from banks",
+    "Crop insurance protects the farmer against loss",
+    "PMFBY premium is 2 percent of the sum insured for kharif crops",
+    "KCC holders can draw a crop loan up to the card limit",
+    "Soil health card reports nutrient status of the soil",
+]
+
+
+class VocabularyEmbeddings(Embeddings):
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [float(word in text.lower()) for word in VOCABULARY] + [0.1]
+        return vector + [0.0] * (768 - len(vector))
+
+
+class TestBM25(unittest.TestCase):
+
+    def test_exact_terms_rank_first_and_unmatched_documents_are_left_out(self):
+        index = BM25Index([Document(page_content=text) for text in CHUNKS])
+        results = index.search("What is the PMFBY premium?", k=5)
+        self.assertEqual([doc.page_content for doc, _ in results], [CHUNKS[2]])
+
+    def test_fusion_rewards_agreement(self):
+        a, b, c = (Document(page_content=t, metadata={"source": "x.pdf", "chunk": i}) for i, t in enumerate("abc"))
+        fused = reciprocal_rank_fusion([[(a, 0.9), (b, 0.8)], [(b, 7.0), (c, 3.0)]], k=3, rrf_k=60)
+        self.assertEqual([doc.page_content for doc, _ in fused], ["b", "a", "c"])
+
+
+class TestSchemeRetriever(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.memory = LongTermMemory(google_api_key="test")
+        self.memory._async_client = AsyncQdrantClient(location=":memory:")
+        self.memory._embeddings = VocabularyEmbeddings()
+        self.retriever = SchemeRetriever(self.memory, collection_name=COLLECTION, candidates=3)
+
+    async def _index(self):
+        documents = [
+            Document(page_content=text, metadata={"source": "schemes.pdf", "chunk": i})
+            for i, text in enumerate(CHUNKS)
+        ]
+        await self.memory.aingest_data(COLLECTION, documents)
+
+    async def test_exact_terms_missed_by_vectors_are_recalled(self):
+        await self._index()
+        query = "Can a farmer use KCC for a crop loan"
+        dense = await self.memory._asimilarity_search(COLLECTION, query, 1)
+        self.assertNotEqual(dense[0][0].page_content, CHUNKS[3])
+        results = await self.retriever.search(query, k=1)
+        self.assertEqual(results[0][0].page_content, CHUNKS[3])
+
+    async def test_readiness_is_checked_once_and_an_empty_collection_is_rechecked(self):
+        self.assertEqual(await self.retriever.search("PMFBY", k=2), [])
+        await self._index()
+        self.assertFalse(await self.retriever.ready())     # cached until the recheck interval
+        self.retriever.invalidate()
+
+        with mock.patch.object(self.memory.async_client, "scroll", wraps=self.memory.async_client.scroll) as scroll:
+            for _ in range(3):
+                results = await self.retriever.search("PMFBY premium", k=2)
+        self.assertEqual(scroll.call_count, 1)
+        self.assertEqual(results[0][0].page_content, CHUNKS[2])
+        self.assertEqual(self.retriever.get_stats()["chunks"], len(CHUNKS))
+
+    async def test_collection_indexed_by_another_process_is_picked_up(self):
+        self.assertFalse(await self.retriever.ready())
+        # The ingestion CLI: its own LongTermMemory (and known-collections cache), same Qdrant
+        other = LongTermMemory(google_api_key="test")
+        other._async_client, other._embeddings = self.memory.async_client, self.memory._embeddings
+        await other.aingest_data(COLLECTION, CHUNKS)
+        self.retriever.invalidate()
+        self.assertTrue(await self.retriever.ready())
+
+    async def test_stale_index_is_reloaded_in_the_background(self):
+        await self._index()
+        self.retriever.start()
+        await self.retriever._task
+        self.retriever.refresh = 0
+        with mock.patch.object(self.retriever, "_scroll", wraps=self.retriever._scroll) as scroll:
+            self.assertTrue(await self.retriever.ready())   # served by the old index
+            scroll.assert_not_called()
+            await self.retriever._task
+        self.assertEqual(self.retriever.get_stats()["loads"], 2)
+
+    async def test_bm25_is_served_when_the_vector_search_fails(self):
+        await self._index()
+        with mock.patch.object(self.memory, "_asimilarity_search", side_effect=ConnectionError):
+            results = await self.retriever.search("soil health card", k=1)
+        self.assertEqual(results[0][0].page_content, CHUNKS[4])
+        self.assertEqual(self.retriever.get_stats()["vector_errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for the shared, multi-tenant memory collection, its async API and
+known-collections cache, and the migration of the old per-user collections.
+
+In-memory Qdrant clients with a keyword embedding stand in for Qdrant Cloud and
+text-embedding-004.
+"""
+
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from src.ai_component.config import memory_collection
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.migrate_tenants import legacy_collections, migrate
+from src.ai_component.modules.memory.profile_seeder import PROFILE_TYPE
+
+VOCABULARY = ("wheat", "rice", "loan", "rain", "aphids")
+
+
+class KeywordEmbeddings(Embeddings):
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [float(word in text.lower()) for word in VOCABULARY] + [0.1]
+        return vector + [0.0] * (768 - len(vector))
+
+
+def _memory() -> LongTermMemory:
+    memory = LongTermMemory(google_api_key="test")
+    memory._client = QdrantClient(location=":memory:")
+    memory._async_client = AsyncQdrantClient(location=":memory:")
+    memory._embeddings = KeywordEmbeddings()
+    return memory
+
+
+class TestTenantMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = _memory()
+        self.memory.add_memories("farmer1", ["Aphids on my wheat", "Asked about a crop loan"])
+        self.memory.add_memories("farmer1", "Farmer from Patna", doc_type=PROFILE_TYPE)
+        self.memory.add_memories("farmer2", ["Aphids on the rice crop"])
+
+    def test_one_collection_for_all_users(self):
+        self.assertEqual(self.memory._list_collection(), [memory_collection])
+
+    def test_search_is_tenant_filtered(self):
+        docs = self.memory.search_memories("aphids", "farmer1", k=5, doc_type="conversation_summary")
+        self.assertEqual(docs[0][0].page_content, "Aphids on my wheat")
+        self.assertEqual({doc.metadata["tenant"] for doc, _ in docs}, {"farmer1"})
+        self.assertNotIn(PROFILE_TYPE, {doc.metadata["type"] for doc, _ in docs})
+
+    def test_global_search_spans_tenants(self):
+        docs = self.memory.search_all_memories("aphids", k=2)
+        self.assertEqual({doc.metadata["tenant"] for doc, _ in docs}, {"farmer1", "farmer2"})
+        grouped = self.memory.search_across_collections("aphids", k=2)
+        self.assertEqual(set(grouped), {"farmer1", "farmer2"})
+
+    def test_delete_is_tenant_scoped(self):
+        self.memory.add_memories("farmer2", "Farmer from Nashik", doc_type=PROFILE_TYPE)
+        self.memory.delete_memories("farmer1", PROFILE_TYPE)
+        profiles = self.memory.search_all_memories("farmer", k=10, doc_type=PROFILE_TYPE)
+        self.assertEqual([doc.page_content for doc, _ in profiles], ["Farmer from Nashik"])
+
+
+class TestAsyncMemory(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.memory = _memory()
+        await self.memory.aadd_memories("farmer1", ["Aphids on my wheat"])
+        await self.memory.aadd_memories("farmer2", ["Aphids on the rice crop", "Worried about the rain"])
+
+    async def test_tenant_and_global_search(self):
+        docs = await self.memory.asearch_memories("aphids", "farmer2", k=1)
+        self.assertEqual(docs[0][0].page_content, "Aphids on the rice crop")
+        docs = await self.memory.asearch_all_memories("aphids", k=2)
+        self.assertEqual({doc.metadata["tenant"] for doc, _ in docs}, {"farmer1", "farmer2"})
+
+    async def test_collections_are_listed_once_and_tracked_on_create_and_delete(self):
+        with mock.patch.object(self.memory.async_client, "get_collections",
+                               wraps=self.memory.async_client.get_collections) as listing:
+            self.assertFalse(await self.memory._acollection_exists("Government_scheme"))
+            await self.memory.aingest_data("Government_scheme", ["PM-KISAN pays Rs 6000 a year"])
+            self.assertTrue(await self.memory._acollection_exists("Government_scheme"))
+            self.assertEqual(len(await self.memory.asearch_in_collection("kisan", "Government_scheme")), 1)
+            await self.memory.adelete_collection("Government_scheme")
+            self.assertFalse(await self.memory._acollection_exists("Government_scheme"))
+            self.assertEqual(await self.memory.asearch_in_collection("kisan", "Government_scheme"), [])
+        listing.assert_not_called()
+
+    async def test_collections_changed_by_other_processes_are_seen(self):
+        self.assertFalse(await self.memory._acollection_exists("Government_scheme"))
+        # Another worker / the ingestion CLI creates the collection behind this cache's back
+        from qdrant_client.models import Distance, VectorParams
+        await self.memory.async_client.create_collection(
+            "Government_scheme", vectors_config=VectorParams(size=768, distance=Distance.COSINE))
+        self.assertTrue(await self.memory._acollection_exists("Government_scheme"))
+
+        await self.memory.async_client.delete_collection("Government_scheme")
+        self.assertTrue(await self.memory._acollection_exists("Government_scheme"))    # trusted until the TTL
+        with mock.patch("src.ai_component.modules.memory.vector_store.collections_cache_ttl", 0):
+            self.assertFalse(await self.memory._acollection_exists("Government_scheme"))
+
+
+class TestTenantMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = _memory()
+        # The old layout: one collection per user, plus the shared scheme collection
+        self.memory.ingest_data("farmer1", ["Aphids on my wheat"])
+        self.memory.ingest_data("farmer1", "Old profile", additional_metadata={"type": PROFILE_TYPE})
+        self.memory.ingest_data("farmer2", ["Worried about the rain"])
+        self.memory.ingest_data("Government_scheme", ["PM-KISAN pays Rs 6000 a year"],
+                                additional_metadata={"type": "government_scheme"})
+
+    def _tenant_docs(self, tenant):
+        return sorted(doc.page_content for doc, _ in self.memory.search_memories("x", tenant, k=10))
+
+    def test_migration_is_idempotent_and_keeps_shared_collections(self):
+        self.assertEqual(migrate(self.memory, dry_run=True)["copied"], 3)
+        self.assertEqual(self._tenant_docs("farmer1"), [])
+
+        migrate(self.memory)
+        counts = migrate(self.memory, drop_legacy=True)
+        self.assertEqual(counts, {"collections": 2, "copied": 3, "skipped_profiles": 0, "dropped": 2})
+        self.assertEqual(self._tenant_docs("farmer1"), ["Aphids on my wheat", "Old profile"])
+        self.assertEqual(self._tenant_docs("farmer2"), ["Worried about the rain"])
+        self.assertEqual(legacy_collections(self.memory), [])
+        self.assertIn("Government_scheme", self.memory._list_collection())
+
+    def test_newer_profile_is_kept(self):
+        self.memory.add_memories("farmer1", "New profile", doc_type=PROFILE_TYPE)
+        counts = migrate(self.memory)
+        self.assertEqual(counts["skipped_profiles"], 1)
+        self.assertEqual(self._tenant_docs("farmer1"), ["Aphids on my wheat", "New profile"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for the buffered vector writer.
+
+An in-memory Qdrant with a counting embedding stands in for Qdrant Cloud and
+text-embedding-004.
+"""
+
+import asyncio
+import unittest
+from typing import List
+from unittest import mock
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient
+
+from src.ai_component.config import memory_collection
+from src.ai_component.modules.memory.vector_store import LongTermMemory
+from src.ai_component.modules.memory.vector_writer import VectorWriter
+
+
+class CountingEmbeddings(Embeddings):
+
+    def __init__(self):
+        self.batches: List[int] = []
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        return [[float(len(t)), 1.0] + [0.0] * 766 for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0] + [0.0] * 766
+
+
+class TestVectorWriter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.memory = LongTermMemory(google_api_key="test")
+        self.memory._async_client = AsyncQdrantClient(location=":memory:")
+        self.memory._embeddings = CountingEmbeddings()
+        self.writer = VectorWriter(self.memory, batch_size=4, flush_interval=60, max_pending=100)
+
+    async def asyncTearDown(self):
+        await self.writer.aclose()
+
+    async def _count(self, collection_name=memory_collection) -> int:
+        return (await self.memory.async_client.count(collection_name)).count
+
+    async def test_requests_are_embedded_and_upserted_in_batches(self):
+        for i in range(3):
+            await self.writer.add_memories(f"farmer{i}", [f"summary {i}"])
+        await self.writer.ingest_data("Government_scheme", ["PM-KISAN pays Rs 6000 a year"])
+        await asyncio.sleep(0.05)   # the full batch wakes the flusher
+        self.assertEqual(self.memory._embeddings.batches, [4])
+        self.assertEqual(await self._count(), 3)
+        self.assertEqual(await self._count("Government_scheme"), 1)
+        self.assertEqual(self.writer.get_stats()["batches"], 1)
+
+    async def test_partial_batch_waits_for_the_interval_or_shutdown(self):
+        await self.writer.add_memories("farmer1", ["only one"])
+        await asyncio.sleep(0.05)
+        self.assertEqual(await self._count(), 0)
+        await self.writer.aclose()
+        self.assertEqual(await self._count(), 1)
+
+    async def test_failed_batch_is_retried_without_duplicates(self):
+        await self.writer.add_memories("farmer1", ["a", "b"])
+        upsert = self.memory.async_client.upsert
+        calls = 0
+
+        async def flaky_upsert(**kwargs):
+            nonlocal calls
+            calls += 1
+            await upsert(**kwargs)
+            if calls == 1:
+                raise ConnectionError("lost the response")
+
+        with mock.patch.object(self.memory.async_client, "upsert", flaky_upsert):
+            with self.assertRaises(ConnectionError):
+                await self.writer.flush()
+            self.assertEqual(self.writer.pending, 2)
+            await self.writer.flush()
+        self.assertEqual(await self._count(), 2)
+        self.assertEqual(self.writer.get_stats()["errors"], 1)
+
+    async def test_points_are_dropped_after_max_attempts(self):
+        self.writer.max_attempts = 2
+        await self.writer.add_memories("farmer1", ["a"])
+        with mock.patch.object(self.memory.async_client, "upsert", side_effect=ConnectionError):
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    await self.writer.flush()
+        self.assertEqual((self.writer.pending, self.writer.get_stats()["dropped"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
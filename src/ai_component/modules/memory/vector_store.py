@@ -1,18 +1,15 @@
 import os
+import sys
+import time
 from datetime import datetime
 import tqdm
+from uuid import uuid4
 from typing import List, Dict, Optional
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
-from langchain_qdrant import Qdrant
 from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import DirectoryLoader
-from langchain_community.document_loaders import PyPDFLoader
-from src.ai_component.config import top_collection_search, top_database_search
+from src.ai_component.config import top_collection_search, top_database_search, memory_collection, collections_cache_ttl
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
+from src.ai_component.metrics import observe_qdrant
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,43 +20,109 @@ QDRANT_API = os.getenv("QDRANT_API")
 if not QDRANT_URL or not QDRANT_API:
     raise RuntimeError("QDRANT_URL and QDRANT_API must be set")
 
+# Payload keys of the shared memory collection (both keyword-indexed)
+TENANT_KEY = "metadata.tenant"
+TYPE_KEY = "metadata.type"
+
 
 class LongTermMemory: 
+    """
+    Qdrant-backed long-term memory.
+
+    User memory (profiles and conversation summaries) lives in the single
+    `memory_collection`, one tenant per user, and is read and written through
+    the `*_memories` methods.  The collection-level methods serve the shared
+    document collections such as "Government_scheme".
+
+    Every operation has an awaitable twin (`a`-prefixed, e.g. `asearch_memories`)
+    on `AsyncQdrantClient`, which the graph nodes and tools use so a Qdrant
+    round trip never blocks the event loop; the sync methods serve worker
+    threads and the command-line tools.  Both share the known-collections
+    cache, refreshed by every listing (at least every `collections_cache_ttl`
+    seconds) and updated on create / delete; a name missing from the cache is
+    confirmed with Qdrant before answering False, so collections created by
+    other processes are seen at once.
+
+    The Qdrant client, the embedding model and the langchain_qdrant / PDF
+    loader modules are only imported and constructed on first use, so
+    importing this module (and every tool that depends on it) stays cheap.
+    """
+
     def __init__(self, google_api_key: str = os.getenv("GOOGLE_API_KEY")):
         self.qdrant_url = QDRANT_URL
         self.google_api_key = google_api_key
+        self._embeddings = None
+        self._client = None
+        self._async_client = None
+        self._collections: Optional[set] = None     # known collection names
+        self._listed_at = 0.0                       # time.monotonic() of the last listing
+        self._memory_collection_ready = False
 
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004",
-            google_api_key=self.google_api_key
-        )
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            from src.ai_component.modules.cache.embedding_cache import CachedEmbeddings
+            model = "models/text-embedding-004"
+            # Every caller (searches, semantic cache, the Postgres store index) shares this cache
+            self._embeddings = CachedEmbeddings(
+                GoogleGenerativeAIEmbeddings(model=model, google_api_key=self.google_api_key),
+                model=model,
+            )
+        return self._embeddings
 
-        self.client = QdrantClient(
-            url=QDRANT_URL,
-            api_key=QDRANT_API,
-            prefer_grpc=False
-        )
+    @property
+    def client(self):
+        if self._client is None:
+            from qdrant_client import QdrantClient
+            self._client = QdrantClient(
+                url=QDRANT_URL,
+                api_key=QDRANT_API,
+                prefer_grpc=False
+            )
+        return self._client
 
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from qdrant_client import AsyncQdrantClient
+            self._async_client = AsyncQdrantClient(
+                url=QDRANT_URL,
+                api_key=QDRANT_API,
+                prefer_grpc=False
+            )
+        return self._async_client
+
+    @observe_qdrant("list_collections")
     def _list_collection(self) -> List[str]:
         """Give all the collection in Vector Database"""
         try:
             logging.info("checking list of collections")
             collections = self.client.get_collections()
-            return [collection.name for collection in collections.collections]
+            names = [collection.name for collection in collections.collections]
+            self._collections = set(names)
+            self._listed_at = time.monotonic()
+            return names
         except CustomException as e:
             logging.error(f"Error in finding list of collections {str(e)}")
             raise CustomException(e, sys) from e
+
+    def _collections_stale(self) -> bool:
+        return self._collections is None or time.monotonic() - self._listed_at >= collections_cache_ttl
         
     def _collection_exists(self, collection_name: str) -> bool:
-        """Check the collection exist or not"""
+        """Check the collection exist or not (cached; a miss is confirmed with Qdrant)"""
         try:
-            logging.info("Checking for collection in Vector Database")
-            collections = self._list_collection()
-            return collection_name in collections
+            if self._collections_stale():
+                self._list_collection()
+            elif collection_name not in self._collections and self.client.collection_exists(collection_name):
+                self._collections.add(collection_name)     # created by another process
+            return collection_name in self._collections
         except CustomException as e:
             logging.error(f"Error in checking collection exist or not {str(e)}")
             raise CustomException(e, sys) from e
     
+    @observe_qdrant("create_collection")
     def create_collection(self, collection_name: str, vector_size: int = 768) -> bool:
         """Create new collection"""
         try:
@@ -69,16 +132,19 @@ class LongTermMemory:
                 return True
             
             logging.info("Creating new collection")
+            from qdrant_client.models import Distance, VectorParams
             self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
             )
+            self._collections.add(collection_name)
             logging.info("New collection created")
             return True
         except CustomException as e:
             logging.error(f"Error in creating collection; {str(e)}")
             raise CustomException(e, sys) from e
         
+    @observe_qdrant("delete_collection")
     def delete_collection(self, collection_name: str) -> bool:  
         """Delete the collection from the vector database"""
         try:
@@ -89,12 +155,97 @@ class LongTermMemory:
             
             logging.info("Deleting Collection")
             self.client.delete_collection(collection_name)  
+            self._collections.discard(collection_name)
             logging.info("Collection removed")
             return True
         except CustomException as e:
             logging.error(f"Error in deleting collection {str(e)}") 
             raise CustomException(e, sys) from e
         
+    @observe_qdrant("delete_points")
+    def delete_by_type(self, collection_name: str, doc_type: str) -> bool:
+        """Delete every point in the collection whose metadata.type matches"""
+        try:
+            if not self._collection_exists(collection_name=collection_name):
+                return False
+            from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(must=[FieldCondition(key="metadata.type", match=MatchValue(value=doc_type))])
+                ),
+            )
+            logging.info(f"Removed '{doc_type}' points from {collection_name}")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in deleting {doc_type} points : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _documents(data, metadata: Dict) -> List[Document]:
+        """Turn a string, a list of strings / Documents or anything else into Documents carrying `metadata`"""
+        if isinstance(data, str):
+            return [Document(page_content=data, metadata=dict(metadata))]
+        if isinstance(data, list):
+            documents = []
+            for item in data:
+                if isinstance(item, str):
+                    documents.append(Document(page_content=item, metadata=dict(metadata)))
+                elif isinstance(item, Document):
+                    # If it's already a Document, update its metadata
+                    item.metadata.update(metadata)
+                    documents.append(item)
+                else:
+                    # Convert other types to string
+                    documents.append(Document(page_content=str(item), metadata=dict(metadata)))
+            return documents
+        return [Document(page_content=str(data), metadata=dict(metadata))]
+
+    @staticmethod
+    def _metadata(doc_type: str, **scope) -> Dict:
+        """PII-stripped point metadata: timestamps, the collection or tenant, and the type"""
+        now = datetime.now()
+        return {"created_at": now.isoformat(), "timestamp": now.timestamp(), **scope, "type": doc_type}
+
+    @staticmethod
+    def _points(documents: List[Document], vectors: List[List[float]], ids: Optional[List[str]] = None) -> List:
+        """Points in the langchain_qdrant payload layout (page_content + metadata)"""
+        from qdrant_client.models import PointStruct
+        ids = ids or [str(uuid4()) for _ in documents]
+        return [
+            PointStruct(id=point_id, vector=list(vector),
+                        payload={"page_content": doc.page_content, "metadata": doc.metadata})
+            for point_id, doc, vector in zip(ids, documents, vectors)
+        ]
+
+    @staticmethod
+    def _scored_documents(response) -> List:
+        """[(Document, score)] best first, from a `query_points` response"""
+        return [
+            (Document(page_content=point.payload.get("page_content") or "",
+                      metadata=point.payload.get("metadata") or {}), point.score)
+            for point in response.points
+        ]
+
+    def _upsert(self, collection_name: str, documents: List[Document]) -> None:
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        self.client.upsert(collection_name=collection_name, points=self._points(documents, vectors))
+
+    def _similarity_search(self, collection_name: str, query: str, k: int, query_filter=None) -> List:
+        """
+        [(Document, score)] best first.  Queries through `query_points`: the
+        langchain wrapper still calls `QdrantClient.search`, which qdrant-client 1.18 removed.
+        """
+        response = self.client.query_points(
+            collection_name=collection_name,
+            query=self.embeddings.embed_query(query),
+            query_filter=query_filter,
+            limit=k,
+            with_payload=True,
+        )
+        return self._scored_documents(response)
+
+    @observe_qdrant("upsert")
     def ingest_data(self, collection_name: str, data: str, additional_metadata: Dict = None) -> bool:
         """Ingest the data in the collection of the Vector Database with datetime metadata"""
         try:
@@ -104,128 +255,325 @@ class LongTermMemory:
                 self.create_collection(collection_name=collection_name, vector_size=768)
             
             # Build PII-stripped metadata — only 4 allowed fields
-            metadata = {
-                "created_at": datetime.now().isoformat(),
-                "timestamp": datetime.now().timestamp(),
-                "collection": collection_name,
-                "type": additional_metadata.get("type", "conversation_summary") if additional_metadata else "conversation_summary"
-            }
-            
-            # Convert data to Document objects with metadata
-            if isinstance(data, str):
-                documents = [Document(page_content=data, metadata=metadata)]
-            elif isinstance(data, list):
-                documents = []
-                for item in data:
-                    if isinstance(item, str):
-                        documents.append(Document(page_content=item, metadata=metadata))
-                    elif isinstance(item, Document):
-                        # If it's already a Document, update its metadata
-                        item.metadata.update(metadata)
-                        documents.append(item)
-                    else:
-                        # Convert other types to string
-                        documents.append(Document(page_content=str(item), metadata=metadata))
-            else:
-                # Handle other data types
-                documents = [Document(page_content=str(data), metadata=metadata)]
-            
-            # Debug: Log document metadata
-            # logging.info(f"Document metadata before ingesting: {documents[0].metadata}")
-            
-            # logging.info("Ingesting data")
-            qdrant = Qdrant.from_documents(
-                documents,
-                self.embeddings,
-                url=self.qdrant_url,
-                collection_name=collection_name,
-                prefer_grpc=False
-            )
+            doc_type = additional_metadata.get("type", "conversation_summary") if additional_metadata else "conversation_summary"
+            metadata = self._metadata(doc_type, collection=collection_name)
+            self._upsert(collection_name, self._documents(data, metadata))
             logging.info("Data ingested successfully")
             return True
         except CustomException as e:
             logging.error(f"Error in inserting data : {str(e)}")
             raise CustomException(e, sys) from e
 
+    # ------------------------------------------------------------------ #
+    #  Shared, multi-tenant memory collection                             #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _type_filter(doc_type: Optional[str]):
+        if doc_type is None:
+            return None
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        return Filter(must=[FieldCondition(key=TYPE_KEY, match=MatchValue(value=doc_type))])
+
+    @staticmethod
+    def _memory_indexes() -> List:
+        """(field, schema) of the memory collection's payload indexes; `is_tenant` co-locates each user's points"""
+        from qdrant_client.models import KeywordIndexParams, KeywordIndexType
+        return [
+            (TENANT_KEY, KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)),
+            (TYPE_KEY, KeywordIndexParams(type=KeywordIndexType.KEYWORD)),
+        ]
+
+    @staticmethod
+    def _memory_filter(tenant: Optional[str] = None, doc_type: Optional[str] = None):
+        """Filter on the tenant and/or type payload indexes (None when neither is given)"""
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        conditions = [
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in ((TENANT_KEY, tenant), (TYPE_KEY, doc_type)) if value is not None
+        ]
+        return Filter(must=conditions) if conditions else None
+
+    def ensure_memory_collection(self) -> None:
+        """Create the shared memory collection and its tenant / type payload indexes, once per process"""
+        if self._memory_collection_ready:
+            return
+        try:
+            self.create_collection(collection_name=memory_collection, vector_size=768)
+            for field_name, field_schema in self._memory_indexes():   # idempotent
+                self.client.create_payload_index(
+                    collection_name=memory_collection, field_name=field_name, field_schema=field_schema,
+                )
+            self._memory_collection_ready = True
+        except CustomException as e:
+            logging.error(f"Error in preparing memory collection : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("upsert")
+    def add_memories(self, tenant: str, data, doc_type: str = "conversation_summary") -> bool:
+        """Ingest `data` as `doc_type` points of `tenant` into the shared memory collection"""
+        try:
+            self.ensure_memory_collection()
+            # PII-stripped metadata: the tenant is the user's unique_name
+            metadata = self._metadata(doc_type, tenant=tenant)
+            self._upsert(memory_collection, self._documents(data, metadata))
+            logging.info(f"{doc_type} memory ingested for {tenant}")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in inserting memory : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("delete_points")
+    def delete_memories(self, tenant: str, doc_type: str) -> bool:
+        """Delete the `doc_type` points of `tenant` from the shared memory collection"""
+        try:
+            self.ensure_memory_collection()
+            from qdrant_client.models import FilterSelector
+            self.client.delete(
+                collection_name=memory_collection,
+                points_selector=FilterSelector(filter=self._memory_filter(tenant, doc_type)),
+            )
+            logging.info(f"Removed '{doc_type}' memory of {tenant}")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in deleting {doc_type} memory : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("search")
+    def search_memories(self, query: str, tenant: str, k: int = top_collection_search,
+                        doc_type: Optional[str] = None) -> List:
+        """`tenant`'s memories most similar to `query`, optionally only `doc_type` points"""
+        try:
+            self.ensure_memory_collection()
+            return self._similarity_search(memory_collection, query, k, self._memory_filter(tenant, doc_type))
+        except CustomException as e:
+            logging.info(f"Error in memory search {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("search")
+    def search_all_memories(self, query: str, k: int = top_database_search,
+                            doc_type: Optional[str] = None) -> List:
+        """Global top-k over every tenant's memories, best first; `doc.metadata["tenant"]` names the user"""
+        try:
+            self.ensure_memory_collection()
+            return self._similarity_search(memory_collection, query, k, self._memory_filter(doc_type=doc_type))
+        except CustomException as e:
+            logging.info(f"Error in memory search {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("bulk_upsert")
     async def StoreInMemory2(self, collection_name: str, data_path: str, chunk_size: int = 500 , chunk_overlap: int= 20) -> bool:
         """
-        Store the PDF data in the database
+        Index the PDFs under `data_path`; only new or changed files are embedded (see `ingest_schemes`)
         """
         try:
             logging.info("Storing PDF data")
-            loader = DirectoryLoader(data_path, glob="**/*.pdf", use_multithreading=True, show_progress=True)
-            documets = loader.load()
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size = chunk_size,
-                chunk_overlap = chunk_overlap
-            )
-            texts = text_splitter.split_documents(documents=documets)
-            logging.info(f"Processing {len(texts)} text chunks for collection {collection_name}")
-            qdrant = Qdrant.from_documents(
-                texts,
-                self.embeddings,
-                url = self.qdrant_url,
-                collection_name = collection_name,
-                prefer_grpc = False
+            import asyncio
+            from src.ai_component.modules.memory.ingest_schemes import ingest
+            counts = await asyncio.to_thread(
+                ingest, self, data_path=data_path, collection_name=collection_name,
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap,
             )
+            logging.info(f"PDF ingestion into {collection_name}: {counts}")
             return True
         except CustomException as e:
             logging.error(f"Error in Pdf storing : {str(e)}")
             raise CustomException(e, sys) from e
 
-
-        
-    def search_in_collection(self, query: str, collection_name: str, k: int = top_collection_search) -> List:
-        """Search in the collection"""
+    @observe_qdrant("search")
+    def search_in_collection(self, query: str, collection_name: str, k: int = top_collection_search,
+                             doc_type: Optional[str] = None) -> List:
+        """Search in the collection, optionally only points whose metadata.type is `doc_type`"""
         try:
             if not self._collection_exists(collection_name=collection_name):
                 return []
             logging.info("Search in collection ")
-            db = Qdrant(
-                client=self.client,
-                collection_name=collection_name,
-                embeddings=self.embeddings
-            )
-            docs = db.similarity_search_with_score(query=query, k=k)
+            docs = self._similarity_search(collection_name, query, k, self._type_filter(doc_type))
             logging.info("relevant docs find with score")
             return docs
         except CustomException as e:
             logging.info(f"Error in similarity search {str(e)}") 
             raise CustomException(e, sys) from e
     
-    def search_across_collections(self, query: str, k: int = top_database_search, exclude_collections: List[str] = None) -> Dict:
-        """Search across multiple collections, with option to exclude specific collections"""
+    def search_across_collections(self, query: str, k: int = top_database_search) -> Dict:
+        """One global top-k search over all users' memories, grouped as {tenant: [(doc, score)]}"""
         try:
             logging.info("Search in database")
-            results = {}
-            
-            # Default collections to exclude from user search
-            if exclude_collections is None:
-                exclude_collections = ["Government_scheme", "Government_scheme_metadata"]
-            
-            for collection_name in self._list_collection():
-                if collection_name in exclude_collections:
-                    logging.info(f"Skipping collection: {collection_name}")
-                    continue
-                    
-                if self._collection_exists(collection_name):
-                    docs = self.search_in_collection(query, collection_name, k) 
-                    results[collection_name] = docs
-                else:
-                    results[collection_name] = []
-                    print(f"Collection '{collection_name}' not found")
-            
+            results: Dict[str, List] = {}
+            for doc, score in self.search_all_memories(query, k):
+                results.setdefault(doc.metadata.get("tenant", ""), []).append((doc, score))
             return results
         except CustomException as e:
             logging.info(f"Error in collections search {str(e)}")
             raise CustomException(e, sys) from e
         
+    # ------------------------------------------------------------------ #
+    #  Async API (AsyncQdrantClient) for the graph nodes and tools        #
+    # ------------------------------------------------------------------ #
+
+    @observe_qdrant("list_collections")
+    async def _alist_collection(self) -> List[str]:
+        """Give all the collection in Vector Database"""
+        try:
+            collections = await self.async_client.get_collections()
+            names = [collection.name for collection in collections.collections]
+            self._collections = set(names)
+            self._listed_at = time.monotonic()
+            return names
+        except CustomException as e:
+            logging.error(f"Error in finding list of collections {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def _acollection_exists(self, collection_name: str) -> bool:
+        """Check the collection exist or not (cached; a miss is confirmed with Qdrant)"""
+        if self._collections_stale():
+            await self._alist_collection()
+        elif collection_name not in self._collections and await self.async_client.collection_exists(collection_name):
+            self._collections.add(collection_name)     # created by another process
+        return collection_name in self._collections
+
+    @observe_qdrant("create_collection")
+    async def acreate_collection(self, collection_name: str, vector_size: int = 768) -> bool:
+        """Create new collection"""
+        try:
+            if await self._acollection_exists(collection_name):
+                return True
+            from qdrant_client.models import Distance, VectorParams
+            await self.async_client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
+            )
+            self._collections.add(collection_name)
+            logging.info(f"New collection {collection_name} created")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in creating collection; {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("delete_collection")
+    async def adelete_collection(self, collection_name: str) -> bool:
+        """Delete the collection from the vector database"""
+        try:
+            if not await self._acollection_exists(collection_name):
+                return False
+            await self.async_client.delete_collection(collection_name)
+            self._collections.discard(collection_name)
+            logging.info(f"Collection {collection_name} removed")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in deleting collection {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def _aupsert(self, collection_name: str, documents: List[Document]) -> None:
+        vectors = await self.embeddings.aembed_documents([doc.page_content for doc in documents])
+        await self.async_client.upsert(collection_name=collection_name, points=self._points(documents, vectors))
+
+    async def _asimilarity_search(self, collection_name: str, query: str, k: int, query_filter=None) -> List:
+        response = await self.async_client.query_points(
+            collection_name=collection_name,
+            query=await self.embeddings.aembed_query(query),
+            query_filter=query_filter,
+            limit=k,
+            with_payload=True,
+        )
+        return self._scored_documents(response)
+
+    @observe_qdrant("upsert")
+    async def aingest_data(self, collection_name: str, data: str, additional_metadata: Dict = None) -> bool:
+        """Ingest the data in the collection of the Vector Database with datetime metadata"""
+        try:
+            await self.acreate_collection(collection_name=collection_name, vector_size=768)
+            doc_type = additional_metadata.get("type", "conversation_summary") if additional_metadata else "conversation_summary"
+            metadata = self._metadata(doc_type, collection=collection_name)
+            await self._aupsert(collection_name, self._documents(data, metadata))
+            logging.info("Data ingested successfully")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in inserting data : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("search")
+    async def asearch_in_collection(self, query: str, collection_name: str, k: int = top_collection_search,
+                                    doc_type: Optional[str] = None) -> List:
+        """Search in the collection, optionally only points whose metadata.type is `doc_type`"""
+        try:
+            if not await self._acollection_exists(collection_name):
+                return []
+            return await self._asimilarity_search(collection_name, query, k, self._type_filter(doc_type))
+        except CustomException as e:
+            logging.info(f"Error in similarity search {str(e)}")
+            raise CustomException(e, sys) from e
+
+    async def aensure_memory_collection(self) -> None:
+        """Create the shared memory collection and its tenant / type payload indexes, once per process"""
+        if self._memory_collection_ready:
+            return
+        try:
+            await self.acreate_collection(collection_name=memory_collection, vector_size=768)
+            for field_name, field_schema in self._memory_indexes():   # idempotent
+                await self.async_client.create_payload_index(
+                    collection_name=memory_collection, field_name=field_name, field_schema=field_schema,
+                )
+            self._memory_collection_ready = True
+        except CustomException as e:
+            logging.error(f"Error in preparing memory collection : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("upsert")
+    async def aadd_memories(self, tenant: str, data, doc_type: str = "conversation_summary") -> bool:
+        """Ingest `data` as `doc_type` points of `tenant` into the shared memory collection"""
+        try:
+            await self.aensure_memory_collection()
+            await self._aupsert(memory_collection, self._documents(data, self._metadata(doc_type, tenant=tenant)))
+            logging.info(f"{doc_type} memory ingested for {tenant}")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in inserting memory : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("delete_points")
+    async def adelete_memories(self, tenant: str, doc_type: str) -> bool:
+        """Delete the `doc_type` points of `tenant` from the shared memory collection"""
+        try:
+            await self.aensure_memory_collection()
+            from qdrant_client.models import FilterSelector
+            await self.async_client.delete(
+                collection_name=memory_collection,
+                points_selector=FilterSelector(filter=self._memory_filter(tenant, doc_type)),
+            )
+            logging.info(f"Removed '{doc_type}' memory of {tenant}")
+            return True
+        except CustomException as e:
+            logging.error(f"Error in deleting {doc_type} memory : {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("search")
+    async def asearch_memories(self, query: str, tenant: str, k: int = top_collection_search,
+                               doc_type: Optional[str] = None) -> List:
+        """`tenant`'s memories most similar to `query`, optionally only `doc_type` points"""
+        try:
+            await self.aensure_memory_collection()
+            return await self._asimilarity_search(memory_collection, query, k, self._memory_filter(tenant, doc_type))
+        except CustomException as e:
+            logging.info(f"Error in memory search {str(e)}")
+            raise CustomException(e, sys) from e
+
+    @observe_qdrant("search")
+    async def asearch_all_memories(self, query: str, k: int = top_database_search,
+                                   doc_type: Optional[str] = None) -> List:
+        """Global top-k over every tenant's memories, best first; `doc.metadata["tenant"]` names the user"""
+        try:
+            await self.aensure_memory_collection()
+            return await self._asimilarity_search(memory_collection, query, k, self._memory_filter(doc_type=doc_type))
+        except CustomException as e:
+            logging.info(f"Error in memory search {str(e)}")
+            raise CustomException(e, sys) from e
+
 memory = LongTermMemory()  
 
 if __name__ == "__main__":
     memory = LongTermMemory() 
-    memory.create_collection("ay7472")
-    memory.ingest_data("ay7472", "hii, My name is Alok and i am from varanasi Uttar pradesh")
+    memory.add_memories("ay7472", "hii, My name is Alok and i am from varanasi Uttar pradesh")
 
-    result = memory.search_in_collection("where alok live", "ay7472", 1)
+    result = memory.search_memories("where alok live", "ay7472", 1)
     print(result)
\ No newline at end of file
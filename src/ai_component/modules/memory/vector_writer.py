@@ -0,0 +1,192 @@
+"""
+Buffered, batched writes of memory points to Qdrant.
+
+Every summary write used to embed its texts and upsert its points on its
+own, so ingestion cost one embedding request and one upsert per call.
+`VectorWriter` collects documents across requests and writes them in
+batches of `vector_write_batch_size`:
+
+  * one `aembed_documents` call per batch, one bulk upsert per collection,
+    up to `vector_write_concurrency` batches in flight
+  * a batch is written as soon as it is full, or after
+    `vector_write_flush_interval` seconds
+  * at-least-once — point ids are assigned when a document is buffered, so a
+    failed batch goes back to the front of the buffer and is retried by the
+    next flush without creating duplicates; a point is dropped (and
+    counted) only after `vector_write_max_attempts` failed flushes
+  * back-pressure — past `vector_write_max_pending` points the producer
+    flushes inline
+  * `aclose()` flushes what is left on shutdown
+
+Writes that must be ordered with a delete (profile replacement) go to
+`LongTermMemory` directly.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from langchain.schema import Document
+
+from src.ai_component.config import (
+    memory_collection,
+    vector_write_batch_size,
+    vector_write_flush_interval,
+    vector_write_max_pending,
+    vector_write_max_attempts,
+    vector_write_concurrency,
+)
+from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.logger import logging
+from src.ai_component.metrics import QUEUE_DEPTH
+
+
+@dataclass
+class PendingPoint:
+    collection_name: str
+    id: str
+    document: Document
+    attempts: int = 0
+
+
+class VectorWriter:
+    """Buffers documents across requests; embeds and upserts them in batches."""
+
+    def __init__(
+        self,
+        vector_store=memory,
+        batch_size: int = vector_write_batch_size,
+        flush_interval: float = vector_write_flush_interval,
+        max_pending: int = vector_write_max_pending,
+        max_attempts: int = vector_write_max_attempts,
+        concurrency: int = vector_write_concurrency,
+    ):
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self._pending: List[PendingPoint] = []
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "buffered": 0, "written": 0, "batches": 0, "inline_flushes": 0, "errors": 0, "dropped": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------ #
+    #  Producers                                                          #
+    # ------------------------------------------------------------------ #
+
+    async def add_memories(self, tenant: str, data, doc_type: str = "conversation_summary") -> int:
+        """Buffer `data` as `doc_type` points of `tenant`; returns the number of points buffered."""
+        await self.vector_store.aensure_memory_collection()
+        metadata = self.vector_store._metadata(doc_type, tenant=tenant)
+        return await self._buffer(memory_collection, self.vector_store._documents(data, metadata))
+
+    async def ingest_data(self, collection_name: str, data, additional_metadata: Dict = None) -> int:
+        """Buffer `data` for a shared collection, as `LongTermMemory.ingest_data` would write it."""
+        await self.vector_store.acreate_collection(collection_name=collection_name, vector_size=768)
+        doc_type = (additional_metadata or {}).get("type", "conversation_summary")
+        metadata = self.vector_store._metadata(doc_type, collection=collection_name)
+        return await self._buffer(collection_name, self.vector_store._documents(data, metadata))
+
+    async def _buffer(self, collection_name: str, documents: List[Document]) -> int:
+        self._pending.extend(PendingPoint(collection_name, str(uuid4()), doc) for doc in documents)
+        self.stats["buffered"] += len(documents)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_periodically())
+        if len(self._pending) >= self.max_pending:
+            # Back-pressure: the producer pays for the flush instead of growing the buffer
+            self.stats["inline_flushes"] += 1
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._full.set()
+        return len(documents)
+
+    # ------------------------------------------------------------------ #
+    #  Flushing                                                           #
+    # ------------------------------------------------------------------ #
+
+    async def _write(self, batch: List[PendingPoint]) -> None:
+        """One embedding call for the batch, then one upsert per collection."""
+        vectors = await self.vector_store.embeddings.aembed_documents([p.document.page_content for p in batch])
+        by_collection = sorted(zip(batch, vectors), key=lambda pair: pair[0].collection_name)
+        for collection_name, group in groupby(by_collection, key=lambda pair: pair[0].collection_name):
+            points, group_vectors = zip(*group)
+            await self.vector_store.async_client.upsert(
+                collection_name=collection_name,
+                points=self.vector_store._points(
+                    [p.document for p in points], list(group_vectors), ids=[p.id for p in points],
+                ),
+            )
+
+    async def _write_batch(self, batch: List[PendingPoint]) -> None:
+        """Write one batch; on failure put it back at the front of the buffer."""
+        try:
+            await self._write(batch)
+        except asyncio.CancelledError:
+            self._pending[:0] = batch     # not a failed attempt; the next flush writes it
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            retry = [p for p in batch if p.attempts + 1 < self.max_attempts]
+            for point in retry:
+                point.attempts += 1
+            if len(retry) < len(batch):
+                self.stats["dropped"] += len(batch) - len(retry)
+                logging.error(f"Dropped {len(batch) - len(retry)} vector points after {self.max_attempts} attempts")
+            self._pending[:0] = retry
+            raise
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+
+    async def flush(self) -> None:
+        """Write everything buffered; failed batches stay buffered and the first error is raised."""
+        async with self._flush_lock:
+            self._full.clear()
+            while self._pending:
+                batches = []
+                while self._pending and len(batches) < self.concurrency:
+                    batches.append(self._pending[:self.batch_size])
+                    del self._pending[:self.batch_size]
+                results = await asyncio.gather(*(self._write_batch(b) for b in batches), return_exceptions=True)
+                errors = [r for r in results if isinstance(r, BaseException)]
+                if errors:
+                    raise errors[0]
+
+    async def _flush_periodically(self) -> None:
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.warning(f"Vector write flush failed, retrying: {str(e)}")
+                await asyncio.sleep(self.flush_interval)
+
+    async def aclose(self) -> None:
+        """Flush on shutdown."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+vector_writer = VectorWriter()
+
+QUEUE_DEPTH.labels("vector_write_buffer").set_function(lambda: vector_writer.pending)
@@ -0,0 +1,95 @@
+"""
+Unit tests for the Prometheus instrumentation.
+
+Values are read back from the default registry, so every assertion compares
+a before/after delta rather than an absolute count.
+"""
+
+import inspect
+import unittest
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.ai_component.metrics import instrument_engine, statement_labels, timed_node
+from src.ai_component.tools.tool_cache import CachedTool
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@tool
+async def lookup_price(commodity: str) -> str:
+    """Return a canned mandi price."""
+    return f"{commodity}: 2300"
+
+
+class TestTimedNode(unittest.IsolatedAsyncioTestCase):
+
+    async def test_records_duration_and_keeps_signature(self):
+        async def node(state: dict, config: RunnableConfig) -> dict:
+            return {"seen": config["configurable"]["thread_id"]}
+
+        wrapped = timed_node("test_node", node)
+        self.assertIn("config", inspect.signature(wrapped).parameters)
+
+        before = sample("kisan_node_duration_seconds_count", node="test_node", status="ok")
+        result = await wrapped({}, {"configurable": {"thread_id": "t1"}})
+        self.assertEqual(result, {"seen": "t1"})
+        self.assertEqual(sample("kisan_node_duration_seconds_count", node="test_node", status="ok"), before + 1)
+
+    async def test_failure_is_labelled(self):
+        async def node(state: dict) -> dict:
+            raise ValueError("boom")
+
+        before = sample("kisan_node_duration_seconds_count", node="failing_node", status="error")
+        with self.assertRaises(ValueError):
+            await timed_node("failing_node", node)({})
+        self.assertEqual(sample("kisan_node_duration_seconds_count", node="failing_node", status="error"), before + 1)
+
+
+class TestToolCallbacks(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cached_tool_separates_call_and_upstream(self):
+        cached = CachedTool(lookup_price, ttl=60)
+        labels = {"tool": "lookup_price", "status": "ok"}
+        calls = sample("kisan_tool_duration_seconds_count", stage="call", **labels)
+        upstream = sample("kisan_tool_duration_seconds_count", stage="upstream", **labels)
+
+        await cached.ainvoke({"commodity": "Onion"})
+        await cached.ainvoke({"commodity": "onion"})     # served from the cache
+
+        self.assertEqual(sample("kisan_tool_duration_seconds_count", stage="call", **labels), calls + 2)
+        self.assertEqual(sample("kisan_tool_duration_seconds_count", stage="upstream", **labels), upstream + 1)
+
+
+class TestQueryInstrumentation(unittest.TestCase):
+
+    def test_statement_labels(self):
+        self.assertEqual(statement_labels('SELECT users.id FROM "users" WHERE id = $1'), ("SELECT", "users"))
+        self.assertEqual(statement_labels("INSERT INTO chats (thread_id) VALUES ($1)"), ("INSERT", "chats"))
+        self.assertEqual(statement_labels("  update schema_versions set version = 1"), ("UPDATE", "schema_versions"))
+        self.assertEqual(statement_labels("SELECT 1"), ("SELECT", "-"))
+
+    def test_engine_queries_are_timed(self):
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        ok = sample("kisan_db_query_duration_seconds_count", verb="CREATE", table="farms", status="ok")
+        failed = sample("kisan_db_query_duration_seconds_count", verb="SELECT", table="missing", status="error")
+
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE farms (id INTEGER)"))
+            with self.assertRaises(Exception):
+                conn.execute(text("SELECT * FROM missing"))
+
+        self.assertEqual(sample("kisan_db_query_duration_seconds_count", verb="CREATE", table="farms", status="ok"), ok + 1)
+        self.assertEqual(
+            sample("kisan_db_query_duration_seconds_count", verb="SELECT", table="missing", status="error"), failed + 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
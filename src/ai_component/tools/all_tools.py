@@ -1,15 +1,40 @@
-from src.ai_component.tools.web_seach_tool import web_tool
-from src.ai_component.tools.rag_tool import rag_tool
-from src.ai_component.tools.gov_scheme_tool import gov_scheme_tool
-from src.ai_component.tools.weather_tool import weather_forecast_tool, weather_report_tool
-from src.ai_component.tools.mandi_report_tool import mandi_report_tool
-from src.ai_component.tools.call_tool import call_tool
+from importlib import import_module
+
+from src.ai_component.tools.tool_cache import cached
+
+
+class _LazyTool:
+    """
+    Class attribute that imports its tool module on first access.
+
+    The tool modules pull in pandas, Tavily, Qdrant and friends; loading them
+    only when a workflow first binds or runs the tool keeps process start-up
+    cheap. On first access the descriptor replaces itself with the (cached)
+    tool, so later lookups are plain attribute reads.
+    """
+
+    def __init__(self, module: str, attr: str, cache: bool = True):
+        self.module = module
+        self.attr = attr
+        self.cache = cache
+        self.name = attr
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        tool = getattr(import_module(self.module), self.attr)
+        if self.cache:
+            tool = cached(tool)
+        setattr(owner, self.name, tool)
+        return tool
+
 
 class Tools:
-    web_tool = web_tool
-    rag_tool = rag_tool
-    gov_scheme_tool = gov_scheme_tool
-    weather_forecast_tool = weather_forecast_tool 
-    weather_report_tool = weather_report_tool
-    mandi_report_tool = mandi_report_tool
-    call_tool = call_tool
\ No newline at end of file
+    web_tool = _LazyTool("src.ai_component.tools.web_seach_tool", "web_tool")
+    rag_tool = _LazyTool("src.ai_component.tools.rag_tool", "rag_tool", cache=False)
+    gov_scheme_tool = _LazyTool("src.ai_component.tools.gov_scheme_tool", "gov_scheme_tool")
+    weather_forecast_tool = _LazyTool("src.ai_component.tools.weather_tool", "weather_forecast_tool")
+    weather_report_tool = _LazyTool("src.ai_component.tools.weather_tool", "weather_report_tool")
+    mandi_report_tool = _LazyTool("src.ai_component.tools.mandi_report_tool", "mandi_report_tool")
+    call_tool = _LazyTool("src.ai_component.tools.call_tool", "call_tool", cache=False)
@@ -1,28 +1,32 @@
 """
 Government Scheme RAG Tool
 ──────────────────────────
-Searches the 'Government_scheme' Qdrant Cloud collection for relevant content.
+Searches the 'Government_scheme' Qdrant Cloud collection for relevant content:
+an in-process BM25 index over its chunks and the vector search, fused by
+reciprocal rank fusion (see `scheme_search`).
 
-On first use (or if the collection is empty) the tool automatically ingests the
-PDFs from the `data/` folder into Qdrant Cloud.  Because Qdrant Cloud is
-persistent, the data only needs to be uploaded once — subsequent restarts skip
-ingestion automatically.
+The collection is filled offline from the PDFs in `data/` by the incremental
+indexer:
+
+    python -m src.ai_component.modules.memory.ingest_schemes
+
+A request never ingests; if the collection is empty the tool says so and logs
+the command to run.
 """
 
-import os
 import asyncio
 from typing import Type, ClassVar
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field, ConfigDict
 
+from src.ai_component.config import scheme_collection, scheme_search_k
 from src.ai_component.logger import logging
-from src.ai_component.modules.memory.vector_store import memory
+from src.ai_component.modules.memory.scheme_search import scheme_retriever
 
 
-COLLECTION_NAME = "Government_scheme"
-# Relative to the project root (same dir as Dockerfile / docker-compose.yml)
-DATA_PATH = "data"
+COLLECTION_NAME = scheme_collection
+INGEST_COMMAND = "python -m src.ai_component.modules.memory.ingest_schemes"
 
 
 class SchemeToolInput(BaseModel):
@@ -41,56 +45,19 @@ class SchemeTool(BaseTool):
     )
     args_schema: Type[SchemeToolInput] = SchemeToolInput
     model_config = ConfigDict(extra="allow")
-    memory: ClassVar = memory
+    retriever: ClassVar = scheme_retriever
 
     # ------------------------------------------------------------------ #
-    #  Ingestion check — based purely on whether the cloud collection     #
-    #  already has vectors.  No local metadata collection needed.         #
+    #  Readiness check — cached by the retriever, whose BM25 index load   #
+    #  doubles as the check.  Ingestion runs offline (ingest_schemes).    #
     # ------------------------------------------------------------------ #
 
-    def _collection_has_data(self) -> bool:
-        """Return True if the Qdrant Cloud collection exists and is non-empty."""
-        try:
-            if not self.memory._collection_exists(COLLECTION_NAME):
-                return False
-            info = self.memory.client.get_collection(COLLECTION_NAME)
-            return info.vectors_count is not None and info.vectors_count > 0
-        except Exception as e:
-            logging.warning(f"Could not check collection state: {e}")
-            return False
-
-    async def _ingest_pdfs(self) -> bool:
-        """Upload PDFs from DATA_PATH into the Qdrant Cloud collection."""
-        if not os.path.isdir(DATA_PATH):
-            logging.error(f"Data directory '{DATA_PATH}' not found — cannot ingest PDFs.")
-            return False
-
-        pdf_files = [f for f in os.listdir(DATA_PATH) if f.lower().endswith(".pdf")]
-        if not pdf_files:
-            logging.error(f"No PDF files found in '{DATA_PATH}'.")
-            return False
-
-        logging.info(f"Ingesting {len(pdf_files)} PDF(s) into '{COLLECTION_NAME}' on Qdrant Cloud…")
-        try:
-            result = await self.memory.StoreInMemory2(
-                collection_name=COLLECTION_NAME,
-                data_path=DATA_PATH,
-            )
-            if result:
-                logging.info("PDF ingestion into Qdrant Cloud completed successfully.")
-            return result
-        except Exception as e:
-            logging.error(f"PDF ingestion failed: {e}")
-            return False
-
     async def _ensure_data_ready(self) -> bool:
-        """Ingest PDFs if the cloud collection is empty."""
-        if self._collection_has_data():
-            logging.info(f"'{COLLECTION_NAME}' collection already has data — skipping ingestion.")
+        """True if the collection has been indexed; never ingests inside a request."""
+        if await self.retriever.ready():
             return True
-
-        logging.info(f"'{COLLECTION_NAME}' is empty or missing — running ingestion pipeline.")
-        return await self._ingest_pdfs()
+        logging.error(f"'{COLLECTION_NAME}' is empty or missing — index the PDFs with `{INGEST_COMMAND}`.")
+        return False
 
     # ------------------------------------------------------------------ #
     #  Tool run methods                                                    #
@@ -104,14 +71,10 @@ class SchemeTool(BaseTool):
             if not await self._ensure_data_ready():
                 return (
                     "⚠️ Government scheme data is not available. "
-                    "Please ensure the PDF files are present in the data/ directory."
+                    "The scheme documents have not been indexed yet."
                 )
 
-            results = self.memory.search_in_collection(
-                query=query,
-                collection_name=COLLECTION_NAME,
-                k=4,
-            )
+            results = await self.retriever.search(query, k=scheme_search_k)
 
             if not results:
                 return f"No relevant government scheme information found for: {query}"
@@ -8,6 +8,7 @@ import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from src.ai_component.config import data_gov_base_url
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
 
@@ -41,7 +42,7 @@ class MandiPriceForecastTool(BaseTool):
     
     # Define class attributes
     api_key: str = api_key
-    base_url: str = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+    base_url: str = f"{data_gov_base_url}/resource/9ef84268-d588-465a-a308-a864a43d0070"
 
     def _build_filters(self, **kwargs) -> Dict[str, str]:
         """Build filters dictionary for API request."""
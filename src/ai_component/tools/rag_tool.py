@@ -9,42 +9,38 @@ from src.ai_component.modules.memory.vector_store import memory
 class RAGToolInput(BaseModel):
     query: str = Field(..., description="The query to search for people with similar problems or expertise in specific locations")
 
-def search_people_from_vector_store(query: str, k: int = 10) -> str:
+async def search_people_from_vector_store(query: str, k: int = 10) -> str:
     """Search for people with similar problems using vector store"""
     try:
         logging.info(f"Searching vector store for query: {query}")
-        search_results = memory.search_across_collections(query, k)
+        # One global top-k over every user's memories, best match first
+        search_results = await memory.asearch_all_memories(query, k)
         if not search_results:
             return "No people found with similar problems in the database."
         
         all_matches = []
-        for collection_name, docs_with_scores in search_results.items():
-            if docs_with_scores: 
-                for doc, score in docs_with_scores:
-                    metadata = doc.metadata
-                    content = doc.page_content
-                    person = {
-                        "collection_name": collection_name,
-                        "name": metadata.get("user_name", "Unknown"),
-                        "phone": metadata.get("user_phone", "Not available"),
-                        "address": metadata.get("user_address", "Location not specified"),
-                        "user_id": metadata.get("user_id", "N/A"),
-                        "problem_summary": content,
-                        "similarity_score": float(score)
-                    }
-                    all_matches.append(person)
+        for doc, score in search_results:
+            metadata = doc.metadata
+            content = doc.page_content
+            person = {
+                "collection_name": metadata.get("tenant", ""),
+                "name": metadata.get("user_name", "Unknown"),
+                "phone": metadata.get("user_phone", "Not available"),
+                "address": metadata.get("user_address", "Location not specified"),
+                "user_id": metadata.get("user_id", "N/A"),
+                "problem_summary": content,
+                "similarity_score": float(score)
+            }
+            all_matches.append(person)
         
         if not all_matches:
             return "No people found with similar problems."
         
-        # Sort by similarity score
-        all_matches.sort(key=lambda x: x["similarity_score"])
-        
-        # Removing duplicates
+        # Removing duplicates: keep each user's best match
         seen_users = set()
         unique_matches = []
         for match in all_matches:
-            user_key = f"{match['name']}_{match['phone']}"
+            user_key = match["collection_name"] or f"{match['name']}_{match['phone']}"
             if user_key not in seen_users:
                 seen_users.add(user_key)
                 unique_matches.append(match)
@@ -80,7 +76,7 @@ class RAGTool(BaseTool):
         """Async version of the RAG tool."""
         try:
             logging.info(f"Running RAG tool with query: {query}")
-            result = search_people_from_vector_store(query)
+            result = await search_people_from_vector_store(query)
             logging.info(f"RAG tool completed search")
             return result
         except Exception as e:
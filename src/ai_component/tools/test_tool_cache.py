@@ -0,0 +1,127 @@
+"""
+Unit tests for the TTL + single-flight tool cache.
+
+A counting in-memory tool stands in for the weather / mandi / search APIs.
+"""
+
+import time
+import asyncio
+import unittest
+from typing import Type
+
+from langchain.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.ai_component.tools.tool_cache import CachedTool, cached
+
+
+class PlaceInput(BaseModel):
+    place: str = Field(..., description="Place name")
+    days: int = Field(default=5, description="Days")
+
+
+class CountingTool(BaseTool):
+    name: str = "counting_tool"
+    description: str = "Returns how often the upstream was called."
+    args_schema: Type[PlaceInput] = PlaceInput
+    calls: int = 0
+    fail: bool = False
+
+    def _run(self, place: str, days: int = 5) -> str:
+        self.calls += 1
+        return f"{place}:{days}:{self.calls}"
+
+    async def _arun(self, place: str, days: int = 5) -> str:
+        await asyncio.sleep(0.02)
+        self.calls += 1
+        if self.fail:
+            return "Error: upstream unavailable"
+        return f"{place}:{days}:{self.calls}"
+
+
+class TestCachedTool(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.inner = CountingTool()
+        self.tool = CachedTool(self.inner, ttl=60, stale_ttl=60, max_entries=2)
+
+    def test_wrapper_keeps_tool_identity(self):
+        self.assertEqual(self.tool.name, "counting_tool")
+        self.assertIs(self.tool.args_schema, PlaceInput)
+
+    async def test_normalised_arguments_share_an_entry(self):
+        first = await self.tool.ainvoke({"place": "Patna"})
+        second = await self.tool.ainvoke({"place": "  patna ", "days": 5})
+        self.assertEqual(first, second)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(self.tool.get_stats()["hits"], 1)
+
+    async def test_single_flight(self):
+        results = await asyncio.gather(*(self.tool.ainvoke({"place": "Patna"}) for _ in range(5)))
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(self.tool.get_stats()["coalesced"], 4)
+
+    async def test_cancelled_caller_does_not_fail_coalesced_callers(self):
+        leader = asyncio.create_task(self.tool.ainvoke({"place": "Patna"}))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(self.tool.ainvoke({"place": "Patna"}))
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual(await follower, "Patna:5:1")
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(await self.tool.ainvoke({"place": "Patna"}), "Patna:5:1")   # cached
+        self.assertEqual(self.inner.calls, 1)
+
+    async def test_background_refresh_is_referenced_until_done(self):
+        await self.tool.ainvoke({"place": "Patna"})
+        for entry in self.tool._entries.values():
+            entry.fresh_until = time.monotonic() - 1
+        await self.tool.ainvoke({"place": "Patna"})
+        [refresh] = self.tool._tasks
+        await refresh
+        await asyncio.sleep(0)
+        self.assertEqual((self.tool._tasks, self.tool._inflight), (set(), {}))
+
+    async def test_stale_while_revalidate(self):
+        first = await self.tool.ainvoke({"place": "Patna"})
+        for entry in self.tool._entries.values():
+            entry.fresh_until = time.monotonic() - 1
+        stale = await self.tool.ainvoke({"place": "Patna"})
+        self.assertEqual(stale, first)                   # served immediately
+        await asyncio.sleep(0.05)                        # background refresh lands
+        fresh = await self.tool.ainvoke({"place": "Patna"})
+        self.assertNotEqual(fresh, first)
+        self.assertEqual(self.inner.calls, 2)
+        stats = self.tool.get_stats()
+        self.assertEqual((stats["stale_hits"], stats["refreshes"]), (1, 1))
+
+    async def test_expired_entries_are_refetched(self):
+        await self.tool.ainvoke({"place": "Patna"})
+        for entry in self.tool._entries.values():
+            entry.fresh_until = entry.stale_until = time.monotonic() - 1
+        await self.tool.ainvoke({"place": "Patna"})
+        self.assertEqual(self.inner.calls, 2)
+
+    async def test_errors_are_not_cached(self):
+        self.inner.fail = True
+        await self.tool.ainvoke({"place": "Patna"})
+        await self.tool.ainvoke({"place": "Patna"})
+        self.assertEqual(self.inner.calls, 2)
+        self.assertEqual(self.tool.get_stats()["entries"], 0)
+
+    async def test_lru_size_limit(self):
+        for place in ("Patna", "Pune", "Agra"):
+            await self.tool.ainvoke({"place": place})
+        stats = self.tool.get_stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+
+    def test_only_configured_tools_are_wrapped(self):
+        self.assertIs(cached(self.inner, settings={}), self.inner)
+        wrapped = cached(self.inner, settings={"counting_tool": {"ttl": 5}})
+        self.assertIsInstance(wrapped, CachedTool)
+        self.assertEqual(wrapped.ttl, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+TTL + single-flight cache layer for LangChain tools.
+
+Weather, mandi, scheme and web-search tools used to hit their upstream APIs
+on every call, even when many farmers asked the same thing at once.
+`CachedTool` wraps any `BaseTool` under the same name, description and
+argument schema (so `bind_tools` and `ToolNode` see no difference) and adds
+
+  * keys built from the schema-validated, normalised arguments
+  * a per-tool TTL and LRU size limit (`tool_cache_settings`)
+  * stale-while-revalidate — for `stale_ttl` seconds after expiry the old
+    result is served while one background call refreshes it
+  * single-flight — concurrent identical calls share one upstream request,
+    run as its own task so a cancelled caller does not fail the others
+
+Results that look like tool errors are never cached.
+"""
+
+import re
+import json
+import time
+import asyncio
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from langchain.tools import BaseTool
+from pydantic import PrivateAttr
+
+from src.ai_component.config import tool_cache_settings
+from src.ai_component.logger import logging
+
+
+ERROR_PREFIXES = ("Error", "❌")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip().lower()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, str) and result.lstrip().startswith(ERROR_PREFIXES)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class CachedTool(BaseTool):
+    """A BaseTool that serves repeated calls of the wrapped tool from memory."""
+
+    tool: BaseTool
+    ttl: float = 300.0
+    stale_ttl: float = 0.0
+    max_entries: int = 256
+
+    _entries: "OrderedDict[str, _Entry]" = PrivateAttr(default_factory=OrderedDict)
+    _inflight: Dict[str, asyncio.Task] = PrivateAttr(default_factory=dict)
+    _tasks: Set[asyncio.Task] = PrivateAttr(default_factory=set)    # strong refs until done
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {
+        "hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+        "refreshes": 0, "errors": 0, "evictions": 0,
+    })
+
+    def __init__(self, tool: BaseTool, **kwargs):
+        super().__init__(
+            tool=tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            return_direct=tool.return_direct,
+            **kwargs,
+        )
+
+    # ------------------------------------------------------------------ #
+    #  Keys and storage                                                   #
+    # ------------------------------------------------------------------ #
+
+    def cache_key(self, kwargs: Dict[str, Any]) -> str:
+        """Schema-validated (defaults filled in), normalised, order-independent key."""
+        args = dict(kwargs)
+        schema = self.tool.args_schema
+        if isinstance(schema, type) and hasattr(schema, "model_validate"):
+            try:
+                args = schema.model_validate(args).model_dump()
+            except Exception:
+                pass
+        return json.dumps(_normalize(args), sort_keys=True, default=str)
+
+    def _store(self, key: str, value: Any) -> None:
+        if _is_error(value):
+            return
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # ------------------------------------------------------------------ #
+    #  Upstream calls                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def _call(self, key: str, kwargs: Dict[str, Any]) -> Any:
+        try:
+            result = await self.tool.ainvoke(kwargs)
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        self._store(key, result)
+        return result
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here, so a call nobody waits for any more (a background refresh) is still logged
+            logging.warning(f"{self.name} call failed: {task.exception()}")
+
+    def _start(self, key: str, kwargs: Dict[str, Any]) -> asyncio.Task:
+        """The upstream call for `key`: the one in flight, or a new task that outlives its callers."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call(key, kwargs))
+            task.add_done_callback(functools.partial(self._done, key))
+            self._inflight[key] = task
+            self._tasks.add(task)
+        return task
+
+    async def _fetch(self, key: str, kwargs: Dict[str, Any]) -> Any:
+        """Call the wrapped tool once per key, however many callers are waiting."""
+        if key in self._inflight:
+            self._stats["coalesced"] += 1
+        # Shielded: a cancelled caller leaves the call running for the others
+        return await asyncio.shield(self._start(key, kwargs))
+
+    # ------------------------------------------------------------------ #
+    #  BaseTool interface                                                 #
+    # ------------------------------------------------------------------ #
+
+    async def _arun(self, **kwargs) -> Any:
+        key = self.cache_key(kwargs)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.fresh_until:
+            self._stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self._stats["stale_hits"] += 1
+            if key not in self._inflight:
+                self._stats["refreshes"] += 1
+                self._start(key, kwargs)
+            return entry.value
+
+        self._stats["misses"] += 1
+        return await self._fetch(key, kwargs)
+
+    def _run(self, **kwargs) -> Any:
+        key = self.cache_key(kwargs)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry.fresh_until:
+            self._stats["hits"] += 1
+            return entry.value
+        self._stats["misses"] += 1
+        result = self.tool.invoke(kwargs)
+        self._store(key, result)
+        return result
+
+    # ------------------------------------------------------------------ #
+    #  Metrics                                                            #
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        return stats
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cached_tools: Dict[str, CachedTool] = {}
+
+
+def cached(tool: BaseTool, settings: Optional[Dict[str, Dict[str, float]]] = None) -> BaseTool:
+    """Wrap a tool if it has an entry in `tool_cache_settings`, else return it unchanged."""
+    options = (tool_cache_settings if settings is None else settings).get(tool.name)
+    if not options:
+        return tool
+    wrapped = CachedTool(tool, **options)
+    _cached_tools[tool.name] = wrapped
+    return wrapped
+
+
+def tool_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit / miss / coalesce counters per cached tool."""
+    return {name: tool.get_stats() for name, tool in _cached_tools.items()}
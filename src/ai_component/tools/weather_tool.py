@@ -1,3 +1,4 @@
+import os
 import sys
 import asyncio
 import aiohttp
@@ -5,7 +6,7 @@ import requests
 from pydantic import BaseModel, Field
 from typing import Type
 from langchain.tools import BaseTool
-from src.ai_component.config import DEFAULT_FORECAST_COUNT, DEFAULT_DAYS
+from src.ai_component.config import DEFAULT_FORECAST_COUNT, DEFAULT_DAYS, openweather_base_url, weatherstack_base_url
 from src.ai_component.logger import logging
 from src.ai_component.exception import CustomException
 
@@ -56,7 +57,7 @@ class WeatherForecastTool(BaseTool):
             
             forecast_count = self._calculate_forecast_count(days)
             
-            base_url = "https://api.openweathermap.org/data/2.5/forecast"
+            base_url = f"{openweather_base_url}/data/2.5/forecast"
             params = {
                 "q": place,
                 "appid": api_key,
@@ -91,7 +92,7 @@ class WeatherForecastTool(BaseTool):
             
             forecast_count = self._calculate_forecast_count(days)
             
-            base_url = "https://api.openweathermap.org/data/2.5/forecast"
+            base_url = f"{openweather_base_url}/data/2.5/forecast"
             params = {
                 "q": place,
                 "appid": api_key,
@@ -165,7 +166,7 @@ class WeatherReportTool(BaseTool):
             if not api_key:
                 raise ValueError("WEATHERSTACK_API_KEY is not set in environment variables.")
             
-            base_url = f'https://api.weatherstack.com/current?access_key={api_key}&query={place}'
+            base_url = f'{weatherstack_base_url}/current?access_key={api_key}&query={place}'
             async with aiohttp.ClientSession() as session:
                 async with session.get(base_url) as response:
                     if response.status == 200:
@@ -189,7 +190,7 @@ class WeatherReportTool(BaseTool):
             if not api_key:
                 raise ValueError("WEATHERSTACK_API_KEY is not set in environment variables.")
             
-            base_url = f'https://api.weatherstack.com/current?access_key={api_key}&query={place}'
+            base_url = f'{weatherstack_base_url}/current?access_key={api_key}&query={place}'
             response = requests.get(base_url)
             if response.status_code == 200:
                 data = response.json()
@@ -1,10 +1,10 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 import uvicorn
 from contextlib import asynccontextmanager
 
-from src.backend.routers import auth, chat, user
+from src.backend.routers import auth, chat, user, media
 from src.backend.core.config import settings
 from src.backend.core.auth import verify_token
 
@@ -41,6 +41,14 @@ async def lifespan(app: FastAPI):
         print("Initialising LangGraph compiled graph...")
         await get_graph()
         print("LangGraph components ready.")
+
+        from src.ai_component.modules.memory.ingestion_queue import memory_ingestion_queue
+        memory_ingestion_queue.start()
+        print("Memory ingestion workers started.")
+
+        from src.ai_component.modules.memory.scheme_search import scheme_retriever
+        scheme_retriever.start()
+        print("Government scheme BM25 index loading in the background.")
     except Exception as e:
         print(f"Error initialising LangGraph components: {e}")
         # Non-fatal: server can still serve auth + user routes;
@@ -53,6 +61,29 @@ async def lifespan(app: FastAPI):
     # Shutdown
     # ------------------------------------------------------------------
     print("Shutting down Project-Kisan Backend...")
+    try:
+        # Flush queued memories while the store connection is still open
+        from src.ai_component.modules.memory.ingestion_queue import memory_ingestion_queue
+        await memory_ingestion_queue.drain()
+    except Exception as e:
+        print(f"Error draining memory ingestion queue: {e}")
+    try:
+        # Let in-flight rolling summary updates reach the store
+        from src.ai_component.modules.memory.conversation_summary import conversation_summaries
+        await conversation_summaries.aclose()
+    except Exception as e:
+        print(f"Error finishing conversation summary updates: {e}")
+    try:
+        # Then write the summary vectors the drain buffered
+        from src.ai_component.modules.memory.vector_writer import vector_writer
+        await vector_writer.aclose()
+    except Exception as e:
+        print(f"Error flushing buffered vector writes: {e}")
+    try:
+        from src.ai_component.modules.memory.scheme_search import scheme_retriever
+        await scheme_retriever.aclose()
+    except Exception as e:
+        print(f"Error stopping the scheme index refresh: {e}")
     try:
         from src.ai_component.graph.graph import cleanup_database
         await cleanup_database()
@@ -96,11 +127,45 @@ app.include_router(
     tags=["User"],
     dependencies=[Depends(verify_token)],
 )
+# Content-addressed media URLs (see routers/media.py for why there is no auth)
+app.include_router(media.router, prefix="/api/v1/media", tags=["Media"])
 
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "version": "2.0.0"}
+    from src.ai_component.modules.memory.ingestion_queue import memory_ingestion_queue
+    from src.ai_component.modules.cache.semantic_cache import semantic_cache
+    from src.ai_component.tools.tool_cache import tool_cache_stats
+    from src.ai_component.modules.cache.embedding_cache import embedding_cache_stats
+    from src.ai_component.modules.memory.vector_writer import vector_writer
+    from src.ai_component.modules.memory.scheme_search import scheme_retriever
+    from src.ai_component.graph.utils.speculation import speculator
+    from src.ai_component.modules.intent.intent_classifier import intent_classifier
+    from src.ai_component.modules.memory.conversation_summary import conversation_summaries
+    from src.ai_component.graph.graph import checkpoint_stats
+    from src.database.pool import pool_stats
+    return {
+        "status": "healthy",
+        "version": "2.0.0",
+        "memory_ingestion": memory_ingestion_queue.get_stats(),
+        "semantic_cache": semantic_cache.get_stats(),
+        "tool_cache": tool_cache_stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "vector_writer": vector_writer.get_stats(),
+        "scheme_search": scheme_retriever.get_stats(),
+        "intent_routing": intent_classifier.get_stats(),
+        "speculation": speculator.get_stats(),
+        "conversation_summary": conversation_summaries.get_stats(),
+        "checkpoints": checkpoint_stats(),
+        "db_pools": pool_stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (node, tool, LLM, Qdrant and SQL latencies, load gauges)."""
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 # ---------------------------------------------------------------------------
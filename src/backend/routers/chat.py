@@ -1,8 +1,7 @@
 import asyncio
 import json
-import base64
 from datetime import datetime
-from typing import Dict, Any, AsyncGenerator, List, Optional
+from typing import Dict, Any, AsyncGenerator, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Query, status, Depends
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
@@ -12,11 +11,14 @@ from src.backend.schemas.schemas import (
     MediaResponse, ThreadCreate, ThreadResponse
 )
 from src.backend.core.auth import verify_token
+from src.backend.utils.streaming import stream_answer, StreamStats
 from src.ai_component.graph.graph import (
-    process_query_async,
+    process_query_async, turn_input, CHECKPOINT_DURING,
     get_thread_messages, delete_thread, get_async_graph
 )
 from src.database.database import chat_db
+from src.ai_component.modules.media.media_store import media_store
+from src.ai_component.metrics import SSE_STREAMS
 
 router = APIRouter()
 
@@ -39,6 +41,28 @@ async def _get_owned_chat(thread_id: str, user_id: int):
     return chat
 
 
+# ---------------------------------------------------------------------------
+# Message history helpers
+# ---------------------------------------------------------------------------
+
+def _checkpoint_history(messages: list) -> List[Tuple[str, str, str]]:
+    """User and assistant text messages from a checkpoint, as history rows."""
+    history = []
+    for msg in messages:
+        if getattr(msg, "type", None) in ("human", "ai") and isinstance(msg.content, str) and msg.content:
+            role = "user" if msg.type == "human" else "assistant"
+            history.append((role, msg.content, "text"))
+    return history
+
+
+async def _record_turn(thread_id: str, query: str, reply: Optional[str], media_type: str = "text") -> None:
+    """Append a finished turn to the thread's history (also names and counts the chat)."""
+    messages = [("user", query, "text")]
+    if reply:
+        messages.append(("assistant", reply, media_type))
+    await chat_db.record_turn(thread_id, query, messages)
+
+
 # ---------------------------------------------------------------------------
 # POST /thread/create
 # ---------------------------------------------------------------------------
@@ -103,30 +127,41 @@ async def get_user_threads(
 @router.get("/thread/{thread_id}/messages")
 async def get_thread_messages_endpoint(
     thread_id: str,
+    limit: int = Query(default=50, ge=1, le=200, description="Max messages to return"),
+    before: Optional[int] = Query(
+        default=None, description="Cursor: return messages older than this (next_cursor of the previous page)"
+    ),
     current_user: Dict[str, Any] = Depends(verify_token)
 ):
-    """Return the ordered message history for a thread owned by the current user."""
-    await _get_owned_chat(thread_id, current_user["id"])
+    """
+    Return one page of a thread's message history, oldest first.
+
+    Pages come from the chat_messages table, newest page first; pass the
+    response's `next_cursor` as `before` to load older messages.  Threads
+    created before that table existed are copied in from their checkpoint
+    the first time they are opened.
+    """
+    chat = await _get_owned_chat(thread_id, current_user["id"])
 
     try:
-        messages = await get_thread_messages(thread_id)
+        if not chat.history_complete and chat.message_count > 0:
+            await chat_db.backfill_messages(thread_id, _checkpoint_history(await get_thread_messages(thread_id)))
+
+        rows, has_more = await chat_db.list_messages(thread_id, limit=limit, before=before)
 
         formatted_messages = []
-        for msg in messages:
-            if hasattr(msg, "content") and msg.content:
-                # Skip system messages
-                if hasattr(msg, "type") and msg.type == "system":
-                    continue
-                role = "user" if hasattr(msg, "type") and msg.type == "human" else "assistant"
-                formatted_messages.append({
-                    "role": role,
-                    "content": msg.content,
-                    "timestamp": getattr(msg, "additional_kwargs", {}).get(
-                        "timestamp", datetime.now().isoformat()
-                    ),
-                })
-
-        return {"thread_id": thread_id, "messages": formatted_messages}
+        for row in rows:
+            message = row.to_dict()
+            if row.media_type != "text":
+                message["content"] = media_store.url_for(row.content)
+            formatted_messages.append(message)
+
+        return {
+            "thread_id": thread_id,
+            "messages": formatted_messages,
+            "has_more": has_more,
+            "next_cursor": rows[0].seq if has_more else None,
+        }
 
     except HTTPException:
         raise
@@ -172,69 +207,52 @@ STALL_TIMEOUT = 30.0  # seconds — if no event arrives within this window it's
 
 async def _token_stream(
     query: str,
-    workflow: str,
+    workflow: Optional[str],
     thread_id: str,
     collection_name: str,
-) -> AsyncGenerator[str, None]:
+    reply: Optional[List[str]] = None,
+) -> AsyncGenerator[Dict[str, str], None]:
     """
-    Yield SSE frames: individual token chunks while graph runs, then event: done.
-    Uses astream_events(version="v2") to get per-token chunks from the LLM.
+    Yield SSE events: answer token chunks while the graph runs, then event: done.
+    Events are dicts that EventSourceResponse encodes into `event:` / `data:`
+    lines (pre-formatted strings would be wrapped in a second `data:` prefix).
+    Uses the answer-only streaming engine (LangGraph "messages" + "updates"
+    stream modes), so router, tool-selection and memory LLM output is never
+    forwarded.  The done frame carries time-to-first-token, chunks/sec and, when
+    the model reports usage, output tokens and tokens/sec.
+    Tokens are also appended to `reply`, when given, for the history table.
 
     Implements a 30-second stall timeout (Requirement 3.5): if no event is
     delivered from the graph for a continuous 30-second period the generator
     emits an error event and stops.
     """
+    SSE_STREAMS.inc()
     try:
         graph = await get_async_graph()
         config = {"configurable": {"thread_id": thread_id}}
-        state = {
-            "messages": [{"role": "user", "content": query}],
-            "collection_name": collection_name,
-            "current_activity": "",
-            "workflow": workflow,
-        }
-
-        # Wrap the async iterator so we can apply a per-event timeout.
-        # asyncio.wait_for(anext(...), timeout) raises asyncio.TimeoutError
-        # when no event arrives within STALL_TIMEOUT seconds, which satisfies
-        # Requirement 3.5 ("terminate the stream and emit an error event").
-        event_iter = graph.astream_events(state, config=config, version="v2").__aiter__()
-
-        while True:
-            try:
-                event = await asyncio.wait_for(
-                    event_iter.__anext__(),
-                    timeout=STALL_TIMEOUT,
-                )
-            except StopAsyncIteration:
-                # Graph finished without emitting on_chain_end/LangGraph —
-                # emit the fallback completion signal.
-                break
-            except asyncio.TimeoutError:
-                yield (
-                    f"event: error\n"
-                    f"data: {json.dumps({'detail': 'Streaming stall: no response within 30 seconds'})}\n\n"
-                )
-                return
-
-            kind = event["event"]
-            if kind == "on_chat_model_stream":
-                chunk = event["data"]["chunk"]
-                token = chunk.content if hasattr(chunk, "content") else ""
-                if token:
-                    yield f"data: {json.dumps({'content': token, 'type': 'token'})}\n\n"
-            elif kind == "on_chain_end" and event.get("name") == "LangGraph":
-                yield f"event: done\ndata: {{}}\n\n"
-                return
-
-        # Fallback completion signal if on_chain_end/LangGraph wasn't emitted
-        yield f"event: done\ndata: {{}}\n\n"
+        state = turn_input(query, workflow, collection_name)
+
+        stats = StreamStats()
+        try:
+            async for token in stream_answer(
+                graph, state, config, stats=stats, stall_timeout=STALL_TIMEOUT, checkpoint_during=CHECKPOINT_DURING,
+            ):
+                if reply is not None:
+                    reply.append(token)
+                yield {"data": json.dumps({"content": token, "type": "token"})}
+        except asyncio.TimeoutError:
+            yield {
+                "event": "error",
+                "data": json.dumps({"detail": "Streaming stall: no response within 30 seconds"}),
+            }
+            return
+
+        yield {"event": "done", "data": json.dumps(stats.as_dict())}
 
     except Exception as e:
-        yield (
-            f"event: error\n"
-            f"data: {json.dumps({'detail': str(e)})}\n\n"
-        )
+        yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+    finally:
+        SSE_STREAMS.dec()
 
 
 # ---------------------------------------------------------------------------
@@ -264,18 +282,14 @@ async def stream_chat_message(
     thread_id = message.thread_id
     collection_name = current_user["unique_name"]
 
-    # Check if this is the first message before streaming so we can name it after
-    msg_count = await chat_db.get_message_count(thread_id)
-
-    async def named_stream() -> AsyncGenerator[str, None]:
+    async def named_stream() -> AsyncGenerator[Dict[str, str], None]:
+        reply: List[str] = []
         async for frame in _token_stream(
-            message.query, message.workflow, thread_id, collection_name
+            message.query, message.workflow, thread_id, collection_name, reply
         ):
             yield frame
-        # After stream completes, set name on first message and increment count
-        if msg_count == 0:
-            await chat_db.set_chat_name(thread_id, message.query)
-        await chat_db.increment_message_count(thread_id)
+        # After stream completes, record the turn (names the chat on its first message)
+        await _record_turn(thread_id, message.query, "".join(reply))
 
     return EventSourceResponse(
         named_stream(),
@@ -292,7 +306,7 @@ async def stream_chat_message(
 async def stream_chat_message_get(
     query: str = Query(..., description="The user's message text"),
     thread_id: str = Query(..., description="Thread identifier"),
-    workflow: str = Query(default="GeneralNode", description="Workflow routing hint"),
+    workflow: Optional[str] = Query(default=None, description="Optional workflow routing hint"),
     current_user: Dict[str, Any] = Depends(verify_token),
 ):
     """
@@ -308,14 +322,11 @@ async def stream_chat_message_get(
 
     collection_name = current_user["unique_name"]
 
-    msg_count = await chat_db.get_message_count(thread_id)
-
-    async def named_stream() -> AsyncGenerator[str, None]:
-        async for frame in _token_stream(query, workflow, thread_id, collection_name):
+    async def named_stream() -> AsyncGenerator[Dict[str, str], None]:
+        reply: List[str] = []
+        async for frame in _token_stream(query, workflow, thread_id, collection_name, reply):
             yield frame
-        if msg_count == 0:
-            await chat_db.set_chat_name(thread_id, query)
-        await chat_db.increment_message_count(thread_id)
+        await _record_turn(thread_id, query, "".join(reply))
 
     return EventSourceResponse(
         named_stream(),
@@ -362,26 +373,31 @@ async def send_chat_message(
 
         # Determine response media type
         media_type = "text"
-        content = "No response generated"
+        reply = None
 
-        if result.get("voice"):
+        # Generated media lives in the media store; the response carries its URL
+        if result.get("voice_ref"):
             media_type = "voice"
-            content = base64.b64encode(result["voice"]).decode("utf-8")
-        elif result.get("image"):
+            reply = result["voice_ref"]
+        elif result.get("image_ref"):
             media_type = "image"
-            content = base64.b64encode(result["image"]).decode("utf-8")
+            reply = result["image_ref"]
         else:
             media_type = "text"
             for msg in reversed(result.get("messages", [])):
                 if hasattr(msg, "content") and msg.content and msg.content.strip():
-                    content = msg.content
+                    reply = msg.content
                     break
 
-        # Auto-name on first message, then increment counter
-        msg_count = await chat_db.get_message_count(thread_id)
-        if msg_count == 0:
-            await chat_db.set_chat_name(thread_id, message.query)
-        await chat_db.increment_message_count(thread_id)
+        # Record the turn in the history table (names the chat on its first message)
+        await _record_turn(thread_id, message.query, reply, media_type)
+
+        if reply is None:
+            content = "No response generated"
+        elif media_type == "text":
+            content = reply
+        else:
+            content = media_store.url_for(reply)
 
         return MediaResponse(
             content=content,
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, Response, status
+
+from src.ai_component.modules.media.media_store import media_store, content_type_of
+
+router = APIRouter()
+
+
+@router.get("/{ref}")
+async def get_media(ref: str):
+    """
+    Serve a generated image or voice reply by its media store reference.
+
+    References are the SHA-256 of the content, so a URL is only known to the
+    client it was returned to; no bearer token is required, which lets
+    `<img>` / `<audio>` tags load it directly.  Content never changes under a
+    reference, so responses are cacheable forever.
+    """
+    data = await media_store.get(ref)
+    if data is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media not found")
+    return Response(
+        content=data,
+        media_type=content_type_of(ref),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
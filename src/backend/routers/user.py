@@ -1,9 +1,10 @@
 from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, BackgroundTasks
 
 from src.backend.schemas.schemas import UserResponse, UserUpdate
 from src.backend.core.auth import verify_token
 from src.database.database import user_db, farmer_location_db
+from src.ai_component.modules.memory.profile_seeder import profile_seeder
 
 router = APIRouter()
 
@@ -17,6 +18,7 @@ async def get_user_profile(current_user: Dict[str, Any] = Depends(verify_token))
 @router.put("/profile", response_model=UserResponse)
 async def update_user_profile(
     user_update: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: Dict[str, Any] = Depends(verify_token),
 ):
     """Update current user's profile."""
@@ -51,6 +53,10 @@ async def update_user_profile(
             country=update_data.get("country") or updated_dict.get("country"),
         )
 
+    # Re-seed the profile vector off the request path; a no-op if the
+    # profile text did not actually change.
+    background_tasks.add_task(profile_seeder.reseed, current_user["unique_name"])
+
     return UserResponse(**updated_dict)
 
 
@@ -63,6 +69,7 @@ async def delete_user_account(current_user: Dict[str, Any] = Depends(verify_toke
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to delete user account",
         )
+    await profile_seeder.delete_profile(current_user["unique_name"])
     return {"message": "Account deleted successfully"}
 
 
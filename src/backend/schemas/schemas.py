@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal, Union, List
+from typing import Optional, Literal, List
 from datetime import datetime
 
 
@@ -125,7 +125,7 @@ class ChatMessage(BaseModel):
         "MandiNode",
         "GovSchemeNode",
         "CarbonFootprintNode",
-    ]] = "GeneralNode"
+    ]] = None
     thread_id: Optional[str] = None
     stream: bool = True
 
@@ -146,7 +146,7 @@ class ChatStreamChunk(BaseModel):
 
 
 class MediaResponse(BaseModel):
-    content: Union[str, bytes]
+    content: str                  # answer text, or the media URL for image / voice
     media_type: Literal["text", "image", "voice"]
     thread_id: str
     timestamp: datetime
@@ -0,0 +1,154 @@
+"""
+Answer-only token streaming for the chat router.
+
+`astream_events(version="v2")` emits an event for every runnable in the graph
+and forwards tokens from every chat model — including the router's structured
+output, tool-selection passes and the memory summariser.  This engine uses
+LangGraph's "messages" and "updates" stream modes instead and forwards only
+text produced inside the answering nodes.
+
+Answer nodes that never call an LLM (semantic cache hits, CarbonFootprintNode)
+return a complete AIMessage; it is forwarded as a single chunk when no token
+was streamed for the turn.  Time-to-first-token and chunks/sec are measured
+for every response; output tokens (and tokens/sec) come from the model's
+usage metadata and are None when the provider does not report it.
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.ai_component.logger import logging
+from src.ai_component.metrics import GRAPH_RUNS_IN_FLIGHT, STREAM_TTFT
+
+# Nodes whose model output is the user-facing answer
+ANSWER_NODES = frozenset({
+    "GeneralNode",
+    "DiseaseNode",
+    "WeatherNode",
+    "MandiNode",
+    "GovSchemeNode",
+    "CarbonFootprintNode",
+    "semantic_cache_node",
+})
+
+
+@dataclass
+class StreamStats:
+    started_at: float = field(default_factory=time.perf_counter)
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+    chars: int = 0
+    output_tokens: Optional[int] = None     # from usage_metadata, when the model reports it
+    workflow: Optional[str] = None
+
+    def record(self, text: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+        self.chars += len(text)
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        if usage and usage.get("output_tokens") is not None:
+            self.output_tokens = (self.output_tokens or 0) + usage["output_tokens"]
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return round((self.first_token_at - self.started_at) * 1000, 1)
+
+    def _rate(self, count: Optional[int]) -> Optional[float]:
+        if count is None or self.first_token_at is None or self.finished_at is None:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        return round(count / elapsed, 1) if elapsed > 0 else None
+
+    @property
+    def chunks_per_sec(self) -> Optional[float]:
+        return self._rate(self.chunks)
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        return self._rate(self.output_tokens)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workflow": self.workflow,
+            "ttft_ms": self.ttft_ms,
+            "chunks": self.chunks,
+            "chunks_per_sec": self.chunks_per_sec,
+            "output_tokens": self.output_tokens,
+            "tokens_per_sec": self.tokens_per_sec,
+            "total_ms": round(((self.finished_at or time.perf_counter()) - self.started_at) * 1000, 1),
+        }
+
+
+async def stream_answer(
+    graph,
+    state: Dict[str, Any],
+    config: Dict[str, Any],
+    stats: Optional[StreamStats] = None,
+    stall_timeout: Optional[float] = None,
+    checkpoint_during: Optional[bool] = None,
+) -> AsyncIterator[str]:
+    """
+    Run the graph and yield the answer text as it is produced.
+
+    Raises asyncio.TimeoutError when no graph output arrives for
+    `stall_timeout` seconds.  `checkpoint_during` is passed through to the
+    run (see graph/utils/checkpointing.py).
+    """
+    stats = stats if stats is not None else StreamStats()
+    streamed = False
+    stream = graph.astream(
+        state, config=config, stream_mode=["messages", "updates"], checkpoint_during=checkpoint_during,
+    ).__aiter__()
+    GRAPH_RUNS_IN_FLIGHT.labels("stream").inc()
+
+    try:
+        while True:
+            try:
+                mode, payload = await asyncio.wait_for(stream.__anext__(), timeout=stall_timeout)
+            except StopAsyncIteration:
+                break
+
+            if mode == "updates":
+                route = payload.get("route_node") if isinstance(payload, dict) else None
+                if route and route.get("workflow"):
+                    stats.workflow = route["workflow"]
+                continue
+
+            message, metadata = payload
+            if metadata.get("langgraph_node") not in ANSWER_NODES:
+                continue
+
+            if isinstance(message, AIMessageChunk):
+                if message.tool_call_chunks:
+                    continue                    # tool-selection pass, not answer text
+                stats.record_usage(message.usage_metadata)
+                text = message.content if isinstance(message.content, str) else ""
+                if text:
+                    streamed = True
+                    stats.record(text)
+                    yield text
+            elif isinstance(message, AIMessage) and not streamed and not message.tool_calls:
+                # Answer assembled without a streaming LLM call (cache hit, static reply)
+                if message.content:
+                    streamed = True
+                    stats.record(message.content)
+                    yield message.content
+    finally:
+        stats.finish()
+        GRAPH_RUNS_IN_FLIGHT.labels("stream").dec()
+        if stats.first_token_at is not None:
+            STREAM_TTFT.labels(stats.workflow or "unknown").observe(stats.first_token_at - stats.started_at)
+        await stream.aclose()
+        logging.info(f"Streamed answer: {stats.as_dict()}")
@@ -8,13 +8,16 @@ No SQLite.  No local fallback.
 
 import os
 import uuid
-from typing import Optional, List, Dict, Any
+import hashlib
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy import select, update, delete, text
 from sqlalchemy.exc import IntegrityError
 
 from src.ai_component.logger import logging
+from src.ai_component.metrics import instrument_engine
+from src.database.pool import engine_options, instrument_engine_pool
 
 # ---------------------------------------------------------------------------
 # Engine / session factory
@@ -39,7 +42,7 @@ def _make_asyncpg_url(raw: str) -> str:
       - 'channel_binding' param     → must be removed
       - 'sslmode'                   → use connect_args instead
 
-    We strip all query params and pass ssl=True via connect_args.
+    We strip all query params and pass ssl via connect_args (see _ssl_required).
     """
     from urllib.parse import urlparse, urlunparse
     # Ensure scheme is recognised by SQLAlchemy's asyncpg dialect
@@ -49,23 +52,112 @@ def _make_asyncpg_url(raw: str) -> str:
     clean = urlunparse(parsed._replace(query=""))
     return clean
 
+def _ssl_required(raw: str) -> bool:
+    """
+    Neon always requires TLS.  A local Postgres (e.g. the load-test harness)
+    can opt out with `sslmode=disable` in the connection string.
+    """
+    from urllib.parse import urlparse, parse_qs
+    return parse_qs(urlparse(raw).query).get("sslmode", [""])[0] != "disable"
+
 NEON_API = _make_asyncpg_url(_raw_neon)
+NEON_SSL = _ssl_required(_raw_neon)
+
+# The engine (and the asyncpg dialect behind it) is created on first use so
+# importing this module does not pay for it.
+_engine = None
+_session_factory = None
+
+
+def get_engine():
+    """Return the process-wide async engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        # Pool sizing, recycling and idle checks are shared with the LangGraph pool
+        _engine = create_async_engine(
+            NEON_API,
+            echo=False,
+            connect_args={"ssl": NEON_SSL},
+            **engine_options(),
+        )
+        instrument_engine(_engine)
+        instrument_engine_pool(_engine)
+    return _engine
+
 
-engine = create_async_engine(
-    NEON_API,
-    pool_pre_ping=True,
-    echo=False,
-    connect_args={"ssl": True},   # Neon always requires TLS
-)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+def AsyncSessionLocal() -> AsyncSession:
+    """Open a new session on the shared engine (drop-in for the old sessionmaker)."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False, class_=AsyncSession)
+    return _session_factory()
+
+
+# Columns added after the first deploy — create_all() never alters existing
+# tables, so these idempotent statements bring older databases up to date.
+_SCHEMA_PATCHES = [
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_hash VARCHAR(64)",
+    "ALTER TABLE chats ADD COLUMN IF NOT EXISTS last_seq INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE chats ADD COLUMN IF NOT EXISTS history_complete BOOLEAN NOT NULL DEFAULT FALSE",
+]
+
+
+def schema_fingerprint() -> str:
+    """
+    Version of the relational schema: a hash of every table's DDL plus the
+    patches above, so any model change invalidates the stored marker.
+    """
+    from sqlalchemy.schema import CreateTable
+    from src.database.models import Base
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table)).encode("utf-8"))
+    for patch in _SCHEMA_PATCHES:
+        digest.update(patch.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+async def schema_is_current(component: str, version: str) -> bool:
+    """True when `component`'s schema marker already matches `version`."""
+    from src.database.models import SchemaVersion
+    try:
+        async with AsyncSessionLocal() as session:
+            marker = await session.get(SchemaVersion, component)
+            return marker is not None and marker.version == version
+    except Exception as e:
+        # Fresh database: the marker table itself does not exist yet
+        logging.info(f"No schema marker for {component}: {str(e).splitlines()[0]}")
+        return False
+
+
+async def mark_schema_current(component: str, version: str) -> None:
+    """Record that `component`'s schema has been set up at `version`."""
+    from src.database.models import SchemaVersion
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.merge(SchemaVersion(component=component, version=version))
+            await session.commit()
+    except Exception as e:
+        logging.warning(f"Could not record schema marker for {component}: {str(e)}")
 
 
 async def init_db() -> None:
-    """Create all tables on Neon Postgres if they do not already exist."""
+    """
+    Create all tables on Neon Postgres if they do not already exist.
+
+    Skipped on warm databases whose schema marker matches the current models.
+    """
     from src.database.models import Base  # local import avoids circular deps
-    async with engine.begin() as conn:
+    version = schema_fingerprint()
+    if await schema_is_current("app", version):
+        logging.info(f"Neon Postgres schema already at {version}; skipping create_all")
+        return
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    logging.info("Neon Postgres tables initialised (create_all)")
+        for patch in _SCHEMA_PATCHES:
+            await conn.execute(text(patch))
+    await mark_schema_current("app", version)
+    logging.info(f"Neon Postgres tables initialised (create_all), schema {version}")
 
 
 # ---------------------------------------------------------------------------
@@ -137,6 +229,7 @@ class UserDatabase:
                     d = user.to_dict()
                     d["hashed_password"] = user.hashed_password
                     d["password_hash"] = user.hashed_password  # backwards compat alias
+                    d["profile_hash"] = user.profile_hash
                     return d
                 return None
             except Exception as e:
@@ -234,6 +327,22 @@ class UserDatabase:
                 logging.error(f"Error deleting user: {e}")
                 return False
 
+    async def set_profile_hash(self, unique_name: str, profile_hash: Optional[str]) -> None:
+        """Record which profile version has been seeded into the vector store."""
+        from src.database.models import User
+
+        async with AsyncSessionLocal() as session:
+            try:
+                await session.execute(
+                    update(User)
+                    .where(User.unique_name == unique_name.lower().strip())
+                    .values(profile_hash=profile_hash)
+                )
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logging.error(f"Error set_profile_hash: {e}")
+
     async def user_exists(self, unique_name: str) -> bool:
         """Return True if unique_name exists."""
         from src.database.models import User
@@ -253,6 +362,32 @@ class UserDatabase:
 # ChatDatabase
 # ---------------------------------------------------------------------------
 
+def unrecorded_history(
+    checkpoint: Sequence[Tuple[str, str, str]],
+    recorded: Sequence[Tuple[str, str]],
+) -> List[Tuple[str, str, str]]:
+    """
+    The checkpoint messages from before the first turn in chat_messages.
+
+    `recorded` is the thread's `(role, content)` rows from seq 1 on.  A
+    recorded turn can differ from its checkpoint messages (no reply saved,
+    a media reference instead of the text), so the rows are matched to the
+    checkpoint by the content of their user messages, newest first, not by
+    position.  If none matches, the whole checkpoint is unrecorded.
+    """
+    questions = [content for role, content in recorded if role == "user"]
+    boundary = len(checkpoint)
+    for question in reversed(questions):
+        for i in range(boundary - 1, -1, -1):
+            role, content, _ = checkpoint[i]
+            if role == "user" and content == question:
+                boundary = i
+                break
+        else:
+            break           # no earlier match: the rest were never checkpointed
+    return list(checkpoint[:boundary])
+
+
 class ChatDatabase:
     """Async CRUD for the `chats` table."""
 
@@ -372,6 +507,125 @@ class ChatDatabase:
                 logging.error(f"Error get_message_count: {e}")
                 return 0
 
+    # ------------------------------------------------------------------ #
+    #  Message history (chat_messages)                                    #
+    # ------------------------------------------------------------------ #
+
+    async def record_turn(
+        self,
+        thread_id: str,
+        first_message: str,
+        messages: Sequence[Tuple[str, str, str]],
+    ) -> None:
+        """
+        Append a completed turn's `(role, content, media_type)` messages.
+
+        One transaction replaces the old name / count / timestamp updates:
+        the chat row is updated first, which hands out this turn's seq range
+        and holds the row lock so concurrent turns on a thread cannot collide.
+        The chat is named from `first_message` if it has no name yet.
+        """
+        from src.database.models import Chat, ChatMessageRecord
+        from sqlalchemy import func
+
+        name = (first_message.strip() or "New Chat")[:50]
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await session.execute(
+                    update(Chat)
+                    .where(Chat.thread_id == thread_id)
+                    .values(
+                        message_count=Chat.message_count + 1,
+                        last_seq=Chat.last_seq + len(messages),
+                        name=func.coalesce(Chat.name, name),
+                        updated_at=func.now(),
+                    )
+                    .returning(Chat.last_seq)
+                    .execution_options(synchronize_session=False)
+                )
+                last_seq = result.scalar_one_or_none()
+                if last_seq is None:
+                    logging.warning(f"record_turn: chat {thread_id} not found")
+                    return
+                first_seq = last_seq - len(messages) + 1
+                session.add_all([
+                    ChatMessageRecord(thread_id=thread_id, seq=first_seq + i,
+                                      role=role, content=content, media_type=media_type)
+                    for i, (role, content, media_type) in enumerate(messages)
+                ])
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logging.error(f"Error record_turn: {e}")
+
+    async def list_messages(
+        self,
+        thread_id: str,
+        limit: int = 50,
+        before: Optional[int] = None,
+    ) -> Tuple[List, bool]:
+        """
+        Return up to `limit` messages older than seq `before` (newest page
+        when None), oldest first, and whether older messages remain.
+        Served from the (thread_id, seq) index; cost is O(limit).
+        """
+        from src.database.models import ChatMessageRecord
+
+        query = select(ChatMessageRecord).where(ChatMessageRecord.thread_id == thread_id)
+        if before is not None:
+            query = query.where(ChatMessageRecord.seq < before)
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await session.execute(
+                    query.order_by(ChatMessageRecord.seq.desc()).limit(limit + 1)
+                )
+                rows = result.scalars().all()
+                return list(reversed(rows[:limit])), len(rows) > limit
+            except Exception as e:
+                logging.error(f"Error list_messages: {e}")
+                return [], False
+
+    async def backfill_messages(
+        self,
+        thread_id: str,
+        messages: Sequence[Tuple[str, str, str]],
+    ) -> None:
+        """
+        Copy a pre-existing thread's checkpoint history into chat_messages.
+
+        `messages` is the whole conversation from the checkpoint.  Turns
+        recorded since the table was introduced are matched by content
+        (`unrecorded_history`) and only the messages before them are
+        inserted, numbered up to 0 so they sort before seq 1.  Runs once per
+        thread.
+        """
+        from src.database.models import Chat, ChatMessageRecord
+
+        async with AsyncSessionLocal() as session:
+            try:
+                chat = (await session.execute(
+                    select(Chat).where(Chat.thread_id == thread_id).with_for_update()
+                )).scalar_one_or_none()
+                if chat is None or chat.history_complete:
+                    return
+                recorded = (await session.execute(
+                    select(ChatMessageRecord.role, ChatMessageRecord.content)
+                    .where(ChatMessageRecord.thread_id == thread_id, ChatMessageRecord.seq >= 1)
+                    .order_by(ChatMessageRecord.seq)
+                )).all()
+                earlier = unrecorded_history(messages, [tuple(row) for row in recorded])
+                session.add_all([
+                    ChatMessageRecord(thread_id=thread_id, seq=i - len(earlier) + 1,
+                                      role=role, content=content, media_type=media_type)
+                    for i, (role, content, media_type) in enumerate(earlier)
+                ])
+                chat.history_complete = True
+                await session.commit()
+                logging.info(f"Backfilled {len(earlier)} messages into chat_messages for {thread_id}")
+            except Exception as e:
+                await session.rollback()
+                logging.error(f"Error backfill_messages: {e}")
+
     async def delete_chat(self, thread_id: str, user_id: int) -> bool:
         """Delete chat owned by user_id; return True if deleted."""
         from src.database.models import Chat
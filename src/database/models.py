@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Float, ForeignKey, Index
+    Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, func, false
 )
 from sqlalchemy.orm import declarative_base, relationship
 import bcrypt
@@ -36,6 +36,10 @@ class User(Base):
     latitude = Column(Float, nullable=True, comment="GPS latitude")
     longitude = Column(Float, nullable=True, comment="GPS longitude")
 
+    # Vector-store seeding
+    profile_hash = Column(String(64), nullable=True,
+                          comment="sha256 of the profile text last ingested into Qdrant")
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, comment="Record creation timestamp")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow,
@@ -100,11 +104,19 @@ class Chat(Base):
     name = Column(String(50), nullable=True,
                   comment="Set from first 50 chars of first message")
     message_count = Column(Integer, nullable=False, default=0)
+    last_seq = Column(Integer, nullable=False, default=0, server_default="0",
+                      comment="Highest chat_messages.seq issued for this thread")
+    # New threads record every turn in chat_messages; rows that predate the
+    # table get `false` from the column default until their checkpoint
+    # history has been copied in (ChatDatabase.backfill_messages).
+    history_complete = Column(Boolean, nullable=False, default=True, server_default=false())
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
     user = relationship("User", back_populates="chats")
+    messages = relationship("ChatMessageRecord", back_populates="chat",
+                            cascade="all, delete-orphan", passive_deletes=True)
 
     __table_args__ = (
         Index("idx_chats_user_id", "user_id"),
@@ -125,6 +137,46 @@ class Chat(Base):
         }
 
 
+class ChatMessageRecord(Base):
+    """
+    One user or assistant message, appended as a turn completes.
+
+    A denormalized copy of the thread's history so the messages endpoint can
+    page through it by (thread_id, seq) instead of loading the checkpoint.
+    """
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    thread_id = Column(String(64), ForeignKey("chats.thread_id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False,
+                 comment="Position within the thread; backfilled history is numbered <= 0")
+    role = Column(String(16), nullable=False, comment="'user' or 'assistant'")
+    media_type = Column(String(16), nullable=False, default="text",
+                        comment="'text', 'image' or 'voice'")
+    content = Column(Text, nullable=False,
+                     comment="Message text, or the media store reference for image/voice")
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    # Relationship
+    chat = relationship("Chat", back_populates="messages")
+
+    __table_args__ = (
+        Index("idx_chat_messages_thread_seq", "thread_id", "seq", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<ChatMessageRecord(thread_id='{self.thread_id}', seq={self.seq}, role='{self.role}')>"
+
+    def to_dict(self):
+        return {
+            "seq": self.seq,
+            "role": self.role,
+            "media_type": self.media_type,
+            "content": self.content,
+            "timestamp": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
 class FarmerLocation(Base):
     """One authoritative location record per farmer — upserted on profile create/update."""
     __tablename__ = "farmer_locations"
@@ -159,3 +211,16 @@ class FarmerLocation(Base):
             "longitude": self.longitude,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class SchemaVersion(Base):
+    """Schema marker per component — lets start-up skip DDL on warm databases."""
+    __tablename__ = "schema_versions"
+
+    component = Column(String(64), primary_key=True,
+                       comment="'app', 'langgraph.checkpointer' or 'langgraph.store'")
+    version = Column(String(64), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SchemaVersion(component='{self.component}', version='{self.version}')>"
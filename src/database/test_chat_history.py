@@ -0,0 +1,141 @@
+"""
+Tests for the chat_messages history table: per-turn appends, cursor
+pagination and the one-time checkpoint backfill.
+
+Except for the matching of recorded turns to the checkpoint, these need a
+Postgres to run against; set LOADTEST_DATABASE_URL (the load-test harness's
+database) to enable them, e.g.
+
+    LOADTEST_DATABASE_URL="postgresql://postgres@localhost:5433/kisan_loadtest?sslmode=disable" \\
+        python -m pytest -q src/database/test_chat_history.py
+"""
+
+import os
+import uuid
+import unittest
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+DATABASE_URL = os.getenv("LOADTEST_DATABASE_URL")
+
+
+class TestUnrecordedHistory(unittest.TestCase):
+
+    CHECKPOINT = [
+        ("user", "hello", "text"), ("assistant", "namaste", "text"),
+        ("user", "old question", "text"), ("assistant", "old answer", "text"),
+        ("user", "hello", "text"), ("assistant", "namaste again", "text"),
+        ("user", "show me a chart", "text"), ("assistant", "here it is", "text"),
+    ]
+
+    def test_recorded_turns_are_matched_by_content_not_position(self):
+        from src.database.database import unrecorded_history
+
+        # The image reply was recorded as a media reference, the greeting reply not at all
+        recorded = [("user", "hello"), ("user", "show me a chart"), ("assistant", "img_3f2a.png")]
+        self.assertEqual(unrecorded_history(self.CHECKPOINT, recorded), self.CHECKPOINT[:4])
+
+    def test_turns_missing_from_the_checkpoint_are_skipped(self):
+        from src.database.database import unrecorded_history
+
+        recorded = [("user", "failed turn"), ("user", "show me a chart"), ("assistant", "here it is")]
+        self.assertEqual(unrecorded_history(self.CHECKPOINT, recorded), self.CHECKPOINT[:6])
+        self.assertEqual(unrecorded_history(self.CHECKPOINT, []), self.CHECKPOINT)
+
+
+@unittest.skipUnless(DATABASE_URL, "LOADTEST_DATABASE_URL is not set")
+class TestChatHistory(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        from src.database import database
+        from src.database.models import Base
+
+        self.database = database
+        database._engine = create_async_engine(
+            database._make_asyncpg_url(DATABASE_URL),
+            connect_args={"ssl": database._ssl_required(DATABASE_URL)},
+        )
+        database._session_factory = None
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for patch in database._SCHEMA_PATCHES:
+                await conn.execute(text(patch))
+
+        self.unique_name = f"history_{uuid.uuid4().hex[:8]}"
+        user = await database.user_db.create_user({
+            "unique_name": self.unique_name, "phone_number": f"+91{uuid.uuid4().int % 10**10:010d}",
+            "password": "secret-password",
+        })
+        self.chat = await database.chat_db.create_chat(user.id)
+        self.thread_id = self.chat.thread_id
+
+    async def asyncTearDown(self):
+        await self.database.user_db.delete_user(self.unique_name)
+        await self.database._engine.dispose()
+        self.database._engine = None
+        self.database._session_factory = None
+
+    async def _record(self, turns: int) -> None:
+        for i in range(turns):
+            await self.database.chat_db.record_turn(
+                self.thread_id, f"question {i}",
+                [("user", f"question {i}", "text"), ("assistant", f"answer {i}", "text")],
+            )
+
+    async def test_record_turn_names_and_counts_the_chat(self):
+        await self._record(2)
+        chat = await self.database.chat_db.get_chat(self.thread_id)
+        self.assertEqual(chat.name, "question 0")
+        self.assertEqual(chat.message_count, 2)
+        self.assertEqual(chat.last_seq, 4)
+
+    async def test_cursor_pagination_walks_back_to_the_first_message(self):
+        await self._record(5)
+        chat_db = self.database.chat_db
+
+        rows, has_more = await chat_db.list_messages(self.thread_id, limit=4)
+        self.assertEqual([r.seq for r in rows], [7, 8, 9, 10])
+        self.assertTrue(has_more)
+
+        rows, has_more = await chat_db.list_messages(self.thread_id, limit=4, before=rows[0].seq)
+        self.assertEqual([r.content for r in rows], ["question 1", "answer 1", "question 2", "answer 2"])
+        self.assertTrue(has_more)
+
+        rows, has_more = await chat_db.list_messages(self.thread_id, limit=4, before=rows[0].seq)
+        self.assertEqual([r.seq for r in rows], [1, 2])
+        self.assertFalse(has_more)
+
+    async def test_backfill_inserts_only_unrecorded_history_before_seq_one(self):
+        from src.database.models import Chat
+
+        async with self.database.AsyncSessionLocal() as session:
+            await session.execute(
+                update(Chat).where(Chat.thread_id == self.thread_id).values(history_complete=False)
+            )
+            await session.commit()
+        await self._record(1)   # a turn recorded after the table was introduced
+
+        checkpoint = [
+            ("user", "old question", "text"), ("assistant", "old answer", "text"),
+            ("user", "question 0", "text"), ("assistant", "answer 0", "text"),
+        ]
+        await self.database.chat_db.backfill_messages(self.thread_id, checkpoint)
+        await self.database.chat_db.backfill_messages(self.thread_id, checkpoint)   # runs once
+
+        rows, has_more = await self.database.chat_db.list_messages(self.thread_id, limit=10)
+        self.assertEqual([(r.seq, r.content) for r in rows], [
+            (-1, "old question"), (0, "old answer"), (1, "question 0"), (2, "answer 0"),
+        ])
+        self.assertFalse(has_more)
+        self.assertTrue((await self.database.chat_db.get_chat(self.thread_id)).history_complete)
+
+    async def test_deleting_the_chat_deletes_its_history(self):
+        await self._record(1)
+        await self.database.chat_db.delete_chat(self.thread_id, self.chat.user_id)
+        rows, _ = await self.database.chat_db.list_messages(self.thread_id)
+        self.assertEqual(rows, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
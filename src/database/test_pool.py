@@ -0,0 +1,107 @@
+"""
+Tests for the shared Postgres pool layer: idle-connection retirement,
+checkout-wait metrics and pool gauges.
+
+The SQLAlchemy tests use an in-memory SQLite engine; the LangGraph pool tests
+need a Postgres and run when LOADTEST_DATABASE_URL is set.
+"""
+
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from src.database import pool as db_pool
+
+DATABASE_URL = os.getenv("LOADTEST_DATABASE_URL")
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestEnginePool(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=0)
+        db_pool.instrument_engine_pool(self.engine, name="test_engine")
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def _dbapi_connection(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            return conn.connection.dbapi_connection
+
+    def test_recent_connections_are_reused_without_a_ping(self):
+        self.assertIs(self._dbapi_connection(), self._dbapi_connection())
+
+    def test_connections_idle_too_long_are_replaced(self):
+        first = self._dbapi_connection()
+        with mock.patch.object(db_pool, "db_pool_max_idle", -1.0):
+            second = self._dbapi_connection()
+        self.assertIsNot(first, second)
+
+    def test_gauges_follow_checkouts(self):
+        self._dbapi_connection()
+        with self.engine.connect():
+            self.assertEqual(_sample("kisan_db_pool_connections", pool="test_engine", state="in_use"), 1)
+        self.assertEqual(_sample("kisan_db_pool_connections", pool="test_engine", state="in_use"), 0)
+        self.assertEqual(_sample("kisan_db_pool_connections", pool="test_engine", state="idle"), 1)
+
+    def test_engine_options_replace_pre_ping_with_recycling(self):
+        options = db_pool.engine_options()
+        self.assertFalse(options["pool_pre_ping"])
+        self.assertEqual(options["pool_recycle"], db_pool.db_pool_recycle)
+        self.assertIs(options["poolclass"], db_pool.InstrumentedQueuePool)
+
+
+@unittest.skipUnless(DATABASE_URL, "LOADTEST_DATABASE_URL is not set")
+class TestLangGraphPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        patches = [
+            mock.patch.dict(os.environ, {"NEON_API": DATABASE_URL}),
+            mock.patch.object(db_pool, "db_pool_min_size", 1),
+            mock.patch.object(db_pool, "db_pool_max_size", 2),
+            mock.patch.object(db_pool, "_pool_lock", asyncio.Lock()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.pool = await db_pool.get_pool()
+
+    async def asyncTearDown(self):
+        await db_pool.close_pool()
+
+    async def test_pool_is_shared(self):
+        self.assertIs(await db_pool.get_pool(), self.pool)
+
+    async def test_waits_for_a_free_connection_are_recorded(self):
+        before = _sample("kisan_db_pool_wait_seconds_count", pool="langgraph")
+
+        async def hold():
+            async with self.pool.connection() as conn:
+                await conn.execute("SELECT pg_sleep(0.1)")
+
+        await asyncio.gather(*(hold() for _ in range(4)))
+        self.assertEqual(_sample("kisan_db_pool_wait_seconds_count", pool="langgraph") - before, 4)
+        self.assertEqual(db_pool.pool_stats()["langgraph"]["in_use"], 0)
+
+    async def test_idle_connections_are_checked_before_reuse(self):
+        async with self.pool.connection():
+            pass
+        with mock.patch.object(db_pool, "db_pool_max_idle", -1.0), \
+                mock.patch.object(db_pool.AsyncConnectionPool, "check_connection") as check:
+            async with self.pool.connection():
+                pass
+        check.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()